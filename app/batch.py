@@ -0,0 +1,253 @@
+"""
+Headless batch runner.
+
+Applies a pipeline saved from the editor to every image in a directory,
+spreading the files over a pool of worker processes:
+
+    python -m app.batch pipeline.yaml input_dir output_dir --workers 8
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)
+
+from app.core.buffers import BufferPool  # noqa: E402
+from app.core.engine import Engine  # noqa: E402
+from app.core.graph import Graph  # noqa: E402
+from app.core.pipeline_io import load_pipeline_file  # noqa: E402
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+
+# Per-process state, set up once by _init_worker
+_worker: Dict = {}
+
+
+def find_images(input_dir: str) -> List[str]:
+    """Returns the image files in a directory, sorted by name."""
+    return sorted(
+        os.path.join(input_dir, name)
+        for name in os.listdir(input_dir)
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    )
+
+
+def find_source_nodes(graph: Graph, node_ids=None) -> List:
+    """Returns the Load nodes whose path is replaced by each input file."""
+    return [
+        node
+        for node in graph.nodes.values()
+        if not node.inputs
+        and "path" in node.param_values
+        and (not node_ids or node.id in node_ids)
+    ]
+
+
+def find_sink_targets(graph: Graph) -> List[Tuple[str, str]]:
+    """
+    Returns the (node ID, output name) pairs written for each file: the
+    outputs of the graph's sinks, i.e. nodes with no outgoing edges. For
+    sinks without outputs (such as Display nodes) the outputs fed into
+    them are used instead, so the sinks themselves never need to run.
+    """
+    targets = []
+    for node_id in sorted(graph.nodes):
+        if graph.get_outgoing_edges(node_id):
+            continue
+        node = graph.nodes[node_id]
+        if node.outputs:
+            targets.extend((node_id, name) for name in node.outputs)
+        else:
+            targets.extend(
+                (edge.source_node_id, edge.source_output_name)
+                for edge in sorted(
+                    graph.get_incoming_edges(node_id),
+                    key=lambda edge: edge.target_input_name,
+                )
+            )
+    return targets
+
+
+def _init_worker(
+    pipeline_data: dict,
+    output_dir: str,
+    extension: str,
+    source_node_ids: Optional[List[str]],
+    verbose: bool,
+    tile_size: Optional[int] = None,
+):
+    """Builds the graph once per worker process."""
+    from app.node_discovery import get_node_classes
+    from nodes.image_cache import image_cache
+
+    # Each input file is decoded once, so keeping it would only cost memory
+    image_cache.max_bytes = 0
+
+    if not verbose:
+        # Node and engine progress output would swamp the report
+        sys.stdout = open(os.devnull, "w")
+
+    graph = Graph()
+    graph.deserialize(pipeline_data, get_node_classes())
+    _worker["graph"] = graph
+    # Every file runs the whole graph, so intermediates need not outlive
+    # their consumers and output buffers can be recycled
+    _worker["engine"] = Engine(
+        tile_size=tile_size,
+        buffer_pool=BufferPool(),
+        release_intermediates=True,
+    )
+    _worker["sources"] = find_source_nodes(graph, source_node_ids)
+    _worker["targets"] = find_sink_targets(graph)
+    _worker["output_dir"] = output_dir
+    _worker["extension"] = extension
+
+
+def process_file(input_path: str) -> Tuple[str, List[str], float]:
+    """
+    Runs the pipeline on one file and writes the sink images. Returns the
+    input path, the written paths and the processing time in seconds.
+    """
+    import cv2
+
+    start = time.perf_counter()
+    graph, engine = _worker["graph"], _worker["engine"]
+    for node in _worker["sources"]:
+        node.set_param_value("path", input_path)
+    results = engine.evaluate(graph, _worker["targets"])
+
+    stem = os.path.splitext(os.path.basename(input_path))[0]
+    images = [
+        results[target]
+        for target in _worker["targets"]
+        if getattr(results[target], "size", 0)
+    ]
+    written = []
+    for index, image in enumerate(images):
+        suffix = f"_{index}" if len(images) > 1 else ""
+        output_path = os.path.join(
+            _worker["output_dir"], f"{stem}{suffix}{_worker['extension']}"
+        )
+        if not cv2.imwrite(output_path, image):
+            raise IOError(f"Could not write {output_path}")
+        written.append(output_path)
+
+    return input_path, written, time.perf_counter() - start
+
+
+def run_batch(
+    pipeline_path: str,
+    input_dir: str,
+    output_dir: str,
+    workers: Optional[int] = None,
+    extension: str = ".png",
+    source_node_ids: Optional[List[str]] = None,
+    verbose: bool = False,
+    tile_size: Optional[int] = None,
+) -> int:
+    """Processes a directory of images. Returns the number of failures."""
+    pipeline_data = load_pipeline_file(pipeline_path)
+    files = find_images(input_dir)
+    if not files:
+        print(f"No images found in {input_dir}")
+        return 0
+    os.makedirs(output_dir, exist_ok=True)
+
+    print(f"Processing {len(files)} images with {pipeline_path}")
+    failures = 0
+    total_time = 0.0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(
+            pipeline_data,
+            output_dir,
+            extension,
+            source_node_ids,
+            verbose,
+            tile_size,
+        ),
+    ) as executor:
+        futures = {
+            executor.submit(process_file, path): path for path in files
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            name = os.path.basename(futures[future])
+            try:
+                _, written, seconds = future.result()
+            except Exception as e:
+                failures += 1
+                print(f"[{done}/{len(files)}] {name}: FAILED ({e})")
+                continue
+            total_time += seconds
+            print(
+                f"[{done}/{len(files)}] {name}: {seconds * 1000:.1f} ms, "
+                f"{len(written)} output(s)"
+            )
+
+    elapsed = time.perf_counter() - start
+    succeeded = len(files) - failures
+    print(
+        f"Processed {succeeded}/{len(files)} images in {elapsed:.2f} s "
+        f"({succeeded / elapsed:.1f} images/s, "
+        f"mean {total_time / max(succeeded, 1) * 1000:.1f} ms/image)"
+    )
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Apply a saved pipeline to a directory of images."
+    )
+    parser.add_argument("pipeline", help="Pipeline YAML saved by the editor")
+    parser.add_argument("input_dir", help="Directory of input images")
+    parser.add_argument("output_dir", help="Directory for the sink images")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--ext", default=".png", help="Output file extension (default: .png)"
+    )
+    parser.add_argument(
+        "--source",
+        action="append",
+        dest="sources",
+        help="ID of a Load node to feed the input files to (repeatable; "
+        "default: every Load node)",
+    )
+    parser.add_argument(
+        "--tile-size",
+        type=int,
+        default=None,
+        help="Run tileable nodes on tiles of this size to bound memory",
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="Show node progress output"
+    )
+    args = parser.parse_args(argv)
+
+    failures = run_batch(
+        args.pipeline,
+        args.input_dir,
+        args.output_dir,
+        workers=args.workers,
+        extension=args.ext,
+        source_node_ids=args.sources,
+        verbose=args.verbose,
+        tile_size=args.tile_size,
+    )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+# file: app/core/buffers.py
+
+import sys
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Tuple
+
+# Default memory budget for idle pooled buffers (256 MiB)
+DEFAULT_POOL_BYTES = 256 * 1024 * 1024
+
+# References to an idle buffer held by the pool itself: the free list entry
+# and the argument of sys.getrefcount()
+_POOL_REFS = 2
+
+
+class BufferPool:
+    """
+    Recycles node output arrays between runs, keyed by shape and dtype.
+
+    The engine hands a node's previous outputs back to the pool when the
+    node produces new ones, and nodes ask for destination arrays through
+    BaseNode.output_buffer() (e.g. for an OpenCV dst= argument). A released
+    array is only handed out again once nothing else refers to it, so
+    results still held by the output cache, a display or a downstream node
+    that passed them through are never overwritten.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_POOL_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.allocations = 0
+        self.reuses = 0
+        self._free: Dict[Tuple, Deque] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, shape, dtype) -> Any:
+        """Returns an uninitialised array, recycled whenever possible."""
+        import numpy as np
+
+        shape = tuple(shape)
+        dtype = np.dtype(dtype)
+        key = (shape, dtype.str)
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                for index in range(len(free)):
+                    if sys.getrefcount(free[index]) <= _POOL_REFS:
+                        array = free[index]
+                        del free[index]
+                        if not free:
+                            del self._free[key]
+                        self.current_bytes -= array.nbytes
+                        self.reuses += 1
+                        return array
+            self.allocations += 1
+        return np.empty(shape, dtype)
+
+    def release(self, array: Any):
+        """
+        Offers an array for reuse. Views, read-only arrays (such as decoded
+        images shared by the image cache) and non-arrays are ignored.
+        """
+        flags = getattr(array, "flags", None)
+        if (
+            flags is None
+            or not flags.owndata
+            or not flags.writeable
+            or not flags.c_contiguous
+        ):
+            return
+        key = (array.shape, array.dtype.str)
+        with self._lock:
+            free = self._free.setdefault(key, deque())
+            if any(other is array for other in free):
+                return
+            free.append(array)
+            self.current_bytes += array.nbytes
+            self._trim()
+
+    def release_outputs(self, outputs: Dict):
+        """Offers every array in a node's output dict for reuse."""
+        for value in outputs.values():
+            self.release(value)
+
+    def _trim(self):
+        """Drops idle buffers, largest first, until within the budget."""
+        while self.current_bytes > self.max_bytes and self._free:
+            key, free = max(
+                self._free.items(), key=lambda item: item[1][0].nbytes
+            )
+            self.current_bytes -= free.popleft().nbytes
+            if not free:
+                del self._free[key]
+
+    def clear(self):
+        with self._lock:
+            self._free.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "buffers": sum(len(free) for free in self._free.values()),
+                "bytes": self.current_bytes,
+                "allocations": self.allocations,
+                "reuses": self.reuses,
+            }
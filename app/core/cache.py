@@ -0,0 +1,110 @@
+# file: app/core/cache.py
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from nodes.base_node import BaseNode
+
+# Default memory budget for cached node outputs (1 GiB)
+DEFAULT_CACHE_BYTES = 1024 * 1024 * 1024
+
+
+def compute_node_key(
+    node: BaseNode, input_keys: List[Tuple[str, str, str]]
+) -> str:
+    """
+    Builds a content-addressed key for a node's outputs.
+
+    The key combines the node class (and the version of its code, set when
+    a plugin is reloaded), a canonical form of its parameters, the node's
+    cache token and the keys of the upstream outputs it reads (as
+    ``(input_name, source_key, source_output_name)`` tuples). Because
+    upstream keys are themselves derived the same way, equal keys imply
+    equal outputs without ever hashing pixel data.
+    """
+    node_class = type(node)
+    payload = json.dumps(
+        [
+            f"{node_class.__module__}.{node_class.__qualname__}",
+            getattr(node_class, "_code_version", None),
+            node.param_values,
+            node.cache_token(),
+            sorted(input_keys),
+        ],
+        sort_keys=True,
+        default=repr,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def output_nbytes(outputs: Dict[str, Any]) -> int:
+    """Returns the memory held by the array values of an output dict."""
+    return sum(getattr(value, "nbytes", 0) for value in outputs.values())
+
+
+class OutputCache:
+    """
+    A thread-safe LRU cache of node outputs bounded by a byte budget.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[Dict, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Returns a copy of the cached outputs for a key, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry[0])
+
+    def put(self, key: str, outputs: Dict):
+        """Stores outputs under a key, evicting old entries to fit."""
+        size = output_nbytes(outputs)
+        if size > self.max_bytes:
+            return  # Would never fit; don't flush the whole cache for it
+
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (dict(outputs), size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """Removes all entries. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the cache counters and current memory usage."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
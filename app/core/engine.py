@@ -1,77 +1,573 @@
+from app.core.buffers import BufferPool
+from app.core.cache import OutputCache, compute_node_key
 from app.core.graph import Graph
+from app.core.plan import (
+    ExecutionPlan,
+    select_targets,
+    target_node_ids,
+    topological_sort,
+)
+from app.core.profiler import (
+    CACHE_DISABLED,
+    CACHE_HIT,
+    CACHE_MISS,
+    NodeRunRecord,
+    Profiler,
+    describe_outputs,
+)
 from nodes.base_node import BaseNode
-from typing import Dict, List
+from typing import Dict, Hashable, Iterable, List, Optional, Set
 from collections import deque
+import math
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+
+
+class ExecutionCancelled(Exception):
+    """Raised when a run is cancelled before all nodes have executed."""
 
 
 class Engine:
     """Executes the graph by processing nodes in the correct order."""
 
-    def process(self, graph: Graph):
-        # Perform topological sort to find execution order
-        sorted_nodes = self._topological_sort(graph)
-        if not sorted_nodes:
+    def __init__(
+        self,
+        cache: Optional[OutputCache] = None,
+        max_workers: int = 1,
+        tile_size: Optional[int] = None,
+        profiler: Optional[Profiler] = None,
+        buffer_pool: Optional[BufferPool] = None,
+        release_intermediates: bool = False,
+    ):
+        # Outputs of every node from previous runs. A node is only
+        # re-executed when it is dirty or something upstream of it ran.
+        self.node_outputs: Dict[str, Dict] = {}
+        # Optional content-addressed cache shared across runs; lets a node
+        # skip execution whenever an identical computation was seen before
+        self.cache = cache
+        self.node_keys: Dict[str, str] = {}
+        # With more than one worker, independent branches run concurrently
+        # on a thread pool (OpenCV releases the GIL while it works)
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # When set, nodes that declare a tile halo run on overlapping tiles
+        # of this size (see app.core.tiling) and every node is executed
+        self.tile_size = tile_size
+        # Image pyramids of source outputs for preview runs, keyed by
+        # (node_id, output_name) -> (full-size array, [half, quarter, ...])
+        self._pyramids: Dict[tuple, tuple] = {}
+        # Optional instrumentation hook; records every node execution
+        self.profiler = profiler
+        # Compiled plan of the last graph run, reused until its structure
+        # changes
+        self._plan: Optional[ExecutionPlan] = None
+        # Optional pool that recycles output arrays between runs; nodes
+        # opt in through BaseNode.output_buffer()
+        self.buffer_pool = buffer_pool
+        # When set, an output is dropped as soon as the last node reading
+        # it in a run is done, so peak memory follows the working set
+        # rather than the whole graph. Nodes whose outputs were dropped
+        # execute again on the next run (or hit the output cache). Tiled
+        # runs bound their intermediates by tiling instead.
+        self.release_intermediates = release_intermediates
+        # IDs of nodes whose outputs are never dropped, e.g. being probed
+        self.pinned: Set[str] = set()
+
+    def invalidate(self):
+        """Forgets all stored outputs so the next run executes every node."""
+        self.node_outputs.clear()
+        self.node_keys.clear()
+
+    def invalidate_nodes(self, node_ids):
+        """
+        Forgets the stored outputs of some nodes. They execute again on the
+        next run, and so does everything downstream of them.
+        """
+        for node_id in node_ids:
+            self.node_outputs.pop(node_id, None)
+            self.node_keys.pop(node_id, None)
+
+    def process(
+        self, graph: Graph, cancel_event: Optional[threading.Event] = None
+    ):
+        """
+        Runs every node whose outputs are out of date. If cancel_event is
+        set during the run, ExecutionCancelled is raised before the next
+        node starts; nodes that did not run stay dirty.
+        """
+        plan = self.compile(graph)
+        if not plan.order:
             print("Error: Graph has a cycle or is empty.")
             return
 
         print("--- Executing Graph ---")
-        # Store outputs of executed nodes
-        node_outputs_cache = {}
+        executed = self._execute(plan, plan.nodes, cancel_event)
+        print(
+            f"--- Graph Execution Finished "
+            f"({len(executed)}/{len(plan.order)} nodes executed) ---"
+        )
 
-        for node_id in sorted_nodes:
-            node = graph.nodes[node_id]
-            print(f"Executing Node: {node.name}")
+    def evaluate(
+        self,
+        graph: Graph,
+        targets: Iterable[Hashable],
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Dict:
+        """
+        Runs only what the targets depend on and returns their outputs. A
+        target is either a node ID, which maps to a dict of all the node's
+        outputs, or a (node ID, output name) pair, which maps to that one
+        value. Nodes that no target depends on, such as abandoned branches
+        or Display nodes, are not executed.
+        """
+        targets = list(targets)
+        node_ids = target_node_ids(targets)
+        plan = self.compile(graph)
+        missing = sorted(node_ids - set(plan.graph.nodes))
+        if missing:
+            raise KeyError(f"Target nodes not in the graph: {missing}")
+        if not plan.order:
+            raise ValueError("Cannot evaluate a graph with a cycle.")
+
+        nodes = plan.upstream(node_ids)
+        self._execute(plan, nodes, cancel_event, keep=node_ids)
+        return select_targets(self.node_outputs, targets)
+
+    def _execute(
+        self,
+        plan: ExecutionPlan,
+        nodes: List[BaseNode],
+        cancel_event: Optional[threading.Event],
+        keep: Set[str] = frozenset(),
+    ) -> Set:
+        """
+        Runs the out-of-date nodes among `nodes` (which must include
+        everything they depend on) with the configured scheduler. The
+        outputs of nodes in `keep` are never released mid-run.
+        """
+        if self.profiler is not None:
+            self.profiler.begin_run()
+        try:
+            if self.tile_size:
+                from app.core.tiling import TiledRunner
+
+                return TiledRunner(self, plan, nodes, keep).run(cancel_event)
+            if self.max_workers > 1:
+                return self._process_parallel(
+                    plan, nodes, cancel_event, keep
+                )
+            return self._process_serial(plan, nodes, cancel_event, keep)
+        finally:
+            if self.profiler is not None:
+                self.profiler.end_run()
+
+    def compile(self, graph: Graph) -> ExecutionPlan:
+        """
+        Returns the execution plan of a graph. A new plan is only compiled
+        when the graph's structure changed since the last one.
+        """
+        plan = self._plan
+        if plan is not None and plan.is_current(graph):
+            return plan
+        plan = self._plan = ExecutionPlan(graph)
+
+        # Drop outputs of nodes that have been removed from the graph
+        nodes = plan.graph.nodes
+        for node_id in list(self.node_outputs):
+            if node_id not in nodes:
+                del self.node_outputs[node_id]
+                self.node_keys.pop(node_id, None)
+        for pyramid_key in list(self._pyramids):
+            if pyramid_key[0] not in nodes:
+                del self._pyramids[pyramid_key]
+        return plan
+
+    def process_preview(
+        self,
+        graph: Graph,
+        scale: float,
+        cancel_event: Optional[threading.Event] = None,
+    ):
+        """
+        Runs the graph on downscaled copies of the source images for fast
+        feedback while parameters are being edited. Source nodes run at full
+        resolution (only when out of date) and are reduced through an image
+        pyramid that is built once per source, unless they can decode at the
+        preview resolution directly (reduced_decode); pixel-sized parameters
+        are scaled to match. Preview results are not stored and dirty flags are
+        left set, so a later process() call refines at full resolution.
+        """
+        plan = self.compile(graph)
+        if not plan.order:
+            return
+
+        levels = 0 if scale >= 1.0 else int(math.floor(math.log2(1 / scale)))
+        effective_scale = 0.5**levels
+        print(f"--- Previewing Graph at {effective_scale:g}x ---")
+        if self.profiler is not None:
+            self.profiler.begin_run()
+        try:
+            self._preview(plan, levels, cancel_event)
+        finally:
+            if self.profiler is not None:
+                self.profiler.end_run()
+
+    def _preview(
+        self,
+        plan: ExecutionPlan,
+        levels: int,
+        cancel_event: Optional[threading.Event],
+    ):
+        """Runs every node of a plan on sources reduced `levels` times."""
+        effective_scale = 0.5**levels
+        preview_outputs: Dict[str, Dict] = {}
+
+        for node in plan.nodes:
+            if cancel_event is not None and cancel_event.is_set():
+                raise ExecutionCancelled()
+            node_id = node.id
+
+            if not plan.bindings[node_id] and node.reduced_decode and levels:
+                node.resolution_scale = effective_scale
+                try:
+                    preview_outputs[node_id] = self._execute_node(node, {})
+                finally:
+                    node.resolution_scale = 1.0
+                continue
+
+            if not plan.bindings[node_id]:
+                key = self._get_key_for_node(node, plan)
+                if self._needs_execution(node, key):
+                    node.dirty = False
+                    result = self._run_node(node, key, {})
+                    self._store_result(plan, node, key, result)
+                preview_outputs[node_id] = {
+                    name: self._get_pyramid_level(node_id, name, value, levels)
+                    for name, value in self.node_outputs[node_id].items()
+                }
+                continue
+
+            inputs_for_node = self._get_inputs_for_node(
+                node, plan, preview_outputs
+            )
+            node.resolution_scale = effective_scale
+            try:
+                preview_outputs[node_id] = self._execute_node(
+                    node, inputs_for_node
+                )
+            finally:
+                node.resolution_scale = 1.0
+
+    def _get_pyramid_level(self, node_id: str, name: str, value, levels: int):
+        """Returns a source output reduced `levels` times by pyrDown."""
+        if levels == 0 or getattr(value, "ndim", 0) < 2:
+            return value
+        import cv2
+
+        base, reduced = self._pyramids.get((node_id, name), (None, []))
+        if base is not value:
+            # The source produced a new image; start a fresh pyramid
+            base, reduced = value, []
+            self._pyramids[(node_id, name)] = (base, reduced)
+        while len(reduced) < levels:
+            reduced.append(cv2.pyrDown(reduced[-1] if reduced else base))
+        return reduced[levels - 1]
+
+    def shutdown(self):
+        """Stops the worker threads used by the parallel scheduler."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _process_serial(
+        self,
+        plan: ExecutionPlan,
+        nodes: List[BaseNode],
+        cancel_event: Optional[threading.Event],
+        keep: Set[str],
+    ) -> Set:
+        """Runs the nodes one at a time in topological order."""
+        executed: Set[str] = set()
+        use_counts = self._use_counts(plan, nodes, keep)
+
+        for node in nodes:
+            if cancel_event is not None and cancel_event.is_set():
+                raise ExecutionCancelled()
+            key = self._get_key_for_node(node, plan)
+            if not self._needs_execution(node, key):
+                self._release_inputs(plan, node, use_counts)
+                continue
+
+            # Clear the flag before running so that a parameter change made
+            # while the node executes is picked up by the next run
+            node.dirty = False
 
-            # Gather inputs for the current node from the cache
+            # Gather inputs for the current node from the stored outputs
             inputs_for_node = self._get_inputs_for_node(
-                node, graph, node_outputs_cache
+                node, plan, self.node_outputs
             )
+            result = self._run_node(node, key, inputs_for_node)
+            self._store_result(plan, node, key, result)
+            executed.add(node.id)
+            # Don't keep the inputs alive past their release
+            del inputs_for_node
+            self._release_inputs(plan, node, use_counts)
 
-            # Execute the node's logic
-            result = node.execute(**inputs_for_node)
+        return executed
 
-            # Cache the results for downstream nodes
-            node_outputs_cache[node.id] = result
+    def _process_parallel(
+        self,
+        plan: ExecutionPlan,
+        nodes: List[BaseNode],
+        cancel_event: Optional[threading.Event],
+        keep: Set[str],
+    ) -> Set:
+        """
+        Dispatches each node to the thread pool as soon as all of its
+        inputs are available, so independent branches run concurrently.
+        Bookkeeping stays on the calling thread; workers only execute.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="engine"
+            )
+
+        executed: Set[str] = set()
+        pending_inputs = {
+            node.id: len(plan.bindings[node.id]) for node in nodes
+        }
+        ready = deque(
+            node_id for node_id, count in pending_inputs.items() if count == 0
+        )
+        running: Dict[Future, tuple] = {}
+        use_counts = self._use_counts(plan, nodes, keep)
+
+        def mark_done(node_id):
+            self._release_inputs(plan, plan.graph.nodes[node_id], use_counts)
+            for consumer in plan.consumers[node_id]:
+                if consumer.id not in pending_inputs:
+                    continue  # Not part of this run
+                pending_inputs[consumer.id] -= 1
+                if pending_inputs[consumer.id] == 0:
+                    ready.append(consumer.id)
+
+        while ready or running:
+            if cancel_event is not None and cancel_event.is_set():
+                # Stop dispatching; let in-flight nodes finish first
+                ready.clear()
+                if not running:
+                    raise ExecutionCancelled()
+
+            while ready:
+                node = plan.graph.nodes[ready.popleft()]
+                key = self._get_key_for_node(node, plan)
+                if not self._needs_execution(node, key):
+                    mark_done(node.id)
+                    continue
+
+                node.dirty = False
+                inputs_for_node = self._get_inputs_for_node(
+                    node, plan, self.node_outputs
+                )
+                future = self._executor.submit(
+                    self._run_node, node, key, inputs_for_node
+                )
+                running[future] = (node, key)
+
+            if not running:
+                break
 
-        print("--- Graph Execution Finished ---")
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                node, key = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception:
+                    # Let in-flight nodes finish, drop queued ones, and
+                    # surface the error just like the serial scheduler.
+                    # Whatever else finished is discarded too, so all of
+                    # those nodes must run again next time.
+                    for other in running:
+                        other.cancel()
+                    wait(running)
+                    for other_node, _ in running.values():
+                        other_node.dirty = True
+                    raise
+                self._store_result(plan, node, key, result)
+                executed.add(node.id)
+                mark_done(node.id)
+
+        return executed
+
+    def _run_node(self, node: BaseNode, key: Optional[str], inputs: Dict):
+        """Produces a node's outputs, from the cache when possible."""
+        start = time.perf_counter()
+        cpu_start = time.thread_time()
+        use_cache = self.cache is not None and node.cacheable
+        cache_status = CACHE_MISS if use_cache else CACHE_DISABLED
+        result = self.cache.get(key) if use_cache else None
+
+        if result is not None:
+            print(f"Cache hit: {node.name}")
+            cache_status = CACHE_HIT
+        else:
+            print(f"Executing Node: {node.name}")
+            node.buffer_pool = self.buffer_pool
+            try:
+                # Execute the node's logic
+                result = node.execute(**inputs)
+            except Exception:
+                node.dirty = True  # Retry the node on the next run
+                raise
+            finally:
+                node.buffer_pool = None
+            if use_cache:
+                self.cache.put(key, result)
+
+        self._record(node, start, cpu_start, cache_status, result)
+        return result
+
+    def _execute_node(self, node: BaseNode, inputs: Dict) -> Dict:
+        """
+        Executes a node directly, bypassing the output cache, and records
+        the execution in the profiler. Used by runs that don't store their
+        results, such as previews and tiles.
+        """
+        start = time.perf_counter()
+        cpu_start = time.thread_time()
+        result = node.execute(**inputs)
+        self._record(node, start, cpu_start, CACHE_DISABLED, result)
+        return result
+
+    def _record(
+        self,
+        node: BaseNode,
+        start: float,
+        cpu_start: float,
+        cache_status: str,
+        result: Optional[Dict],
+    ):
+        if self.profiler is not None:
+            self.profiler.record(
+                NodeRunRecord(
+                    node_id=node.id,
+                    name=node.name,
+                    start=start,
+                    wall_time=time.perf_counter() - start,
+                    cpu_time=time.thread_time() - cpu_start,
+                    thread_id=threading.get_ident(),
+                    cache_status=cache_status,
+                    outputs=describe_outputs(result),
+                )
+            )
+
+    def _store_result(
+        self, plan: ExecutionPlan, node: BaseNode, key: Optional[str], result
+    ):
+        """Stores a node's results for downstream nodes and later runs."""
+        previous = self.node_outputs.get(node.id)
+        self.node_outputs[node.id] = result
+        if self.buffer_pool is not None and previous:
+            # The pool only reuses them once nothing else refers to them
+            self.buffer_pool.release_outputs(previous)
+        if key is not None:
+            self.node_keys[node.id] = key
+
+        # Everything fed by this node is now stale. Flagging consumers
+        # (rather than tracking this run only) keeps them stale even if the
+        # run is aborted before reaching them.
+        for consumer in plan.consumers[node.id]:
+            consumer.dirty = True
+
+    def _use_counts(
+        self, plan: ExecutionPlan, nodes: List[BaseNode], keep: Set[str]
+    ) -> Optional[Dict[str, int]]:
+        """
+        Returns how many reads of each releasable node's outputs are left
+        in a run over `nodes`, or None when intermediates are kept.
+        """
+        if not self.release_intermediates:
+            return None
+        members = {node.id for node in nodes}
+        return {
+            node.id: sum(
+                consumer.id in members for consumer in plan.consumers[node.id]
+            )
+            for node in nodes
+            if node.id not in keep and not self._is_pinned(plan, node.id)
+        }
+
+    def _release_inputs(
+        self,
+        plan: ExecutionPlan,
+        node: BaseNode,
+        use_counts: Optional[Dict[str, int]],
+    ):
+        """
+        Called once a node has run (or was skipped); drops the outputs it
+        was the last reader of, unless they are pinned.
+        """
+        if use_counts is None:
+            return
+        for _, source_id, _ in plan.bindings[node.id]:
+            if source_id not in use_counts:
+                continue  # Pinned
+            use_counts[source_id] -= 1
+            if use_counts[source_id]:
+                continue
+            # The key stays, so downstream cache keys remain valid
+            outputs = self.node_outputs.pop(source_id, None)
+            if outputs and self.buffer_pool is not None:
+                self.buffer_pool.release_outputs(outputs)
+
+    def _is_pinned(self, plan: ExecutionPlan, node_id: str) -> bool:
+        """Whether a node's outputs must outlive the run."""
+        if node_id in self.pinned:
+            return True
+        # Sinks without outputs of their own, such as Display nodes, show
+        # (or are read back through) the outputs they consume
+        return any(
+            not consumer.outputs for consumer in plan.consumers[node_id]
+        )
+
+    def _get_key_for_node(
+        self, node: BaseNode, plan: ExecutionPlan
+    ) -> Optional[str]:
+        """Computes the cache key of a node, or None without a cache."""
+        if self.cache is None:
+            return None
+        input_keys = [
+            (input_name, self.node_keys.get(source_id, ""), output_name)
+            for input_name, source_id, output_name in plan.bindings[node.id]
+        ]
+        return compute_node_key(node, input_keys)
+
+    def _needs_execution(
+        self, node: BaseNode, key: Optional[str] = None
+    ) -> bool:
+        """Checks whether a node's stored outputs are out of date."""
+        if node.dirty or node.id not in self.node_outputs:
+            return True
+        # e.g. a Load node's source file changed on disk
+        return key is not None and key != self.node_keys.get(node.id)
 
     def _get_inputs_for_node(
-        self, node: BaseNode, graph: Graph, cache: Dict
+        self, node: BaseNode, plan: ExecutionPlan, cache: Dict
     ) -> Dict:
         """Finds and retrieves the inputs for a given node from the cache."""
         inputs = {}
-        for edge in graph.edges.values():
-            if (
-                edge.target_node_id == node.id
-            ):  # If this edge connects to the current node
-                if edge.source_node_id in cache:
-                    inputs[edge.target_input_name] = cache[
-                        edge.source_node_id
-                    ].get(edge.source_output_name)
+        for input_name, source_id, output_name in plan.bindings[node.id]:
+            source_outputs = cache.get(source_id)
+            if source_outputs is not None:
+                inputs[input_name] = source_outputs.get(output_name)
         return inputs
 
     def _topological_sort(self, graph: Graph) -> List[str]:
         """Determinines the correct order to execute nodes."""
-        in_degree = {node_id: 0 for node_id in graph.nodes}
-        adj = {node_id: [] for node_id in graph.nodes}
-
-        for edge in graph.edges.values():
-            in_degree[edge.target_node_id] += 1
-            adj[edge.source_node_id].append(edge.target_node_id)
-
-        queue = deque(
-            [node_id for node_id, degree in in_degree.items() if degree == 0]
-        )
-        sorted_order = []
-
-        while queue:
-            node_id = queue.popleft()
-            sorted_order.append(node_id)
-            for neighbor in adj[node_id]:
-                in_degree[neighbor] -= 1
-                if in_degree[neighbor] == 0:
-                    queue.append(neighbor)
-
-        if len(sorted_order) == len(graph.nodes):
-            return sorted_order
-        return []  # Cycle detected
+        return topological_sort(graph)
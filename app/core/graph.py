@@ -1,7 +1,8 @@
 # file: app/core/graph.py
 
+import threading
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from nodes.base_node import BaseNode
 
@@ -24,12 +25,26 @@ class Graph:
     def __init__(self):
         self.nodes: Dict[str, BaseNode] = {}
         self.edges: Dict[str, Edge] = {}
+        # Per-node edge indexes (node_id -> {edge_id: Edge}) so lookups
+        # scale with a node's own connections instead of the whole graph
+        self.incoming: Dict[str, Dict[str, Edge]] = {}
+        self.outgoing: Dict[str, Dict[str, Edge]] = {}
+        # Guards structural edits, which the GUI makes while the engine may
+        # be taking a snapshot of the graph on a worker thread
+        self.lock = threading.RLock()
+        # Bumped by every structural edit, so compiled execution plans know
+        # when they are out of date. Parameter changes don't count.
+        self.version = 0
 
     def add_node(self, node: BaseNode):
         """Adds a node instance to the graph."""
-        if node.id in self.nodes:
-            raise ValueError(f"Node with ID {node.id} already exists.")
-        self.nodes[node.id] = node
+        with self.lock:
+            if node.id in self.nodes:
+                raise ValueError(f"Node with ID {node.id} already exists.")
+            self.nodes[node.id] = node
+            self.incoming[node.id] = {}
+            self.outgoing[node.id] = {}
+            self.version += 1
 
     def add_edge(
         self,
@@ -60,39 +75,76 @@ class Graph:
         edge = Edge(
             source_node_id, source_output, target_node_id, target_input
         )
-        self.edges[edge_id] = edge
+        with self.lock:
+            self.edges[edge_id] = edge
+            self.outgoing[source_node_id][edge_id] = edge
+            self.incoming[target_node_id][edge_id] = edge
+            self.nodes[target_node_id].dirty = True
+            self.version += 1
 
     def get_node(self, node_id: str) -> Optional[BaseNode]:
         """Retrieves a node from the graph by its ID."""
         return self.nodes.get(node_id)
 
+    def get_incoming_edges(self, node_id: str) -> List[Edge]:
+        """Returns the edges that feed into the given node."""
+        return list(self.incoming.get(node_id, {}).values())
+
+    def get_outgoing_edges(self, node_id: str) -> List[Edge]:
+        """Returns the edges that leave the given node."""
+        return list(self.outgoing.get(node_id, {}).values())
+
     def __repr__(self) -> str:
         """Provides a summary of the graph's state."""
         return (
             f"Graph with {len(self.nodes)} nodes and {len(self.edges)} edges."
         )
 
+    def replace_node(self, node: BaseNode):
+        """
+        Swaps in a new instance for the node with the same ID, keeping its
+        edges. The new node is marked dirty.
+        """
+        with self.lock:
+            if node.id not in self.nodes:
+                raise KeyError(f"Node with ID {node.id} does not exist.")
+            old = self.nodes[node.id]
+            self.nodes[node.id] = node
+            node.dirty = True
+            self.version += 1
+        if old is not node:
+            old.close()
+
     def remove_node(self, node_id: str):
         """Removes a node and any connected edges."""
         if node_id not in self.nodes:
             return
 
-        # Remove the node itself
-        del self.nodes[node_id]
+        with self.lock:
+            # Remove all edges connected to this node
+            edges_to_remove = list(self.incoming[node_id]) + list(
+                self.outgoing[node_id]
+            )
+            for edge_id in edges_to_remove:
+                self.remove_edge(edge_id)
 
-        # Remove all edges connected to this node
-        edges_to_remove = [
-            edge_id
-            for edge_id, edge in self.edges.items()
-            if edge.source_node_id == node_id or edge.target_node_id == node_id
-        ]
-        for edge_id in edges_to_remove:
-            del self.edges[edge_id]
+            # Remove the node itself
+            node = self.nodes.pop(node_id)
+            del self.incoming[node_id]
+            del self.outgoing[node_id]
+            self.version += 1
+        node.close()
 
     def remove_edge(self, edge_id: str):
         """Removes an edge by its unique ID."""
-        if edge_id in self.edges:
-            del self.edges[edge_id]
+        with self.lock:
+            edge = self.edges.pop(edge_id, None)
+            if edge is None:
+                return
+            self.outgoing[edge.source_node_id].pop(edge_id, None)
+            self.incoming[edge.target_node_id].pop(edge_id, None)
+            self.nodes[edge.target_node_id].dirty = True
+            self.version += 1
 
     def serialize(self):
         """Serializes the graph to a dictionary."""
@@ -126,8 +178,35 @@ class Graph:
 
     def clear(self):
         """Clears the graph."""
-        self.nodes.clear()
-        self.edges.clear()
+        with self.lock:
+            nodes = list(self.nodes.values())
+            self.nodes.clear()
+            self.edges.clear()
+            self.incoming.clear()
+            self.outgoing.clear()
+            self.version += 1
+        for node in nodes:
+            node.close()
+
+    def copy(self) -> "Graph":
+        """
+        Returns a structural copy of the graph that shares the same node
+        objects, so it can be traversed while the original is edited.
+        """
+        graph = Graph()
+        with self.lock:
+            graph.nodes = dict(self.nodes)
+            graph.edges = dict(self.edges)
+            graph.incoming = {
+                node_id: dict(edges)
+                for node_id, edges in self.incoming.items()
+            }
+            graph.outgoing = {
+                node_id: dict(edges)
+                for node_id, edges in self.outgoing.items()
+            }
+            graph.version = self.version
+        return graph
 
     def deserialize(self, data, node_classes):
         """Deserializes the graph from a dictionary."""
@@ -139,7 +218,9 @@ class Graph:
                 node_class = node_classes[node_name]
                 node = node_class()
                 node.id = node_data["id"]
-                node.param_values = node_data["parameters"]
+                # Parameters added since the pipeline was saved keep their
+                # defaults
+                node.param_values.update(node_data["parameters"])
                 if "pos" in node_data:
                     # This is a bit of a hack, we'll store
                     # the position and use it later
@@ -0,0 +1,42 @@
+# file: app/core/pipeline_io.py
+
+# yaml is imported on first use; it is a noticeable part of startup time
+
+_pipeline_loader = None
+
+
+def _tuple_constructor(loader, node):
+    """Reads the Python tuples yaml.dump writes (e.g. node positions)."""
+    return tuple(loader.construct_sequence(node))
+
+
+def get_pipeline_loader():
+    """Returns a SafeLoader that also understands Python tuples."""
+    global _pipeline_loader
+    if _pipeline_loader is None:
+        import yaml
+
+        class PipelineLoader(yaml.SafeLoader):
+            pass
+
+        PipelineLoader.add_constructor(
+            "tag:yaml.org,2002:python/tuple", _tuple_constructor
+        )
+        _pipeline_loader = PipelineLoader
+    return _pipeline_loader
+
+
+def save_pipeline_file(file_path: str, graph_data: dict):
+    """Writes serialized graph data to a YAML file."""
+    import yaml
+
+    with open(file_path, "w") as f:
+        yaml.dump(graph_data, f, default_flow_style=False)
+
+
+def load_pipeline_file(file_path: str) -> dict:
+    """Reads serialized graph data from a YAML file."""
+    import yaml
+
+    with open(file_path, "r") as f:
+        return yaml.load(f, Loader=get_pipeline_loader())
@@ -0,0 +1,128 @@
+# file: app/core/profiler.py
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+# Cache status values recorded for each node execution
+CACHE_HIT = "hit"
+CACHE_MISS = "miss"
+CACHE_DISABLED = "uncached"
+
+
+def describe_outputs(outputs: Optional[Dict[str, Any]]) -> Dict[str, Dict]:
+    """Summarises each output value's shape, dtype and size."""
+    description = {}
+    for name, value in (outputs or {}).items():
+        if hasattr(value, "shape") and hasattr(value, "dtype"):
+            description[name] = {
+                "shape": list(value.shape),
+                "dtype": str(value.dtype),
+                "nbytes": int(value.nbytes),
+            }
+        else:
+            description[name] = {"type": type(value).__name__}
+    return description
+
+
+@dataclass
+class NodeRunRecord:
+    """Timing and output information for one execution of a node."""
+
+    node_id: str
+    name: str
+    start: float  # time.perf_counter() at start, in seconds
+    wall_time: float  # seconds
+    cpu_time: float  # seconds of CPU time on the executing thread
+    thread_id: int
+    cache_status: str
+    outputs: Dict[str, Dict] = field(default_factory=dict)
+
+    @property
+    def output_bytes(self) -> int:
+        return sum(info.get("nbytes", 0) for info in self.outputs.values())
+
+
+class Profiler:
+    """
+    Collects per-node execution records from the Engine and exports them
+    as Chrome trace-event JSON (viewable in chrome://tracing or Perfetto).
+    """
+
+    def __init__(self, max_runs: int = 100):
+        self.runs: deque = deque(maxlen=max_runs)
+        # The most recent record of every node that has executed
+        self.last_records: Dict[str, NodeRunRecord] = {}
+        self._current_run: Optional[List[NodeRunRecord]] = None
+        self._epoch = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def begin_run(self):
+        """Starts collecting records for a new run."""
+        with self._lock:
+            self._current_run = []
+            self.runs.append(self._current_run)
+
+    def end_run(self):
+        """Stops collecting records for the current run."""
+        with self._lock:
+            self._current_run = None
+
+    def record(self, record: NodeRunRecord):
+        """Adds a node record. Safe to call from worker threads."""
+        with self._lock:
+            if self._current_run is not None:
+                self._current_run.append(record)
+            self.last_records[record.node_id] = record
+
+    def last_run(self) -> List[NodeRunRecord]:
+        """Returns the records of the most recent run."""
+        with self._lock:
+            return list(self.runs[-1]) if self.runs else []
+
+    def slowest(self, count: int = 3) -> List[NodeRunRecord]:
+        """Returns the slowest executions of the most recent run."""
+        records = [
+            record
+            for record in self.last_run()
+            if record.cache_status != CACHE_HIT
+        ]
+        records.sort(key=lambda record: record.wall_time, reverse=True)
+        return records[:count]
+
+    def to_chrome_trace(self) -> Dict:
+        """Converts all retained runs to the Chrome trace-event format."""
+        pid = os.getpid()
+        events = []
+        with self._lock:
+            runs = [list(run) for run in self.runs]
+        for run_index, run in enumerate(runs):
+            for record in run:
+                events.append(
+                    {
+                        "name": record.name,
+                        "cat": record.cache_status,
+                        "ph": "X",
+                        "ts": (record.start - self._epoch) * 1e6,
+                        "dur": record.wall_time * 1e6,
+                        "pid": pid,
+                        "tid": record.thread_id,
+                        "args": {
+                            "node_id": record.node_id,
+                            "run": run_index,
+                            "cpu_ms": record.cpu_time * 1000,
+                            "cache": record.cache_status,
+                            "outputs": record.outputs,
+                        },
+                    }
+                )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, file_path: str):
+        """Writes the retained runs to a Chrome trace JSON file."""
+        with open(file_path, "w") as f:
+            json.dump(self.to_chrome_trace(), f)
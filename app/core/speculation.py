@@ -0,0 +1,208 @@
+# file: app/core/speculation.py
+
+"""
+Speculative precomputation while the editor is idle.
+
+When a parameter is being nudged in the properties panel, its next value
+is usually one or two steps away. After a run finishes, the speculative
+executor computes the edited node for those neighbouring values, and the
+nodes it feeds up to the display, and puts the outputs in the engine's
+output cache under the keys the engine will look for. If the next edit
+lands on one of them, the refining run is a string of cache hits.
+
+Speculation reads a snapshot of the engine's outputs taken when it starts
+and never touches the engine's state. It is cancelled as soon as real work
+is requested; a node that is already executing finishes in the background
+and its outputs are dropped.
+"""
+
+import copy
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from app.core.cache import compute_node_key
+from app.core.engine import Engine
+from app.core.graph import Graph
+from nodes.base_node import BaseNode
+
+# Offsets tried around the current value, nearest first
+DEFAULT_STEPS = (1, -1, 2, -2)
+
+
+class SpeculativeExecutor:
+    """Precomputes neighbouring values of the last edited parameter."""
+
+    def __init__(
+        self, engine: Engine, steps: Sequence[int] = DEFAULT_STEPS
+    ):
+        if engine.cache is None:
+            raise ValueError("Speculation needs an engine with a cache.")
+        self.engine = engine
+        self.steps = tuple(steps)
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="speculation"
+        )
+        self._cancel_event = threading.Event()
+        self._future: Optional[Future] = None
+        # Keys of the edited node's outputs computed by the last speculation
+        self._predicted: Set[str] = set()
+
+        # Edits that followed a speculation, and those it had predicted
+        self.predictions = 0
+        self.hits = 0
+        # Node executions done speculatively, and speculations cut short
+        self.computed = 0
+        self.cancelled = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.predictions if self.predictions else 0.0
+
+    def speculate(
+        self, graph: Graph, node_id: str, param_name: str
+    ) -> Optional[Future]:
+        """
+        Called after a completed run that followed an edit of `param_name`
+        on `node_id`. Scores the previous speculation against that edit and
+        starts precomputing the values around the new one. Only integer
+        parameters of cacheable nodes are speculated on. Must not be
+        called while the engine runs.
+        """
+        self.cancel()
+        engine = self.engine
+        plan = engine.compile(graph)
+        node = plan.graph.nodes.get(node_id)
+
+        key = engine.node_keys.get(node_id)
+        if self._predicted:
+            self.predictions += 1
+            hit = key in self._predicted
+            self.hits += hit
+            print(
+                f"Speculation {'hit' if hit else 'miss'} "
+                f"({self.hits}/{self.predictions} edits predicted)"
+            )
+        self._predicted = set()
+
+        if node is None or not node.cacheable:
+            return None
+        value = node.param_values.get(param_name)
+        if type(value) is not int:
+            return None
+        candidates = [
+            value + step
+            for step in self.steps
+            if value + step >= 0 or value < 0
+        ]
+
+        # The edited node and the nodes it feeds, in order, up to the first
+        # uncacheable one (e.g. a Display node) on each branch
+        path = [node]
+        affected = {node_id}
+        stopped = set()
+        for other in plan.nodes:
+            sources = {source for _, source, _ in plan.bindings[other.id]}
+            if other.id == node_id or not sources & affected:
+                continue
+            affected.add(other.id)
+            if other.cacheable and not sources & stopped:
+                path.append(other)
+            else:
+                stopped.add(other.id)
+        bindings = {other.id: plan.bindings[other.id] for other in path}
+
+        # Snapshot what the path reads from outside of it
+        outputs: Dict[str, Dict] = {}
+        keys: Dict[str, str] = {}
+        for other in path:
+            for _, source, _ in bindings[other.id]:
+                if source in affected:
+                    continue
+                if source not in engine.node_outputs:
+                    return None  # Released or never computed
+                outputs[source] = engine.node_outputs[source]
+                keys[source] = engine.node_keys.get(source, "")
+
+        self._cancel_event = threading.Event()
+        self._future = self._executor.submit(
+            self._run,
+            path,
+            bindings,
+            param_name,
+            candidates,
+            outputs,
+            keys,
+            self._predicted,
+            self._cancel_event,
+        )
+        return self._future
+
+    def _run(
+        self,
+        path: List[BaseNode],
+        bindings: Dict[str, List[Tuple[str, str, str]]],
+        param_name: str,
+        candidates: List[int],
+        outputs: Dict[str, Dict],
+        keys: Dict[str, str],
+        predicted: Set[str],
+        cancel_event: threading.Event,
+    ):
+        """Computes the path for each candidate value. Runs on a thread."""
+        cache = self.engine.cache
+        for value in candidates:
+            path_outputs = dict(outputs)
+            path_keys = dict(keys)
+            for index, node in enumerate(path):
+                if cancel_event.is_set():
+                    self.cancelled += 1
+                    return
+                # A copy, so a real run can use the node at the same time
+                node = copy.copy(node)
+                if index == 0:
+                    node.param_values = dict(node.param_values)
+                    node.param_values[param_name] = value
+                node_bindings = bindings[node.id]
+                key = compute_node_key(
+                    node,
+                    [
+                        (input_name, path_keys[source], output_name)
+                        for input_name, source, output_name in node_bindings
+                    ],
+                )
+
+                result = cache.get(key) if key in cache else None
+                if result is None:
+                    inputs = {
+                        input_name: path_outputs[source].get(output_name)
+                        for input_name, source, output_name in node_bindings
+                    }
+                    result = node.execute(**inputs)
+                    if cancel_event.is_set():
+                        self.cancelled += 1
+                        return  # Too late to be of use
+                    cache.put(key, result)
+                    self.computed += 1
+                if index == 0:
+                    predicted.add(key)
+                path_outputs[node.id] = result
+                path_keys[node.id] = key
+
+    def cancel(self):
+        """Stops the speculation in progress, if any."""
+        self._cancel_event.set()
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "predictions": self.predictions,
+            "hits": self.hits,
+            "hit_rate": self.hit_rate,
+            "computed": self.computed,
+            "cancelled": self.cancelled,
+        }
+
+    def shutdown(self):
+        """Cancels speculation and waits for its thread to exit."""
+        self.cancel()
+        self._executor.shutdown(wait=True)
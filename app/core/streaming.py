@@ -0,0 +1,324 @@
+# file: app/core/streaming.py
+
+"""
+Streaming execution for video and other frame sources.
+
+Source nodes with ``streaming`` set yield frames through BaseNode.frames().
+Every node that depends on a stream becomes a pipeline stage with its own
+worker thread, and stages are connected by bounded queues, so frame N+1 is
+being decoded while frame N is filtered. A full queue blocks the stage
+feeding it (backpressure); with drop_frames the source skips frames
+instead, which keeps a live preview current. Nodes that don't depend on a
+stream run once, through the regular engine.
+"""
+
+import itertools
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from app.core.engine import Engine, ExecutionCancelled
+from app.core.graph import Graph
+from app.core.plan import (
+    ExecutionPlan,
+    select_targets,
+    target_node_ids,
+)
+from nodes.base_node import BaseNode
+
+# Marks the end of the stream in the stage queues
+_END = object()
+# How often blocked stages check whether the stream was stopped (seconds)
+_POLL_INTERVAL = 0.05
+
+
+class _StageFailed:
+    """Passed down the pipeline when a stage raised."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+@dataclass
+class StageStats:
+    """Throughput and queueing statistics of one pipeline stage."""
+
+    name: str
+    frames: int = 0
+    dropped: int = 0
+    busy_time: float = 0.0  # seconds spent executing
+    max_queue_depth: int = 0
+    total_queue_depth: int = 0  # summed over the frames taken
+
+    @property
+    def mean_queue_depth(self) -> float:
+        return self.total_queue_depth / self.frames if self.frames else 0.0
+
+    def record_queue_depth(self, depth: int):
+        self.total_queue_depth += depth
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+
+
+class _Stage:
+    def __init__(self, node: BaseNode, queue_size: int):
+        self.node = node
+        self.queue: queue.Queue = queue.Queue(queue_size)
+        self.stats = StageStats(node.name)
+        # Outputs no later stage reads, dropped once this stage ran
+        self.drops: List[str] = []
+
+
+class StreamingEngine:
+    """Runs a graph over a stream of frames as a pipeline of stages."""
+
+    def __init__(
+        self,
+        engine: Optional[Engine] = None,
+        queue_size: int = 4,
+        drop_frames: bool = False,
+    ):
+        # Runs the nodes that don't depend on a stream, once per stream
+        self.engine = engine or Engine()
+        self.queue_size = queue_size
+        self.drop_frames = drop_frames
+        # Statistics of the last stream, the source stage first
+        self.stats: List[StageStats] = []
+        self.elapsed = 0.0
+
+    def run(
+        self,
+        graph: Graph,
+        targets: Iterable[Hashable],
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Iterator[Tuple[int, Dict]]:
+        """
+        Streams the graph, yielding (frame index, results) for every frame
+        that reaches the end of the pipeline. Targets and results are as
+        for Engine.evaluate(). The stream ends with the shortest source;
+        closing the iterator or setting cancel_event stops it early.
+        """
+        targets = list(targets)
+        node_ids = target_node_ids(targets)
+        plan = ExecutionPlan(graph)
+        missing = sorted(node_ids - set(plan.graph.nodes))
+        if missing:
+            raise KeyError(f"Target nodes not in the graph: {missing}")
+        if not plan.order:
+            raise ValueError("Cannot stream a graph with a cycle.")
+
+        nodes = plan.upstream(node_ids)
+        sources = [node for node in nodes if node.streaming]
+        if not sources:
+            raise ValueError("The targets don't depend on a stream source.")
+        live = {node.id for node in sources}
+        for node in nodes:
+            bindings = plan.bindings[node.id]
+            if any(source in live for _, source, _ in bindings):
+                live.add(node.id)
+
+        # Everything the stream doesn't touch is computed once up front
+        static_ids = [node.id for node in nodes if node.id not in live]
+        static = self.engine.evaluate(graph, static_ids, cancel_event)
+
+        stages = [
+            _Stage(node, self.queue_size)
+            for node in nodes
+            if node.id in live and not node.streaming
+        ]
+        last_reader: Dict[str, _Stage] = {}
+        for stage in stages:
+            for _, source, _ in plan.bindings[stage.node.id]:
+                last_reader[source] = stage
+        for source, stage in last_reader.items():
+            if source not in node_ids:
+                stage.drops.append(source)
+
+        results: queue.Queue = queue.Queue(self.queue_size)
+        queues = [stage.queue for stage in stages] + [results]
+        source_stats = StageStats(
+            " + ".join(node.name for node in sources)
+        )
+        self.stats = [source_stats] + [stage.stats for stage in stages]
+        stop = threading.Event()
+        threads = [
+            threading.Thread(
+                target=self._read_sources,
+                args=(sources, static, queues[0], source_stats, stop),
+                name="stream-source",
+                daemon=True,
+            )
+        ]
+        threads += [
+            threading.Thread(
+                target=self._run_stage,
+                args=(stage, plan, queues[index + 1], stop),
+                name=f"stream-{stage.node.name}",
+                daemon=True,
+            )
+            for index, stage in enumerate(stages)
+        ]
+
+        return self._pump(threads, results, targets, stop, cancel_event)
+
+    def _pump(
+        self,
+        threads: List[threading.Thread],
+        results: queue.Queue,
+        targets: List[Hashable],
+        stop: threading.Event,
+        cancel_event: Optional[threading.Event],
+    ) -> Iterator[Tuple[int, Dict]]:
+        """Starts the pipeline and yields what comes out of its end."""
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        try:
+            while True:
+                packet = self._get(results, cancel_event)
+                if packet is _END:
+                    return
+                if isinstance(packet, _StageFailed):
+                    raise packet.error
+                index, outputs = packet
+                yield index, select_targets(outputs, targets)
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            self.elapsed = time.perf_counter() - start
+
+    def _read_sources(
+        self,
+        sources: List[BaseNode],
+        static: Dict[str, Dict],
+        first_queue: queue.Queue,
+        stats: StageStats,
+        stop: threading.Event,
+    ):
+        """Reads the stream sources in lockstep. Runs on its own thread."""
+        streams = []
+        try:
+            streams = [iter(node.frames()) for node in sources]
+            for index in itertools.count():
+                if stop.is_set():
+                    return
+                start = time.perf_counter()
+                try:
+                    frames = [next(stream) for stream in streams]
+                except StopIteration:
+                    break
+                stats.busy_time += time.perf_counter() - start
+                stats.frames += 1
+
+                packet = dict(static)
+                for node, outputs in zip(sources, frames):
+                    packet[node.id] = outputs
+                if self.drop_frames:
+                    try:
+                        first_queue.put_nowait((index, packet))
+                    except queue.Full:
+                        stats.dropped += 1
+                elif not _put(first_queue, (index, packet), stop):
+                    return
+            _put(first_queue, _END, stop)
+        except Exception as e:
+            _put(first_queue, _StageFailed(e), stop)
+        finally:
+            for stream in streams:
+                close = getattr(stream, "close", None)
+                if close is not None:
+                    close()
+
+    def _run_stage(
+        self,
+        stage: _Stage,
+        plan: ExecutionPlan,
+        next_queue: queue.Queue,
+        stop: threading.Event,
+    ):
+        """Runs one node over every frame. Runs on its own thread."""
+        node, stats = stage.node, stage.stats
+        bindings = plan.bindings[node.id]
+        while True:
+            stats.record_queue_depth(stage.queue.qsize())
+            packet = self._get(stage.queue, stop=stop)
+            if packet is None:
+                return  # Stopped
+            if packet is _END or isinstance(packet, _StageFailed):
+                _put(next_queue, packet, stop)
+                return
+
+            index, outputs = packet
+            inputs = {
+                input_name: outputs[source].get(output_name)
+                for input_name, source, output_name in bindings
+                if source in outputs
+            }
+            start = time.perf_counter()
+            try:
+                result = node.execute(**inputs)
+            except Exception as e:
+                _put(next_queue, _StageFailed(e), stop)
+                return
+            stats.busy_time += time.perf_counter() - start
+            stats.frames += 1
+
+            outputs[node.id] = result
+            for source in stage.drops:
+                outputs.pop(source, None)
+            del inputs, result
+            if not _put(next_queue, (index, outputs), stop):
+                return
+
+    @staticmethod
+    def _get(
+        source_queue: queue.Queue,
+        cancel_event: Optional[threading.Event] = None,
+        stop: Optional[threading.Event] = None,
+    ):
+        """
+        Takes the next packet, raising ExecutionCancelled once cancel_event
+        is set, or returning None once stop is set.
+        """
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                raise ExecutionCancelled()
+            if stop is not None and stop.is_set():
+                return None
+            try:
+                return source_queue.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+
+    def report(self) -> str:
+        """Formats the statistics of the last stream as a table."""
+        elapsed = self.elapsed or 1e-9
+        lines = [
+            f"{'stage':<30} {'frames':>7} {'fps':>8} {'busy':>6} "
+            f"{'queue':>6} {'max':>4} {'dropped':>7}"
+        ]
+        for stats in self.stats:
+            lines.append(
+                f"{stats.name[:30]:<30} {stats.frames:>7} "
+                f"{stats.frames / elapsed:>8.1f} "
+                f"{stats.busy_time / elapsed:>6.0%} "
+                f"{stats.mean_queue_depth:>6.2f} "
+                f"{stats.max_queue_depth:>4} {stats.dropped:>7}"
+            )
+        return "\n".join(lines)
+
+
+def _put(target: queue.Queue, item, stop: threading.Event) -> bool:
+    """
+    Puts an item, blocking while the queue is full (backpressure). Returns
+    False if the stream was stopped first.
+    """
+    while not stop.is_set():
+        try:
+            target.put(item, timeout=_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            continue
+    return False
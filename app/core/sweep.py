@@ -0,0 +1,292 @@
+# file: app/core/sweep.py
+
+"""
+Parameter sweeps: running one graph over a grid of parameter values.
+
+The grid is the cross product of the values given for each swept
+parameter. It is walked with the parameters of upstream nodes varying
+slowest, so all the combinations that share the values of the upstream
+parameters (a prefix) form one group. Everything the last swept node (the
+leaf) doesn't depend on is computed once per group through the regular
+engine, which only re-runs what the changed parameters affect; the leaf
+and the nodes after it then run for each combination of the group, in
+parallel, on copies of those nodes. A sweep therefore costs about as many
+node executions as there are distinct (node, parameters) evaluations,
+rather than the grid size times the graph size.
+
+The copies persist from point to point, so state a node keeps between
+executions (such as the Canny node's gradients) is reused as it would be
+by an engine stepping through the grid. Each group's first point warms
+the copies up; each worker then runs a contiguous chunk of the remaining
+points on a copy of the warmed nodes.
+"""
+
+import copy
+import itertools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from app.core.cache import OutputCache
+from app.core.engine import Engine, ExecutionCancelled
+from app.core.graph import Graph
+from app.core.plan import ExecutionPlan, select_targets, target_node_ids
+from nodes.base_node import BaseNode
+
+# (node ID, parameter name)
+ParamKey = Tuple[str, str]
+# Computes a value for the results table from a point and its results
+Metric = Callable[["SweepPoint"], Any]
+
+
+@dataclass
+class SweepPoint:
+    """One combination of the sweep grid and what it produced."""
+
+    # Position in the grid
+    index: int
+    params: Dict[ParamKey, Any]
+    # Target values as returned by Engine.evaluate(), unless dropped
+    results: Optional[Dict] = None
+    metrics: Dict[str, Any] = field(default_factory=dict)
+
+
+class ParameterSweep:
+    """Runs a graph over every combination of some parameter values."""
+
+    def __init__(
+        self,
+        engine: Optional[Engine] = None,
+        max_workers: Optional[int] = None,
+    ):
+        # Computes the part of the graph shared by each group of points.
+        # The output cache lets independent branches skip re-running when
+        # only a parameter of another branch changed.
+        self.engine = engine or Engine(cache=OutputCache())
+        # Threads running the leaf stage of a group's points; one per CPU
+        # by default
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def run(
+        self,
+        graph: Graph,
+        ranges: Dict[str, Dict[str, Sequence]],
+        targets: Iterable[Hashable],
+        metrics: Optional[Dict[str, Metric]] = None,
+        keep_results: bool = True,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> List[SweepPoint]:
+        """
+        Sweeps `ranges`, which maps node IDs to {parameter name: values},
+        and returns a point for each combination in grid order. Targets are
+        as for Engine.evaluate(). Each metric is called with a point once
+        its results are in; with keep_results off only the metrics are
+        kept, so large sweeps don't hold every image. The swept parameters
+        are restored afterwards.
+        """
+        targets = list(targets)
+        plan = self.engine.compile(graph)
+        axes = self._axes(plan, ranges)
+        node_ids = target_node_ids(targets)
+        missing = sorted(node_ids - set(plan.graph.nodes))
+        if missing:
+            raise KeyError(f"Target nodes not in the graph: {missing}")
+        if not plan.order:
+            raise ValueError("Cannot sweep a graph with a cycle.")
+
+        needed = plan.upstream(node_ids)
+        needed_ids = {node.id for node in needed}
+        swept = [node_id for node_id, _, _ in axes if node_id in needed_ids]
+        leaf_id = swept[-1] if swept else None
+
+        # The leaf stage: the leaf and everything needed that depends on it
+        live = {leaf_id} if leaf_id else set()
+        for node in needed:
+            if any(source in live for _, source, _ in plan.bindings[node.id]):
+                live.add(node.id)
+        stage = [node for node in needed if node.id in live]
+        # What the shared part must provide: the stage's inputs, and the
+        # targets that don't depend on the leaf
+        boundary = {
+            source
+            for node in stage
+            for _, source, _ in plan.bindings[node.id]
+            if source not in live
+        }
+        boundary |= node_ids - live
+
+        prefix_axes = [axis for axis in axes if axis[0] != leaf_id]
+        leaf_axes = [axis for axis in axes if axis[0] == leaf_id]
+        nodes = plan.graph.nodes
+        original = {
+            (node_id, name): nodes[node_id].param_values[name]
+            for node_id, name, _ in axes
+        }
+        metrics = metrics or {}
+        points: List[SweepPoint] = []
+        warm = self._copy_stage(stage)
+
+        executor = (
+            ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="sweep"
+            )
+            if self.max_workers > 1
+            else None
+        )
+        try:
+            for prefix in itertools.product(
+                *(values for _, _, values in prefix_axes)
+            ):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ExecutionCancelled()
+                params = {
+                    (node_id, name): value
+                    for (node_id, name, _), value in zip(prefix_axes, prefix)
+                }
+                for (node_id, name), value in params.items():
+                    nodes[node_id].set_param_value(name, value)
+                shared = self.engine.evaluate(graph, boundary, cancel_event)
+
+                group = []
+                for leaf in itertools.product(
+                    *(values for _, _, values in leaf_axes)
+                ):
+                    point = SweepPoint(len(points) + len(group), dict(params))
+                    for (node_id, name, _), value in zip(leaf_axes, leaf):
+                        point.params[(node_id, name)] = value
+                    group.append(point)
+
+                args = (
+                    plan,
+                    stage,
+                    shared,
+                    targets,
+                    metrics,
+                    keep_results,
+                    cancel_event,
+                )
+                # The group's points must be done before the shared outputs
+                # are recomputed for the next one
+                if executor is None:
+                    self._run_points(group, warm, *args)
+                else:
+                    self._run_points(group[:1], warm, *args)
+                    rest = group[1:]
+                    size = max(1, -(-len(rest) // self.max_workers))
+                    chunks = [
+                        rest[start:][:size]
+                        for start in range(0, len(rest), size)
+                    ]
+                    for future in [
+                        executor.submit(
+                            self._run_points,
+                            chunk,
+                            self._copy_stage(warm.values()),
+                            *args,
+                        )
+                        for chunk in chunks
+                    ]:
+                        future.result()
+                points.extend(group)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+            for (node_id, name), value in original.items():
+                nodes[node_id].set_param_value(name, value)
+        return points
+
+    @staticmethod
+    def _axes(
+        plan: ExecutionPlan, ranges: Dict[str, Dict[str, Sequence]]
+    ) -> List[Tuple[str, str, List]]:
+        """
+        Returns the swept (node ID, parameter name, values), upstream nodes
+        first.
+        """
+        nodes = plan.graph.nodes
+        position = {
+            node_id: index for index, node_id in enumerate(plan.order)
+        }
+        axes = []
+        for node_id, params in ranges.items():
+            if node_id not in nodes:
+                raise KeyError(f"Swept node not in the graph: {node_id}")
+            for name, values in params.items():
+                if name not in nodes[node_id].param_values:
+                    raise KeyError(
+                        f"Node '{nodes[node_id].name}' has no "
+                        f"parameter named '{name}'."
+                    )
+                values = list(values)
+                if not values:
+                    raise ValueError(f"No values to sweep for '{name}'.")
+                axes.append((node_id, name, values))
+        axes.sort(key=lambda axis: position.get(axis[0], len(position)))
+        return axes
+
+    @staticmethod
+    def _copy_stage(stage: Iterable[BaseNode]) -> Dict[str, BaseNode]:
+        """
+        Copies the stage's nodes so they can run at the same time as the
+        originals, keeping any state they carry between executions.
+        """
+        copies = {}
+        for node in stage:
+            node = copy.copy(node)
+            node.param_values = dict(node.param_values)
+            node.buffer_pool = None
+            copies[node.id] = node
+        return copies
+
+    def _run_points(
+        self,
+        points: List[SweepPoint],
+        instances: Dict[str, BaseNode],
+        plan: ExecutionPlan,
+        stage: List[BaseNode],
+        shared: Dict[str, Dict],
+        targets: List[Hashable],
+        metrics: Dict[str, Metric],
+        keep_results: bool,
+        cancel_event: Optional[threading.Event],
+    ):
+        """
+        Runs the leaf stage for some points, in order, on the given copies
+        of the stage's nodes. May run on a worker thread.
+        """
+        for point in points:
+            outputs = dict(shared)
+            for node in stage:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ExecutionCancelled()
+                node = instances[node.id]
+                for (node_id, name), value in point.params.items():
+                    if node_id == node.id:
+                        node.param_values[name] = value
+                inputs = {
+                    input_name: outputs[source].get(output_name)
+                    for input_name, source, output_name in plan.bindings[
+                        node.id
+                    ]
+                    if source in outputs
+                }
+                outputs[node.id] = node.execute(**inputs)
+
+            point.results = select_targets(outputs, targets)
+            point.metrics = {
+                name: metric(point) for name, metric in metrics.items()
+            }
+            if not keep_results:
+                point.results = None
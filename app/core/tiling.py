@@ -0,0 +1,297 @@
+# file: app/core/tiling.py
+
+"""
+Tiled execution for frames too large to push through the graph whole.
+
+Nodes that only look at a bounded neighbourhood of each pixel declare it
+through BaseNode.tile_halo(). Connected groups of such nodes are run on
+overlapping tiles: each node computes its tile grown by the context its
+consumers still need, reading its inputs grown by its own halo, so every
+kept pixel sees exactly the neighbourhood it would see in a full-frame run.
+Only outputs that leave the group (or end the graph) are stitched into
+full frames, so intermediate memory is bounded by the tile size.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.core.plan import ExecutionPlan
+from nodes.base_node import BaseNode
+
+if TYPE_CHECKING:
+    from app.core.engine import Engine
+
+# (top, bottom, left, right), bottom/right exclusive
+Rect = Tuple[int, int, int, int]
+
+
+def expand_rect(rect: Rect, margin: int, height: int, width: int) -> Rect:
+    """Grows a rect by a margin on every side, clipped to the frame."""
+    top, bottom, left, right = rect
+    return (
+        max(top - margin, 0),
+        min(bottom + margin, height),
+        max(left - margin, 0),
+        min(right + margin, width),
+    )
+
+
+def crop(array: np.ndarray, rect: Rect, origin: Rect) -> np.ndarray:
+    """Crops an array that covers `origin` down to `rect`."""
+    top, bottom, left, right = rect
+    return array[
+        top - origin[0]:bottom - origin[0],
+        left - origin[2]:right - origin[2],
+    ]
+
+
+def iter_tiles(height: int, width: int, tile_size: int) -> List[Rect]:
+    """Splits a frame into a grid of tiles."""
+    return [
+        (
+            top,
+            min(top + tile_size, height),
+            left,
+            min(left + tile_size, width),
+        )
+        for top in range(0, height, tile_size)
+        for left in range(0, width, tile_size)
+    ]
+
+
+class TiledRunner:
+    """Executes one run of a graph in the engine's tiled mode."""
+
+    def __init__(
+        self,
+        engine: "Engine",
+        plan: ExecutionPlan,
+        nodes: Optional[List[BaseNode]] = None,
+        keep: Set[str] = frozenset(),
+    ):
+        self.engine = engine
+        self.plan = plan
+        self.graph = plan.graph
+        nodes = plan.nodes if nodes is None else nodes
+        self.sorted_nodes = [node.id for node in nodes]
+        # Nodes whose whole-frame outputs are wanted even when only other
+        # group members read them
+        self.keep = keep
+        self.halos: Dict[str, Optional[int]] = {
+            node.id: node.tile_halo() for node in nodes
+        }
+
+    def run(self, cancel_event: Optional[threading.Event] = None) -> set:
+        """Runs the nodes, tiling groups of tileable nodes."""
+        from app.core.engine import ExecutionCancelled
+
+        executed = set()
+        for stage in self._group_stages():
+            if cancel_event is not None and cancel_event.is_set():
+                raise ExecutionCancelled()
+            tiled = [n for n in stage if self.halos[n] is not None]
+            full_frame = [n for n in stage if self.halos[n] is None]
+            if tiled:
+                self._run_group(tiled, cancel_event)
+            for node_id in full_frame:
+                self._run_full_frame(node_id)
+            executed.update(stage)
+        return executed
+
+    def _group_stages(self) -> List[List[str]]:
+        """
+        Splits the nodes into stages. A tileable node shares a stage with
+        its tileable inputs; any other edge moves to a later stage. Within
+        a stage, tileable and full-frame nodes never depend on each other.
+        """
+        stage_of: Dict[str, int] = {}
+        for node_id in self.sorted_nodes:
+            stage = 0
+            for edge in self.graph.get_incoming_edges(node_id):
+                source = edge.source_node_id
+                both_tiled = (
+                    self.halos[source] is not None
+                    and self.halos[node_id] is not None
+                )
+                stage = max(
+                    stage, stage_of[source] + (0 if both_tiled else 1)
+                )
+            stage_of[node_id] = stage
+
+        stages: List[List[str]] = [
+            [] for _ in range(max(stage_of.values()) + 1)
+        ]
+        for node_id in self.sorted_nodes:
+            stages[stage_of[node_id]].append(node_id)
+        return stages
+
+    def _run_full_frame(self, node_id: str):
+        engine, graph = self.engine, self.graph
+        node = graph.nodes[node_id]
+        key = engine._get_key_for_node(node, self.plan)
+        node.dirty = False
+        inputs = engine._get_inputs_for_node(
+            node, self.plan, engine.node_outputs
+        )
+        result = engine._run_node(node, key, inputs)
+        engine._store_result(self.plan, node, key, result)
+
+    def _frame_size(self, group: List[str]) -> Optional[Tuple[int, int]]:
+        """Returns the common (height, width) of the group's inputs."""
+        members = set(group)
+        sizes = set()
+        for node_id in group:
+            for edge in self.graph.get_incoming_edges(node_id):
+                if edge.source_node_id in members:
+                    continue
+                value = self.engine.node_outputs.get(
+                    edge.source_node_id, {}
+                ).get(edge.source_output_name)
+                if not isinstance(value, np.ndarray) or value.ndim < 2:
+                    return None
+                sizes.add(value.shape[:2])
+        return sizes.pop() if len(sizes) == 1 else None
+
+    def _run_group(
+        self, group: List[str], cancel_event: Optional[threading.Event]
+    ):
+        from app.core.engine import ExecutionCancelled
+
+        engine, graph = self.engine, self.graph
+        size = self._frame_size(group)
+        if size is None:
+            # Nothing to tile over (or mismatched frames): run whole frames
+            for node_id in group:
+                self._run_full_frame(node_id)
+            return
+        height, width = size
+        members = set(group)
+
+        # Context each member's output must carry beyond the final tile,
+        # so that its tileable consumers can apply their own halos
+        margins = {node_id: 0 for node_id in group}
+        stitched = set()
+        for node_id in reversed(group):
+            consumers = graph.get_outgoing_edges(node_id)
+            if not consumers or node_id in self.keep:
+                stitched.add(node_id)
+            for edge in consumers:
+                target = edge.target_node_id
+                if target in members:
+                    margins[node_id] = max(
+                        margins[node_id], margins[target] + self.halos[target]
+                    )
+                else:
+                    stitched.add(node_id)
+
+        for node_id in group:
+            node = graph.nodes[node_id]
+            key = engine._get_key_for_node(node, self.plan)
+            if key is not None:
+                engine.node_keys[node_id] = key
+            node.dirty = False
+            print(f"Executing Node (tiled): {node.name}")
+
+        frames: Dict[str, Dict] = {node_id: {} for node_id in stitched}
+        frames_lock = threading.Lock()
+
+        def run_tile(tile: Rect):
+            tile_outputs: Dict[str, Tuple[Rect, Dict]] = {}
+            for node_id in group:
+                node = graph.nodes[node_id]
+                out_rect = expand_rect(tile, margins[node_id], height, width)
+                in_rect = expand_rect(
+                    out_rect, self.halos[node_id], height, width
+                )
+
+                inputs = {}
+                for edge in graph.get_incoming_edges(node_id):
+                    if edge.source_node_id in members:
+                        origin, outputs = tile_outputs[edge.source_node_id]
+                        value = outputs.get(edge.source_output_name)
+                    else:
+                        origin = (0, height, 0, width)
+                        value = engine.node_outputs[edge.source_node_id].get(
+                            edge.source_output_name
+                        )
+                    if isinstance(value, np.ndarray):
+                        value = crop(value, in_rect, origin)
+                    inputs[edge.target_input_name] = value
+
+                result = engine._execute_node(node, inputs)
+                cropped = {}
+                for name, value in result.items():
+                    if isinstance(value, np.ndarray):
+                        if value.shape[:2] != (
+                            in_rect[1] - in_rect[0],
+                            in_rect[3] - in_rect[2],
+                        ):
+                            raise ValueError(
+                                f"Node '{node.name}' changed the image size "
+                                "and cannot run in tiled mode."
+                            )
+                        value = crop(value, out_rect, in_rect)
+                    cropped[name] = value
+                tile_outputs[node_id] = (out_rect, cropped)
+
+                if node_id in stitched:
+                    self._stitch(
+                        frames[node_id],
+                        cropped,
+                        tile,
+                        out_rect,
+                        (height, width),
+                        frames_lock,
+                    )
+
+        tiles = iter_tiles(height, width, engine.tile_size)
+        if engine.max_workers > 1 and len(tiles) > 1:
+            with ThreadPoolExecutor(max_workers=engine.max_workers) as pool:
+                futures = [pool.submit(run_tile, tile) for tile in tiles]
+                for future in futures:
+                    if cancel_event is not None and cancel_event.is_set():
+                        for other in futures:
+                            other.cancel()
+                        raise ExecutionCancelled()
+                    future.result()
+        else:
+            for tile in tiles:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ExecutionCancelled()
+                run_tile(tile)
+
+        for node_id in group:
+            if node_id in stitched:
+                engine._store_result(
+                    self.plan, graph.nodes[node_id], None, frames[node_id]
+                )
+            else:
+                # Never materialised as a whole frame; a later run that
+                # needs it will execute the node again
+                engine.node_outputs.pop(node_id, None)
+
+    @staticmethod
+    def _stitch(
+        frame: Dict,
+        outputs: Dict,
+        tile: Rect,
+        out_rect: Rect,
+        size: Tuple[int, int],
+        lock: threading.Lock,
+    ):
+        """Copies a tile of each output into the node's full frames."""
+        top, bottom, left, right = tile
+        for name, value in outputs.items():
+            if not isinstance(value, np.ndarray):
+                frame.setdefault(name, value)
+                continue
+            with lock:
+                if name not in frame:
+                    frame[name] = np.empty(
+                        size + value.shape[2:], dtype=value.dtype
+                    )
+                target = frame[name]
+            target[top:bottom, left:right] = crop(value, tile, out_rect)
@@ -0,0 +1,215 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from app.core.engine import Engine, ExecutionCancelled
+from app.core.graph import Graph
+from app.core.speculation import SpeculativeExecutor
+
+
+class GraphRunner(QObject):
+    """
+    Runs the engine on a background thread so the editor stays responsive.
+
+    Requests are coalesced: a burst of requests (e.g. one per keystroke)
+    results in a single run of the latest graph state, and a request made
+    while a run is in progress cancels that run between nodes.
+
+    Preview requests first run the graph at reduced resolution, then
+    refine at full resolution once no further edits arrive for
+    refine_delay_ms.
+
+    With a speculator, the values next to the last edited parameter are
+    precomputed whenever the runner falls idle, and any request cancels
+    that speculation.
+    """
+
+    run_started = pyqtSignal()
+    # Emitted with True when the run completed, False if it was cancelled
+    # or failed
+    run_finished = pyqtSignal(bool)
+    run_failed = pyqtSignal(str)
+
+    # Internal: carries a finished Future from the worker to the GUI thread
+    _worker_done = pyqtSignal(object)
+
+    def __init__(
+        self,
+        engine: Engine,
+        graph: Graph,
+        debounce_ms: int = 30,
+        preview_scale: float = 0.25,
+        refine_delay_ms: int = 400,
+        speculator: Optional[SpeculativeExecutor] = None,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.engine = engine
+        self.graph = graph
+        self.preview_scale = preview_scale
+        self.speculator = speculator
+        # (node ID, parameter name) of the last edit not yet speculated on
+        self._last_edit: Optional[Tuple[str, str]] = None
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="graph-runner"
+        )
+        self._cancel_event: Optional[threading.Event] = None
+        self._running = False
+        self._running_preview = False
+        self._pending = False
+        self._pending_full = False
+        self._pending_preview = False
+        # Called on the GUI thread once the run in progress is over
+        self._between_runs: List[Callable[[], None]] = []
+
+        # Restarted on every request, so only the last of a burst starts
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(debounce_ms)
+        self._debounce_timer.timeout.connect(self._start_pending_run)
+
+        # Restarted on every preview request; fires once editing pauses
+        self._refine_timer = QTimer(self)
+        self._refine_timer.setSingleShot(True)
+        self._refine_timer.setInterval(refine_delay_ms)
+        self._refine_timer.timeout.connect(self.request_run)
+
+        self._worker_done.connect(self._on_worker_done)
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    def request_run(self, full: bool = False):
+        """
+        Schedules a run of the graph. With full=True, stored outputs are
+        discarded first so every node executes.
+        """
+        self._refine_timer.stop()
+        self._pending = True
+        self._pending_full = self._pending_full or full
+        self._pending_preview = False
+        self._supersede()
+
+    def request_preview(self, edited: Optional[Tuple[str, str]] = None):
+        """
+        Schedules a reduced-resolution run for quick feedback, followed by
+        a full-resolution run once requests stop arriving. `edited` names
+        the (node ID, parameter) that changed, for speculation.
+        """
+        if edited is not None:
+            self._last_edit = edited
+        if not self._pending:
+            self._pending = True
+            self._pending_preview = True
+        self._refine_timer.start()
+        self._supersede()
+
+    def call_between_runs(self, callback: Callable[[], None]):
+        """
+        Calls `callback` once no run is in progress, right away if the
+        runner is idle. Anything that changes the engine's state or the
+        graph's nodes from the GUI thread must go through here.
+        """
+        if self._running:
+            self._between_runs.append(callback)
+        else:
+            callback()
+
+    def _supersede(self):
+        if self.speculator is not None:
+            self.speculator.cancel()
+        if self._running:
+            # The run in progress is now out of date
+            self._cancel_event.set()
+        self._debounce_timer.start()
+
+    def cancel(self):
+        """Drops pending requests and cancels the run in progress."""
+        self._pending = False
+        self._pending_full = False
+        self._pending_preview = False
+        self._debounce_timer.stop()
+        self._refine_timer.stop()
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+        if self.speculator is not None:
+            self.speculator.cancel()
+
+    def shutdown(self):
+        """Cancels any work and waits for the worker thread to exit."""
+        self.cancel()
+        self._executor.shutdown(wait=True)
+        if self.speculator is not None:
+            self.speculator.shutdown()
+        self.engine.shutdown()
+
+    def _start_pending_run(self):
+        if self._running or not self._pending:
+            return  # Started again from _on_worker_done
+
+        full = self._pending_full
+        preview = self._pending_preview
+        self._pending = False
+        self._pending_full = False
+        self._pending_preview = False
+        self._running = True
+        self._running_preview = preview
+        self._cancel_event = threading.Event()
+
+        self.run_started.emit()
+        future = self._executor.submit(
+            self._run, full, preview, self._cancel_event
+        )
+        # The callback fires on the worker thread; the signal hops the
+        # result back to the GUI thread
+        future.add_done_callback(self._worker_done.emit)
+
+    def _run(
+        self, full: bool, preview: bool, cancel_event: threading.Event
+    ):
+        """Executes the graph. Runs on the worker thread."""
+        if preview:
+            self.engine.process_preview(
+                self.graph, self.preview_scale, cancel_event=cancel_event
+            )
+            return
+        if full:
+            self.engine.invalidate()
+        self.engine.process(self.graph, cancel_event=cancel_event)
+
+    def _on_worker_done(self, future: Future):
+        self._running = False
+        callbacks, self._between_runs = self._between_runs, []
+        for callback in callbacks:
+            callback()
+        error = future.exception()
+        if isinstance(error, ExecutionCancelled):
+            print("--- Graph Execution Cancelled ---")
+            self.run_finished.emit(False)
+        elif error is not None:
+            print(f"Error during graph execution: {error}")
+            self.run_failed.emit(str(error))
+            self.run_finished.emit(False)
+        else:
+            self.run_finished.emit(True)
+            self._speculate()
+
+        if self._pending and not self._debounce_timer.isActive():
+            self._start_pending_run()
+
+    def _speculate(self):
+        """Precomputes around the last edit once a full run is done."""
+        if (
+            self.speculator is None
+            or self._last_edit is None
+            or self._running_preview
+            or self._pending
+        ):
+            return
+        node_id, param_name = self._last_edit
+        self._last_edit = None
+        self.speculator.speculate(self.graph, node_id, param_name)
@@ -1,6 +1,3 @@
-from PyQt6.QtWidgets import QApplication
-from app.main_window import MainWindow
-
 import sys
 import os
 
@@ -10,6 +7,11 @@ sys.path.insert(
 
 
 def main():
+    # Imported here so that importing this module stays cheap; the window
+    # pulls in the Qt widget modules
+    from PyQt6.QtWidgets import QApplication
+    from app.main_window import MainWindow
+
     # --- GUI Setup ---
     app = QApplication(sys.argv)
     main_win = MainWindow()
@@ -1,4 +1,4 @@
-import yaml
+import os
 from PyQt6.QtWidgets import (
     QMainWindow,
     QWidget,
@@ -14,6 +14,13 @@ from PyQt6.QtCore import Qt
 from app.node_editor.graph_view import GraphView
 from app.core.graph import Graph
 from app.core.engine import Engine
+from app.core.cache import OutputCache
+from app.core.profiler import Profiler
+from app.core.speculation import SpeculativeExecutor
+from app.core.pipeline_io import load_pipeline_file, save_pipeline_file
+from app.graph_runner import GraphRunner
+from app.plugin_watcher import PluginWatcher
+from app.node_editor.frame_converter import FrameConverter
 from app.node_editor.image_display_item import ImageDisplayItem
 from app.node_discovery import get_node_classes
 from app.node_editor.node import Node
@@ -30,12 +37,34 @@ class MainWindow(QMainWindow):
 
         # --- Core Logic ---
         self.graph = Graph()
-        self.engine = Engine()
+        self.profiler = Profiler()
+        self.engine = Engine(
+            cache=OutputCache(),
+            max_workers=os.cpu_count() or 1,
+            profiler=self.profiler,
+        )
+        # Precomputes the neighbours of edited values while the CPU is idle
+        self.speculator = SpeculativeExecutor(self.engine)
+        self.runner = GraphRunner(
+            self.engine, self.graph, speculator=self.speculator, parent=self
+        )
         self.node_classes = get_node_classes()
 
         # --- UI Setup ---
         self.init_ui()
 
+        # --- Hot Reload of Node Modules ---
+        self.plugin_watcher = PluginWatcher(
+            self.node_classes,
+            self.graph,
+            self.engine,
+            runner=self.runner,
+            parent=self,
+        )
+        self.plugin_watcher.registry_changed.connect(self.refresh_node_list)
+        self.plugin_watcher.nodes_rebound.connect(self.rebind_ui_nodes)
+        self.plugin_watcher.start()
+
     def init_ui(self):
         """Initializes the user interface."""
         central_widget = QWidget(self)
@@ -49,14 +78,17 @@ class MainWindow(QMainWindow):
         top_bar.setFixedHeight(40)
         top_bar_layout = QHBoxLayout(top_bar)
         self.run_button = QPushButton("Execute Graph")
-        self.run_button.clicked.connect(self.execute_graph)
+        self.run_button.clicked.connect(self.rerun_graph)
         self.save_button = QPushButton("Save Pipeline")
         self.save_button.clicked.connect(self.save_pipeline)
         self.load_button = QPushButton("Load Pipeline")
         self.load_button.clicked.connect(self.load_pipeline)
+        self.trace_button = QPushButton("Export Trace")
+        self.trace_button.clicked.connect(self.export_trace)
         top_bar_layout.addWidget(self.run_button)
         top_bar_layout.addWidget(self.save_button)
         top_bar_layout.addWidget(self.load_button)
+        top_bar_layout.addWidget(self.trace_button)
         top_bar_layout.addStretch()
         main_layout.addWidget(top_bar)
 
@@ -76,8 +108,14 @@ class MainWindow(QMainWindow):
         self.image_view = QGraphicsView(self)
         self.image_scene = QGraphicsScene(self)
         self.image_view.setScene(self.image_scene)
-        self.image_display = ImageDisplayItem()
+        self.frame_converter = FrameConverter(self)
+        self.image_display = ImageDisplayItem(self.frame_converter)
         self.image_scene.addItem(self.image_display)
+        # Frames are converted on the converter's thread and handed to the
+        # view on the GUI thread
+        self.frame_converter.frame_ready.connect(
+            self.image_display.set_frame, Qt.ConnectionType.QueuedConnection
+        )
         splitter.addWidget(self.image_view)
 
         # --- Properties Panel (Far Right Side) ---
@@ -88,16 +126,88 @@ class MainWindow(QMainWindow):
 
         # --- Connect Signals ---
         self.graph_view.node_selected.connect(self.properties_panel.set_node)
+        self.properties_panel.parameter_changed.connect(self.preview_graph)
+        self.runner.run_finished.connect(self.update_node_timings)
 
         # Set initial sizes for the splitter
         splitter.setSizes([200, 800, 400, 200])
 
     def execute_graph(self):
-        """Executes the current graph."""
+        """Schedules an execution of the current graph in the background."""
         print("--- MainWindow: Requesting Graph Execution ---")
-        self.engine.process(self.graph)
+        self.runner.request_run()
         print(f"Graph state: {self.graph}")
 
+    def preview_graph(self, base_node, param_name):
+        """Previews the graph at reduced resolution, then refines it."""
+        self.runner.request_preview(edited=(base_node.id, param_name))
+
+    def rerun_graph(self):
+        """Discards stored node outputs and executes the whole graph."""
+        self.runner.request_run(full=True)
+
+    def update_node_timings(self, completed):
+        """Shows each node's last runtime and highlights the slowest."""
+        last_run = self.profiler.last_run()
+        slowest = {
+            record.node_id
+            for record in self.profiler.slowest(max(1, len(last_run) // 5))
+        }
+        for node_id, base_node in self.graph.nodes.items():
+            record = self.profiler.last_records.get(node_id)
+            if record is not None and hasattr(base_node, "ui_node"):
+                base_node.ui_node.set_runtime(
+                    record.wall_time * 1000, node_id in slowest
+                )
+
+    def refresh_node_list(self, changed_names):
+        """Rebuilds the node palette after node modules were reloaded."""
+        self.node_list_widget.clear()
+        self.node_list_widget.populate_nodes()
+
+    def rebind_ui_nodes(self, rebound):
+        """Points the UI at node instances rebuilt by a hot reload."""
+        for old_node, new_node in rebound:
+            ui_node = getattr(old_node, "ui_node", None)
+            if ui_node is None:
+                continue
+            ui_node.base_node = new_node
+            new_node.ui_node = ui_node
+            if new_node.name == "Display Image":
+                self.connect_display_node(new_node)
+            if self.properties_panel.current_node is ui_node:
+                self.properties_panel.set_node(ui_node)
+        self.execute_graph()
+
+    def export_trace(self):
+        """Saves the recorded node timings as a Chrome trace file."""
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Export Trace", "", "Chrome Trace Files (*.json)"
+        )
+        if file_path:
+            self.profiler.export_chrome_trace(file_path)
+            print(f"Trace exported to {file_path}")
+
+    def connect_display_node(self, base_node):
+        """Routes a Display node's images to the image view."""
+        # Nodes execute on worker threads; the images are handed straight
+        # to the converter, which does its work off the GUI thread
+        base_node.image_processed.connect(
+            self.frame_converter.submit, Qt.ConnectionType.DirectConnection
+        )
+        base_node.preview_processed.connect(
+            self.frame_converter.submit, Qt.ConnectionType.DirectConnection
+        )
+
+    def closeEvent(self, event):
+        """Stops background execution before the window closes."""
+        self.plugin_watcher.stop()
+        self.runner.shutdown()
+        self.frame_converter.shutdown()
+        for node in self.graph.nodes.values():
+            node.close()
+        super().closeEvent(event)
+
     def add_edge_to_graph(self, start_socket, end_socket):
         """Adds a logical edge to the core graph."""
         source_node_id = start_socket.node.base_node.id
@@ -123,9 +233,7 @@ class MainWindow(QMainWindow):
             self, "Save Pipeline", "", "YAML Files (*.yaml *.yml)"
         )
         if file_path:
-            graph_data = self.graph.serialize()
-            with open(file_path, "w") as f:
-                yaml.dump(graph_data, f, default_flow_style=False)
+            save_pipeline_file(file_path, self.graph.serialize())
             print(f"Pipeline saved to {file_path}")
 
     def load_pipeline(self):
@@ -134,21 +242,13 @@ class MainWindow(QMainWindow):
             self, "Load Pipeline", "", "YAML Files (*.yaml *.yml)"
         )
         if file_path:
-            # Add a constructor to handle Python tuples
-            def tuple_constructor(loader, node):
-                return tuple(loader.construct_sequence(node))
-
-            yaml.add_constructor(
-                "tag:yaml.org,2002:python/tuple",
-                tuple_constructor,
-                Loader=yaml.SafeLoader,
-            )
-
-            with open(file_path, "r") as f:
-                graph_data = yaml.safe_load(f)
+            graph_data = load_pipeline_file(file_path)
 
             self.graph_view.clear()
             self.graph.deserialize(graph_data, self.node_classes)
+            # Start decoding source images while the UI is rebuilt
+            for base_node in self.graph.nodes.values():
+                base_node.prefetch()
 
             # Recreate the UI
             for node_id, base_node in self.graph.nodes.items():
@@ -164,9 +264,7 @@ class MainWindow(QMainWindow):
 
                 # Connect display node signal if it's a DisplayNode
                 if base_node.name == "Display Image":
-                    base_node.image_processed.connect(
-                        self.image_display.set_image
-                    )
+                    self.connect_display_node(base_node)
 
             # Recreate the edges
             for edge_data in graph_data["edges"]:
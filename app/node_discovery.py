@@ -1,60 +1,231 @@
+import ast
+import json
 import os
 import importlib
 import inspect
+from typing import Dict, List, Optional, Tuple
 from nodes.base_node import BaseNode
 
+# Node directories are resolved against the project root so discovery
+# works regardless of the current working directory
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-def get_node_classes():
+# Metadata of every node module, keyed on the file's mtime and size, so
+# unchanged modules are not even parsed at startup
+MANIFEST_PATH = os.path.join(
+    os.environ.get("XDG_CACHE_HOME")
+    or os.path.join(os.path.expanduser("~"), ".cache"),
+    "divya",
+    "node_manifest.json",
+)
+MANIFEST_VERSION = 1
+
+# Class attributes read from the source for the manifest
+METADATA_FIELDS = (
+    "name",
+    "category",
+    "description",
+    "inputs",
+    "outputs",
+    "parameters",
+)
+
+
+class NodeSpec:
+    """
+    A node class known from its module's source. It carries the class-level
+    metadata and imports the module the first time the node is created.
+    """
+
+    def __init__(self, module_name: str, class_name: str, metadata: Dict):
+        self.module_name = module_name
+        self.class_name = class_name
+        self.name: str = metadata["name"]
+        self.category: str = metadata.get("category", BaseNode.category)
+        self.description: str = metadata.get("description", "")
+        self.inputs: List[str] = metadata.get("inputs", [])
+        self.outputs: List[str] = metadata.get("outputs", [])
+        self.parameters: Dict = metadata.get("parameters", {})
+        self._node_class = None
+
+    def load(self) -> type:
+        """Imports the module and returns the node class."""
+        if self._node_class is None:
+            module = importlib.import_module(self.module_name)
+            self._node_class = getattr(module, self.class_name)
+        return self._node_class
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._node_class is not None
+
+    def __call__(self, *args, **kwargs) -> BaseNode:
+        return self.load()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"NodeSpec({self.module_name}.{self.class_name})"
+
+
+def get_node_classes(manifest_path: Optional[str] = MANIFEST_PATH):
     """
-    Dynamically discovers and returns all BaseNode subclasses from the
-    nodes.built_in directory and the plugins directory.
+    Discovers the nodes in the nodes.built_in directory and the plugins
+    directory. Returns a dict mapping node names to NodeSpecs, which import
+    their module only when first called. Modules whose nodes don't declare
+    their metadata at class level are imported straight away and map to
+    the node classes themselves.
     """
+    manifest = load_manifest(manifest_path)
+    entries = {}
     node_classes = {}
 
-    # --- Scan for built-in nodes ---
-    scan_directory("nodes/built_in", node_classes)
+    for module_name, file_path in find_node_modules():
+        entry = manifest.get(file_path)
+        stat = os.stat(file_path)
+        signature = [stat.st_mtime_ns, stat.st_size]
+        if entry is None or entry["signature"] != signature:
+            entry = {
+                "signature": signature,
+                "classes": parse_node_module(file_path),
+            }
+        entries[file_path] = entry
 
-    # --- Scan for plugin nodes ---
-    scan_directory("plugins", node_classes, is_plugin=True)
+        if entry["classes"] is None:
+            load_nodes_from_module(module_name, node_classes)
+            continue
+        for class_name, metadata in entry["classes"]:
+            spec = NodeSpec(module_name, class_name, metadata)
+            add_node_class(spec.name, spec, node_classes)
 
+    if entries != manifest:
+        save_manifest(manifest_path, entries)
     return node_classes
 
 
-def scan_directory(directory, node_classes, is_plugin=False):
-    """Scans a directory for node classes."""
-    for item_name in os.listdir(directory):
-        item_path = os.path.join(directory, item_name)
-
-        if is_plugin:
-            # For plugins, we look for .py files directly in the plugins folder
-            if item_name.endswith(".py") and not item_name.startswith("__"):
-                module_full_name = f"plugins.{item_name[:-3]}"
-                load_nodes_from_module(module_full_name, node_classes)
-        else:
-            # For built-in nodes, we expect subdirectories for categories
-            if os.path.isdir(item_path) and not item_name.startswith("__"):
-                for module_name in os.listdir(item_path):
-                    if module_name.endswith(
-                        ".py"
-                    ) and not module_name.startswith("__"):
-                        module_full_name = (
-                            f"nodes.built_in.{item_name}.{module_name[:-3]}"
-                        )
-                        load_nodes_from_module(module_full_name, node_classes)
+def find_node_modules() -> List[Tuple[str, str]]:
+    """Returns (module name, file path) for every node module."""
+    modules = []
+
+    # --- Built-in nodes, in one subdirectory per category ---
+    built_in = os.path.join(PROJECT_ROOT, "nodes", "built_in")
+    for item_name in sorted(os.listdir(built_in)):
+        item_path = os.path.join(built_in, item_name)
+        if os.path.isdir(item_path) and not item_name.startswith("__"):
+            for file_name in sorted(os.listdir(item_path)):
+                if file_name.startswith("__") or not file_name.endswith(".py"):
+                    continue
+                modules.append(
+                    (
+                        f"nodes.built_in.{item_name}.{file_name[:-3]}",
+                        os.path.join(item_path, file_name),
+                    )
+                )
+
+    # --- Plugin nodes, as .py files directly in the plugins folder ---
+    plugins = os.path.join(PROJECT_ROOT, "plugins")
+    for item_name in sorted(os.listdir(plugins)):
+        if item_name.endswith(".py") and not item_name.startswith("__"):
+            modules.append(
+                (
+                    f"plugins.{item_name[:-3]}",
+                    os.path.join(plugins, item_name),
+                )
+            )
+
+    return modules
+
+
+def parse_node_module(file_path: str) -> Optional[List[Tuple[str, Dict]]]:
+    """
+    Reads the node classes of a module from its source without importing
+    it. A node class is one that defines execute(). Returns a list of
+    (class name, metadata) pairs, or None if the module must be imported
+    to find out, e.g. because a node sets its name in __init__.
+    """
+    try:
+        with open(file_path, "rb") as f:
+            tree = ast.parse(f.read(), filename=file_path)
+    except (OSError, SyntaxError, ValueError):
+        return None  # Importing reports the error
+
+    classes = []
+    for statement in tree.body:
+        if not isinstance(statement, ast.ClassDef):
+            continue
+        defines_execute = any(
+            isinstance(item, ast.FunctionDef) and item.name == "execute"
+            for item in statement.body
+        )
+        if not defines_execute:
+            continue
+
+        metadata = {}
+        for item in statement.body:
+            if isinstance(item, ast.Assign):
+                targets, value = item.targets, item.value
+            elif isinstance(item, ast.AnnAssign) and item.value is not None:
+                targets, value = [item.target], item.value
+            else:
+                continue
+            for target in targets:
+                if (
+                    isinstance(target, ast.Name)
+                    and target.id in METADATA_FIELDS
+                ):
+                    try:
+                        metadata[target.id] = ast.literal_eval(value)
+                    except (ValueError, TypeError, SyntaxError):
+                        return None
+        if not isinstance(metadata.get("name"), str):
+            return None
+        classes.append((statement.name, metadata))
+    return classes
+
+
+def load_manifest(manifest_path: Optional[str]) -> Dict:
+    if manifest_path is None:
+        return {}
+    try:
+        with open(manifest_path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != MANIFEST_VERSION:
+        return {}
+    return data.get("modules", {})
+
+
+def save_manifest(manifest_path: Optional[str], entries: Dict):
+    if manifest_path is None:
+        return
+    try:
+        os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+        temp_path = f"{manifest_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump({"version": MANIFEST_VERSION, "modules": entries}, f)
+        os.replace(temp_path, manifest_path)
+    except (OSError, TypeError, ValueError) as e:
+        # The manifest only speeds up the next start
+        print(f"Warning: Could not write node manifest: {e}")
+
+
+def add_node_class(node_name, node_class, node_classes):
+    """Registers a node class (or NodeSpec) under its name."""
+    if node_name in node_classes:
+        print(
+            f"Warning: Duplicate node name '"
+            f"{node_name}' found. Overwriting."
+        )
+    node_classes[node_name] = node_class
 
 
 def load_nodes_from_module(module_full_name, node_classes):
-    """Loads node classes from a given module."""
+    """Imports a module and registers the node classes it contains."""
     try:
         module = importlib.import_module(module_full_name)
         for name, obj in inspect.getmembers(module, inspect.isclass):
             if issubclass(obj, BaseNode) and obj is not BaseNode:
-                node_name = obj().name
-                if node_name in node_classes:
-                    print(
-                        f"Warning: Duplicate node name '"
-                        f"{node_name}' found. Overwriting."
-                    )
-                node_classes[node_name] = obj
+                # Older nodes only set their name in the constructor
+                node_name = obj.name if obj.name is not None else obj().name
+                add_node_class(node_name, obj, node_classes)
     except Exception as e:
         print(f"Error importing node from {module_full_name}: {e}")
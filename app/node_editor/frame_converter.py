@@ -0,0 +1,214 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtGui import QImage
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# numpy is imported with the first frame rather than at startup
+
+# Frames cycle through three buffers per shape: one on screen, one queued
+# for the GUI thread and one being written
+BUFFERS_PER_SHAPE = 3
+
+
+@dataclass
+class Frame:
+    """A converted image ready to be painted, backed by a pooled buffer."""
+
+    image: Optional[QImage]
+    scale: float = 1.0
+    buffer: Optional["np.ndarray"] = None
+    pool_key: Optional[Tuple] = None
+
+
+def image_layout(image_data: "np.ndarray") -> Optional[Tuple]:
+    """
+    Returns (height, width, channels, QImage format) for a displayable
+    array, or None if the shape is not supported.
+    """
+    if image_data.ndim == 3 and image_data.shape[2] == 1:
+        image_data = image_data[:, :, 0]
+    if image_data.ndim == 2:
+        height, width = image_data.shape
+        return height, width, 1, QImage.Format.Format_Grayscale8
+    if image_data.ndim == 3 and image_data.shape[2] in (3, 4):
+        height, width, channels = image_data.shape
+        image_format = (
+            QImage.Format.Format_BGR888
+            if channels == 3
+            else QImage.Format.Format_RGBA8888
+        )
+        return height, width, channels, image_format
+    return None
+
+
+def write_pixels(target: "np.ndarray", source: "np.ndarray"):
+    """
+    Writes `source` into the uint8 `target` in a single pass, honouring
+    the source strides and converting its dtype:
+    booleans map to 0/255, floats in [0, 1] are scaled to 0-255, 16-bit
+    images keep their high byte and anything else is clipped to 0-255.
+    """
+    import numpy as np
+
+    if source.ndim == 3 and source.shape[2] == 1:
+        source = source[:, :, 0]
+    if source.ndim == 3 and source.shape[2] == 4:
+        # OpenCV's BGRA, written out in the byte order of RGBA8888
+        for channel, source_channel in enumerate((2, 1, 0, 3)):
+            write_pixels(target[:, :, channel], source[:, :, source_channel])
+        return
+
+    if source.dtype == np.uint8:
+        np.copyto(target, source)
+    elif source.dtype == np.bool_:
+        np.multiply(source, 255, out=target, casting="unsafe")
+    elif source.dtype == np.uint16:
+        np.right_shift(source, 8, out=target, casting="unsafe")
+    elif np.issubdtype(source.dtype, np.floating):
+        scale = 255.0 if source.size and source.max() <= 1.0 else 1.0
+        np.copyto(target, np.clip(source * scale, 0, 255), casting="unsafe")
+    else:
+        np.copyto(target, np.clip(source, 0, 255), casting="unsafe")
+
+
+class FrameConverter(QObject):
+    """
+    Converts NumPy frames into QImages off the GUI thread.
+
+    Each frame is copied once, straight from the node's array into a
+    preallocated buffer that the QImage wraps. Buffers are reused while the
+    frame shape stays the same. Only the latest submitted frame is
+    converted and the next one waits until the view has taken it, so a slow
+    view never queues up stale frames.
+    """
+
+    # Carries a Frame; connect it to the view with a queued connection
+    frame_ready = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="frame-converter"
+        )
+        self._lock = threading.Lock()
+        self._pending: Optional[Tuple["np.ndarray", float]] = None
+        self._busy = False
+        self._closed = False
+        self._pool_key: Optional[Tuple] = None
+        self._free: List["np.ndarray"] = []
+        self._allocated = 0
+
+    def submit(self, image_data: "np.ndarray", scale: float = 1.0):
+        """Queues a frame for conversion. Safe to call from any thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._pending = (image_data, scale)
+            if self._busy:
+                return  # Picked up once the current frame is displayed
+            self._busy = True
+        self._executor.submit(self._convert_pending)
+
+    def frame_displayed(self):
+        """
+        Called by the view once it has taken the last emitted frame, so
+        that at most one converted frame is ever waiting for the GUI.
+        """
+        with self._lock:
+            if self._pending is None or self._closed:
+                self._busy = False
+                return
+        self._executor.submit(self._convert_pending)
+
+    def _convert_pending(self):
+        while True:
+            with self._lock:
+                if self._pending is None:
+                    self._busy = False
+                    return
+                image_data, scale = self._pending
+                self._pending = None
+            try:
+                frame = self.convert(image_data, scale)
+            except Exception as e:
+                print(f"Error converting frame: {e}")
+                continue
+            if frame is not None:
+                self.frame_ready.emit(frame)
+                return
+
+    def convert(
+        self, image_data: "np.ndarray", scale: float = 1.0
+    ) -> Optional[Frame]:
+        """
+        Converts a frame on the calling thread. An empty array gives a
+        frame without an image, which clears the view.
+        """
+        if image_data is None or image_data.size == 0:
+            return Frame(None, scale)
+
+        layout = image_layout(image_data)
+        if layout is None:
+            print("Error: Unsupported image format.")
+            return None
+        height, width, channels, image_format = layout
+
+        pool_key = (height, width, channels)
+        buffer = self._acquire(pool_key)
+        if buffer is None:
+            print("Warning: No free display buffer, dropping frame.")
+            return None
+        row_bytes = width * channels
+        pixels = buffer[:, :row_bytes].reshape(height, width, channels)
+        write_pixels(pixels if channels > 1 else pixels[:, :, 0], image_data)
+
+        q_image = QImage(
+            buffer.data, width, height, buffer.strides[0], image_format
+        )
+        return Frame(q_image, scale, buffer, pool_key)
+
+    def release(self, frame: Frame):
+        """Returns a frame's buffer once it is no longer on screen."""
+        if frame is None or frame.buffer is None:
+            return
+        with self._lock:
+            if frame.pool_key == self._pool_key:
+                self._free.append(frame.buffer)
+        frame.buffer = None
+
+    def _acquire(self, pool_key: Tuple) -> Optional["np.ndarray"]:
+        with self._lock:
+            if pool_key != self._pool_key:
+                # New frame shape: buffers of the old one are dropped as
+                # they are released
+                self._pool_key = pool_key
+                self._free = []
+                self._allocated = 0
+            if self._free:
+                return self._free.pop()
+            if self._allocated >= BUFFERS_PER_SHAPE:
+                return None
+            self._allocated += 1
+        height, width, channels = pool_key
+        import numpy as np
+
+        # QImage scanlines must start on 32-bit boundaries
+        row_stride = (width * channels + 3) & ~3
+        return np.empty((height, row_stride), dtype=np.uint8)
+
+    def pool_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"allocated": self._allocated, "free": len(self._free)}
+
+    def shutdown(self):
+        """Stops the conversion thread."""
+        with self._lock:
+            self._closed = True
+            self._pending = None
+        self._executor.shutdown(wait=True)
@@ -62,9 +62,7 @@ class GraphView(QGraphicsView):
 
         # Connect display node signal if it's a DisplayNode
         if base_node.name == "Display Image":
-            base_node.image_processed.connect(
-                main_window.image_display.set_image
-            )
+            main_window.connect_display_node(base_node)
 
         return ui_node
 
@@ -1,49 +1,64 @@
-from PyQt6.QtWidgets import QGraphicsPixmapItem
-from PyQt6.QtGui import QImage, QPixmap
-import numpy as np
+from typing import Optional
 
+from PyQt6.QtWidgets import QGraphicsObject
+from PyQt6.QtCore import QRectF, pyqtSlot
 
-class ImageDisplayItem(QGraphicsPixmapItem):
-    """A QGraphicsItem that can display a NumPy image array."""
+from app.node_editor.frame_converter import Frame, FrameConverter
 
-    def __init__(self, parent=None):
+
+class ImageDisplayItem(QGraphicsObject):
+    """
+    A QGraphicsItem that displays frames converted by a FrameConverter.
+
+    The converted QImage is painted directly, so no QPixmap copy is made on
+    the GUI thread.
+    """
+
+    def __init__(
+        self, converter: Optional[FrameConverter] = None, parent=None
+    ):
         super().__init__(parent)
+        self.converter = converter or FrameConverter(self)
+        self.frame: Optional[Frame] = None
 
-    def set_image(self, image_data: np.ndarray):
+    def set_image(self, image_data, scale: float = 1.0):
         """
-        Sets the image to be displayed from a NumPy array.
-        Handles different image formats (grayscale, RGB).
+        Sets the image to be displayed from a NumPy array, converting it on
+        the calling thread. A reduced resolution preview passes its scale
+        so it is drawn at the size of the full-resolution image it stands
+        in for.
         """
         if image_data is None:
-            # Clear the pixmap if the image is None
-            self.setPixmap(QPixmap())
-            return
-
-        # --- Convert NumPy array to QImage ---
-        if len(image_data.shape) == 2:  # Grayscale
-            height, width = image_data.shape
-            bytes_per_line = width
-            q_image = QImage(
-                image_data.data,
-                width,
-                height,
-                bytes_per_line,
-                QImage.Format.Format_Grayscale8,
-            )
-        elif len(image_data.shape) == 3:  # Color (assuming BGR for OpenCV)
-            height, width, channel = image_data.shape
-            bytes_per_line = 3 * width
-            q_image = QImage(
-                image_data.data,
-                width,
-                height,
-                bytes_per_line,
-                QImage.Format.Format_BGR888,
-            )
-        else:
-            print("Error: Unsupported image format.")
-            return
-
-        # --- Convert QImage to QPixmap and display ---
-        pixmap = QPixmap.fromImage(q_image)
-        self.setPixmap(pixmap)
+            import numpy as np
+
+            image_data = np.array([])
+        frame = self.converter.convert(image_data, scale)
+        if frame is not None:
+            self.set_frame(frame)
+
+    @pyqtSlot(object)
+    def set_frame(self, frame: Frame):
+        """Shows a converted frame. Must be called on the GUI thread."""
+        old_frame = self.frame
+        if self._frame_size(old_frame) != self._frame_size(frame):
+            self.prepareGeometryChange()
+        self.frame = frame
+        self.setScale(1.0 / frame.scale)
+        self.update()
+        # The previous buffer can be written again once it is off screen
+        self.converter.release(old_frame)
+        self.converter.frame_displayed()
+
+    @staticmethod
+    def _frame_size(frame: Optional[Frame]):
+        if frame is None or frame.image is None:
+            return (0, 0)
+        return (frame.image.width(), frame.image.height())
+
+    def boundingRect(self):
+        width, height = self._frame_size(self.frame)
+        return QRectF(0, 0, width, height)
+
+    def paint(self, painter, option, widget=None):
+        if self.frame is not None and self.frame.image is not None:
+            painter.drawImage(self.boundingRect(), self.frame.image)
@@ -21,6 +21,11 @@ class Node(QGraphicsObject):
         self.pen_selected = QPen(QColor("#FFFFA6"), 2)
         self.brush_title = QBrush(self.title_color)
         self.brush_background = QBrush(self.bg_color)
+        self.pen_slow = QPen(QColor("#FF5050"), 3)
+
+        # --- Profiling Overlay ---
+        self.runtime_ms = None
+        self.is_slowest = False
 
         # --- UI Elements ---
         self._setup_ui()
@@ -35,6 +40,12 @@ class Node(QGraphicsObject):
         """Adds an edge to this node's list of edges."""
         self.edges.append(edge)
 
+    def set_runtime(self, runtime_ms, is_slowest=False):
+        """Shows the node's last execution time on the canvas."""
+        self.runtime_ms = runtime_ms
+        self.is_slowest = is_slowest
+        self.update()
+
     def on_position_changed(self):
         """Called when the node's position changes."""
         for edge in self.edges:
@@ -78,9 +89,12 @@ class Node(QGraphicsObject):
         # --- Body ---
         path_body = QRectF(0, 0, self.width, self.height)
         painter.setBrush(self.brush_background)
-        painter.setPen(
-            self.pen_default if not self.isSelected() else self.pen_selected
-        )
+        if self.isSelected():
+            painter.setPen(self.pen_selected)
+        elif self.is_slowest:
+            painter.setPen(self.pen_slow)
+        else:
+            painter.setPen(self.pen_default)
         painter.drawRoundedRect(path_body, 10, 10)
 
         # --- Title Bar ---
@@ -90,3 +104,15 @@ class Node(QGraphicsObject):
         painter.drawRect(
             path_title.adjusted(5, 5, -5, 0)
         )  # Rounded top corners
+
+        # --- Last Runtime ---
+        if self.runtime_ms is not None:
+            painter.setPen(
+                self.pen_slow.color() if self.is_slowest else self.pen_default
+            )
+            painter.setFont(QFont("Arial", 8))
+            painter.drawText(
+                QRectF(10, self.height - 22, self.width - 20, 16),
+                Qt.AlignmentFlag.AlignRight,
+                f"{self.runtime_ms:.1f} ms",
+            )
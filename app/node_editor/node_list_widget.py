@@ -14,7 +14,8 @@ class NodeListWidget(QTreeWidget):
     def populate_nodes(self):
         categories = {}
         for node_name, node_class in self.node_classes.items():
-            category = node_class().category
+            # Read from the class metadata; nothing is imported or created
+            category = node_class.category
             if category not in categories:
                 categories[category] = []
             categories[category].append(node_name)
@@ -5,12 +5,16 @@ from PyQt6.QtWidgets import (
     QLineEdit,
     QFormLayout,
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, pyqtSignal
 
 
 class PropertiesPanel(QWidget):
     """A panel to display and edit the parameters of a selected node."""
 
+    # Emitted with the edited base node and the parameter's name after a
+    # parameter was updated
+    parameter_changed = pyqtSignal(object, str)
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Properties")
@@ -74,6 +78,9 @@ class PropertiesPanel(QWidget):
                     param_name, converted_value
                 )
                 print(f"Set '{param_name}' to {converted_value}")
+                self.parameter_changed.emit(
+                    self.current_node.base_node, param_name
+                )
             except (ValueError, TypeError) as e:
                 print(
                     f"Invalid value for '{param_name}': "
@@ -0,0 +1,212 @@
+import importlib
+import inspect
+import os
+import sys
+from typing import Callable, Dict, List, Optional, Tuple
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from app.core.engine import Engine
+from app.core.graph import Graph
+from app.graph_runner import GraphRunner
+from app.node_discovery import (
+    NodeSpec,
+    add_node_class,
+    find_node_modules,
+    load_nodes_from_module,
+    parse_node_module,
+)
+from nodes.base_node import BaseNode
+
+
+class PluginWatcher(QObject):
+    """
+    Polls the node modules for changes and hot-reloads the changed ones.
+
+    Only modules whose mtime or size changed are re-imported. Their classes
+    replace the old ones in the node registry, live instances in the graph
+    are rebuilt from the new class with the same ID and parameters, and
+    only those nodes' stored outputs are invalidated, so everything
+    upstream of them is reused on the next run.
+
+    With a runner, instances are rebuilt and invalidated between its runs,
+    never while a run is using them.
+    """
+
+    # Emitted after a reload with the names of the nodes in the registry
+    # that were added, changed or removed
+    registry_changed = pyqtSignal(list)
+    # Emitted with (old node, new node) pairs for the rebuilt instances
+    nodes_rebound = pyqtSignal(list)
+
+    def __init__(
+        self,
+        node_classes: Dict,
+        graph: Graph,
+        engine: Engine,
+        interval_ms: int = 1000,
+        find_modules: Callable[[], List[Tuple[str, str]]] = (
+            find_node_modules
+        ),
+        runner: Optional[GraphRunner] = None,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.node_classes = node_classes
+        self.graph = graph
+        self.engine = engine
+        self.runner = runner
+        self.find_modules = find_modules
+        self._signatures = self._scan()
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.poll)
+
+    def start(self):
+        self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+
+    def _scan(self) -> Dict[str, Tuple[str, Tuple[int, int]]]:
+        """Returns {module name: (file path, (mtime_ns, size))}."""
+        signatures = {}
+        for module_name, file_path in self.find_modules():
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+            signatures[module_name] = (
+                file_path,
+                (stat.st_mtime_ns, stat.st_size),
+            )
+        return signatures
+
+    def poll(self) -> List[str]:
+        """
+        Reloads the modules that changed since the last poll. Returns the
+        names of the reloaded (or added or removed) modules.
+        """
+        signatures = self._scan()
+        changed = [
+            module_name
+            for module_name, signature in signatures.items()
+            if self._signatures.get(module_name) != signature
+        ]
+        removed = [
+            module_name
+            for module_name in self._signatures
+            if module_name not in signatures
+        ]
+        self._signatures = signatures
+        if not changed and not removed:
+            return []
+
+        changed_names = []
+        modules = []
+        for module_name in removed:
+            changed_names += self._unregister(module_name)
+        for module_name in changed:
+            file_path, (mtime_ns, _) = signatures[module_name]
+            try:
+                module = self._reload(module_name, mtime_ns)
+            except Exception as e:
+                # Keep the old classes until the file is fixed
+                print(f"Error reloading {module_name}: {e}")
+                continue
+            changed_names += self._unregister(module_name)
+            changed_names += self._register(module_name, file_path)
+            if module is not None:
+                modules.append(module)
+            print(f"Reloaded node module {module_name}")
+
+        self.registry_changed.emit(sorted(set(changed_names)))
+        if modules:
+            if self.runner is not None:
+                self.runner.call_between_runs(lambda: self._rebind(modules))
+            else:
+                self._rebind(modules)
+        return changed + removed
+
+    def _rebind(self, modules: List):
+        """Rebuilds the reloaded modules' instances and drops their outputs."""
+        rebound = []
+        for module in modules:
+            rebound += self._rebind_instances(module)
+        if rebound:
+            self.engine.invalidate_nodes(new.id for _, new in rebound)
+            self.nodes_rebound.emit(rebound)
+
+    @staticmethod
+    def _reload(module_name: str, mtime_ns: int):
+        """
+        Re-imports a module if it was imported before. Modules that were
+        never imported are picked up lazily from their new source.
+        """
+        module = sys.modules.get(module_name)
+        if module is None:
+            return None
+        module = importlib.reload(module)
+        for _, obj in inspect.getmembers(module, inspect.isclass):
+            if issubclass(obj, BaseNode) and obj.__module__ == module_name:
+                # Part of the output cache key, so results computed by the
+                # old code are never served for the new one
+                obj._code_version = mtime_ns
+        return module
+
+    def _unregister(self, module_name: str) -> List[str]:
+        names = [
+            name
+            for name, node_class in self.node_classes.items()
+            if self._module_of(node_class) == module_name
+        ]
+        for name in names:
+            del self.node_classes[name]
+        return names
+
+    def _register(self, module_name: str, file_path: str) -> List[str]:
+        classes = parse_node_module(file_path)
+        if classes is None:
+            before = dict(self.node_classes)
+            load_nodes_from_module(module_name, self.node_classes)
+            return [
+                name
+                for name, node_class in self.node_classes.items()
+                if before.get(name) is not node_class
+            ]
+        names = []
+        for class_name, metadata in classes:
+            spec = NodeSpec(module_name, class_name, metadata)
+            add_node_class(spec.name, spec, self.node_classes)
+            names.append(spec.name)
+        return names
+
+    @staticmethod
+    def _module_of(node_class) -> Optional[str]:
+        if isinstance(node_class, NodeSpec):
+            return node_class.module_name
+        return getattr(node_class, "__module__", None)
+
+    def _rebind_instances(self, module) -> List[Tuple[BaseNode, BaseNode]]:
+        """Rebuilds graph nodes whose class came from the reloaded module."""
+        rebound = []
+        for node in list(self.graph.nodes.values()):
+            node_class = type(node)
+            if node_class.__module__ != module.__name__:
+                continue
+            new_class = getattr(module, node_class.__name__, None)
+            if new_class is None or new_class is node_class:
+                continue
+            new_node = new_class()
+            new_node.id = node.id
+            # Keep the user's values; parameters new to the class get
+            # their defaults
+            new_node.param_values.update(
+                (name, value)
+                for name, value in node.param_values.items()
+                if name in new_node.param_values
+            )
+            self.graph.replace_node(new_node)
+            rebound.append((node, new_node))
+        return rebound
@@ -0,0 +1,266 @@
+"""
+Headless parameter sweep.
+
+Runs a pipeline saved from the editor over every combination of some
+parameter values and writes a table with a row per combination:
+
+    python -m app.sweep pipeline.yaml \\
+        --param "Blur.kernel_size=3:15:2" \\
+        --param "Canny Edge.threshold1=50,100,150" \\
+        --metric mean --csv sweep.csv
+
+Nodes are given by ID or by name. Values are a comma-separated list, or
+start:stop:step for an inclusive numeric range.
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)
+
+from app.batch import find_sink_targets  # noqa: E402
+from app.core.graph import Graph  # noqa: E402
+from app.core.pipeline_io import load_pipeline_file  # noqa: E402
+from app.core.sweep import ParameterSweep, SweepPoint  # noqa: E402
+
+
+def _mean(image) -> float:
+    return float(image.mean())
+
+
+def _nonzero(image) -> float:
+    """Fraction of non-zero pixels, e.g. the edge density of a Canny map."""
+    import numpy as np
+
+    return np.count_nonzero(image) / image.size
+
+
+# Built-in metrics, computed for each target image
+METRICS = {"mean": _mean, "nonzero": _nonzero}
+
+
+def find_node(graph: Graph, ref: str):
+    """Returns the node with the given ID, or else the given name."""
+    if ref in graph.nodes:
+        return graph.nodes[ref]
+    matches = [node for node in graph.nodes.values() if node.name == ref]
+    if len(matches) != 1:
+        problem = "No node" if not matches else "More than one node"
+        raise ValueError(f"{problem} named '{ref}'; use the node ID")
+    return matches[0]
+
+
+# Spellings accepted for boolean parameters
+BOOL_VALUES = {"true": True, "1": True, "false": False, "0": False}
+
+
+def _parse_bool(text: str) -> bool:
+    try:
+        return BOOL_VALUES[text.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Expected true/false or 1/0, got '{text}'"
+        ) from None
+
+
+def parse_values(text: str, current: Any) -> List:
+    """
+    Parses the values of a swept parameter, converting them to the type of
+    its current value.
+    """
+    if isinstance(current, bool):
+        return [_parse_bool(part.strip()) for part in text.split(",")]
+    convert = type(current)
+    if ":" in text and isinstance(current, (int, float)):
+        start, stop, step = (convert(part) for part in text.split(":"))
+        if step <= 0:
+            raise ValueError(f"The step of '{text}' must be positive")
+        count = int(round((stop - start) / step, 9)) + 1
+        return [convert(start + i * step) for i in range(count)]
+    return [convert(part.strip()) for part in text.split(",")]
+
+
+def parse_param(graph: Graph, spec: str) -> Tuple[str, str, List]:
+    """Parses a NODE.PARAM=VALUES option into (node ID, name, values)."""
+    target, _, values = spec.partition("=")
+    ref, _, name = target.rpartition(".")
+    if not ref or not name or not values:
+        raise ValueError(f"Expected NODE.PARAM=VALUES, got '{spec}'")
+    node = find_node(graph, ref)
+    if name not in node.param_values:
+        raise ValueError(f"Node '{node.name}' has no parameter '{name}'")
+    return node.id, name, parse_values(values, node.param_values[name])
+
+
+def _image_writer(output_dir: str, extension: str):
+    """Returns a metric that writes a point's images and lists them."""
+    import cv2
+
+    def write(point: SweepPoint) -> str:
+        images = [
+            value
+            for value in point.results.values()
+            if getattr(value, "size", 0)
+        ]
+        written = []
+        for index, image in enumerate(images):
+            suffix = f"_{index}" if len(images) > 1 else ""
+            path = os.path.join(
+                output_dir, f"sweep_{point.index:04d}{suffix}{extension}"
+            )
+            if not cv2.imwrite(path, image):
+                raise IOError(f"Could not write {path}")
+            written.append(os.path.basename(path))
+        return " ".join(written)
+
+    return write
+
+
+def _target_metric(function, target):
+    """Applies a built-in metric to one target; empty outputs give None."""
+
+    def metric(point: SweepPoint):
+        value = point.results[target]
+        return function(value) if getattr(value, "size", 0) else None
+
+    return metric
+
+
+def run_sweep(
+    pipeline_path: str,
+    param_specs: List[str],
+    metric_names: List[str],
+    csv_path: Optional[str] = None,
+    output_dir: Optional[str] = None,
+    extension: str = ".png",
+    workers: Optional[int] = None,
+    verbose: bool = False,
+) -> List[Dict[str, Any]]:
+    """Runs a sweep and writes its table. Returns the table rows."""
+    from app.node_discovery import get_node_classes
+
+    graph = Graph()
+    graph.deserialize(load_pipeline_file(pipeline_path), get_node_classes())
+    ranges: Dict[str, Dict[str, List]] = {}
+    labels = {}
+    for spec in param_specs:
+        node_id, name, values = parse_param(graph, spec)
+        ranges.setdefault(node_id, {})[name] = values
+        labels[(node_id, name)] = spec.partition("=")[0]
+    targets = find_sink_targets(graph)
+
+    metrics = {}
+    for metric_name in metric_names:
+        for index, target in enumerate(targets):
+            column = metric_name
+            if len(targets) > 1:
+                column = f"{metric_name}_{index}"
+            metrics[column] = _target_metric(METRICS[metric_name], target)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        metrics["outputs"] = _image_writer(output_dir, extension)
+
+    sweep = ParameterSweep(max_workers=workers)
+    start = time.perf_counter()
+    stdout = sys.stdout
+    if not verbose:
+        # Node and engine progress output would swamp the table
+        sys.stdout = open(os.devnull, "w")
+    try:
+        points = sweep.run(graph, ranges, targets, metrics, keep_results=False)
+    finally:
+        if sys.stdout is not stdout:
+            sys.stdout.close()
+            sys.stdout = stdout
+    elapsed = time.perf_counter() - start
+
+    rows = []
+    for point in points:
+        row = {"index": point.index}
+        row.update(
+            (labels[key], value) for key, value in point.params.items()
+        )
+        row.update(point.metrics)
+        rows.append(row)
+
+    if rows:
+        out = open(csv_path, "w", newline="") if csv_path else sys.stdout
+        try:
+            writer = csv.DictWriter(out, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+    print(
+        f"Swept {len(points)} combinations in {elapsed:.2f} s "
+        f"({elapsed / max(len(points), 1) * 1000:.1f} ms each)",
+        file=sys.stderr,
+    )
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run a saved pipeline over a grid of parameter values."
+    )
+    parser.add_argument("pipeline", help="Pipeline YAML saved by the editor")
+    parser.add_argument(
+        "--param",
+        action="append",
+        dest="params",
+        required=True,
+        help="NODE.PARAM=VALUES to sweep, where VALUES is a,b,c or "
+        "start:stop:step (repeatable)",
+    )
+    parser.add_argument(
+        "--metric",
+        action="append",
+        dest="metrics",
+        choices=sorted(METRICS),
+        default=[],
+        help="Metric to tabulate for each sink image (repeatable)",
+    )
+    parser.add_argument(
+        "--csv", help="File for the results table (default: stdout)"
+    )
+    parser.add_argument(
+        "--output-dir", help="Also write every combination's sink images"
+    )
+    parser.add_argument(
+        "--ext", default=".png", help="Output file extension (default: .png)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Threads running the combinations (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="Show node progress output"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        run_sweep(
+            args.pipeline,
+            args.params,
+            args.metrics,
+            csv_path=args.csv,
+            output_dir=args.output_dir,
+            extension=args.ext,
+            workers=args.workers,
+            verbose=args.verbose,
+        )
+    except (KeyError, ValueError) as e:
+        parser.error(str(e))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+Headless benchmark suite for the engine, built-in nodes and graph
+operations.
+
+    python -m benchmarks run --output baseline.json [--quick]
+    python -m benchmarks compare baseline.json current.json [--threshold 0.15]
+"""
+
+import argparse
+import fnmatch
+import os
+import sys
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)
+
+from benchmarks import (  # noqa: E402
+    bench_graph,
+    bench_imports,
+    bench_memory,
+    bench_nodes,
+    bench_stream,
+    bench_sweep,
+)
+from benchmarks.harness import (  # noqa: E402
+    DEFAULT_THRESHOLD,
+    BenchmarkResults,
+    compare,
+    load_results,
+    print_comparison,
+)
+
+SUITES = {
+    "nodes": bench_nodes,
+    "graph": bench_graph,
+    "imports": bench_imports,
+    "memory": bench_memory,
+    "stream": bench_stream,
+    "sweep": bench_sweep,
+}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks")
+    run_parser.add_argument(
+        "--output", default="benchmark_results.json", help="Results file"
+    )
+    run_parser.add_argument(
+        "--quick", action="store_true", help="Smaller images and graphs"
+    )
+    run_parser.add_argument(
+        "--suite",
+        choices=sorted(SUITES),
+        action="append",
+        help="Only run the given suite (repeatable)",
+    )
+
+    compare_parser = commands.add_parser(
+        "compare", help="Compare two results files"
+    )
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed slowdown as a fraction (default: %(default)s)",
+    )
+    compare_parser.add_argument(
+        "--filter", default="*", help="Only compare names matching a glob"
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        results = BenchmarkResults()
+        for name in args.suite or sorted(SUITES):
+            SUITES[name].run(results, quick=args.quick)
+        results.save(args.output)
+        print(f"Results written to {args.output}")
+        return 0
+
+    baseline = {
+        name: result
+        for name, result in load_results(args.baseline).items()
+        if fnmatch.fnmatch(name, args.filter)
+    }
+    rows = compare(baseline, load_results(args.current), args.threshold)
+    print_comparison(rows)
+    regressions = [row for row in rows if row["regression"]]
+    print(
+        f"{len(regressions)} regression(s) beyond "
+        f"{args.threshold:.0%} in {len(rows)} benchmarks"
+    )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+# file: benchmarks/bench_graph.py
+
+import random
+from typing import Dict
+
+from app.core.engine import Engine
+from app.core.graph import Graph
+from benchmarks.harness import BenchmarkResults, measure
+from nodes.base_node import BaseNode
+
+GRAPH_SIZES = (10, 100, 1000, 10000)
+QUICK_GRAPH_SIZES = (10, 100, 1000)
+
+
+class PassThroughNode(BaseNode):
+    """A trivial node so graph benchmarks measure only engine overhead."""
+
+    category = "Benchmark"
+
+    def __init__(self):
+        super().__init__(
+            name="Pass Through",
+            inputs=["a", "b"],
+            outputs=["image"],
+            parameters={"gain": 1},
+        )
+
+    def execute(self, **kwargs) -> Dict:
+        return {"image": kwargs.get("a")}
+
+
+NODE_CLASSES = {"Pass Through": PassThroughNode}
+
+
+def make_edges(node_count: int, seed: int = 0):
+    """
+    Returns the edges of a random layered DAG where each node reads from up
+    to two of the ten nodes before it.
+    """
+    rng = random.Random(seed)
+    edges = []
+    for index in range(1, node_count):
+        window = range(max(0, index - 10), index)
+        for input_name in ("a", "b")[: rng.randint(1, 2)]:
+            edges.append((rng.choice(window), input_name, index))
+    return edges
+
+
+def build_graph(node_count: int, edges=None):
+    graph = Graph()
+    nodes = [PassThroughNode() for _ in range(node_count)]
+    for node in nodes:
+        graph.add_node(node)
+    for source, input_name, target in edges or make_edges(node_count):
+        graph.add_edge(nodes[source].id, "image", nodes[target].id, input_name)
+    return graph, nodes
+
+
+def run(results: BenchmarkResults, quick: bool = False):
+    sizes = QUICK_GRAPH_SIZES if quick else GRAPH_SIZES
+    for count in sizes:
+        edges = make_edges(count)
+        repeat = 3 if count >= 1000 else 5
+
+        state = {}
+
+        def fresh_graph():
+            state["graph"], state["nodes"] = build_graph(count, edges)
+
+        def add_edges():
+            graph = Graph()
+            nodes = [PassThroughNode() for _ in range(count)]
+            for node in nodes:
+                graph.add_node(node)
+            state["args"] = [
+                (nodes[s].id, "image", nodes[t].id, name)
+                for s, name, t in edges
+            ]
+            state["graph"] = graph
+
+        results.add(
+            f"graph.add_edge.n{count}",
+            measure(
+                lambda: [state["graph"].add_edge(*a) for a in state["args"]],
+                setup=add_edges,
+                repeat=repeat,
+            ),
+            edges=len(edges),
+        )
+
+        def remove_nodes():
+            graph, nodes = state["graph"], state["nodes"]
+            for node in nodes[::10]:
+                graph.remove_node(node.id)
+
+        results.add(
+            f"graph.remove_node.n{count}",
+            measure(remove_nodes, setup=fresh_graph, repeat=repeat),
+            removed=len(range(0, count, 10)),
+        )
+
+        fresh_graph()
+        engine = Engine()
+        graph = state["graph"]
+        results.add(
+            f"engine.topological_sort.n{count}",
+            measure(lambda: engine._topological_sort(graph), repeat=repeat),
+        )
+        results.add(
+            f"engine.process_full.n{count}",
+            measure(
+                lambda: engine.process(graph),
+                setup=engine.invalidate,
+                repeat=repeat,
+            ),
+        )
+        first = state["nodes"][count // 2]
+        results.add(
+            f"engine.process_incremental.n{count}",
+            measure(
+                lambda: engine.process(graph),
+                setup=lambda: first.set_param_value(
+                    "gain", first.param_values["gain"] + 1
+                ),
+                repeat=repeat,
+            ),
+        )
+
+        data = graph.serialize()
+        results.add(
+            f"graph.serialize.n{count}",
+            measure(graph.serialize, repeat=repeat),
+        )
+        results.add(
+            f"graph.deserialize.n{count}",
+            measure(
+                lambda: Graph().deserialize(data, NODE_CLASSES),
+                repeat=repeat,
+            ),
+        )
@@ -0,0 +1,89 @@
+# file: benchmarks/bench_imports.py
+
+"""
+Import-time measurements based on ``python -X importtime``. Each target is
+imported in a fresh interpreter, as a batch worker or the editor would.
+"""
+
+import os
+import subprocess
+import sys
+from typing import Dict, Tuple
+
+from benchmarks.harness import BenchmarkResults
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What a headless batch worker imports, and what the editor imports before
+# its window can appear
+IMPORT_TARGETS = {
+    "headless": [
+        "app.core.engine",
+        "app.core.graph",
+        "app.core.cache",
+        "app.core.profiler",
+        "app.core.pipeline_io",
+        "app.batch",
+    ],
+    "gui": ["app.main", "app.main_window"],
+}
+
+# Cold-start budgets in seconds, with headroom for slow machines. The
+# import tests only check them with BENCH_IMPORT_BUDGETS=1 set
+IMPORT_BUDGETS = {"headless": 0.4, "gui": 0.75}
+
+# Heavy modules each target must not load up front
+FORBIDDEN_MODULES = {
+    "headless": ("PyQt6", "cv2", "numpy", "yaml"),
+    "gui": ("cv2", "numpy", "yaml"),
+}
+
+
+def parse_importtime(stderr: str) -> Dict[str, Tuple[int, int, int]]:
+    """
+    Parses -X importtime output into {module: (self_us, cumulative_us,
+    depth)}.
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[12:].split("|")
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            modules[name.strip()] = (int(self_us), int(cumulative_us), depth)
+        except ValueError:
+            continue  # The header line
+    return modules
+
+
+def _importtime(code: str) -> Dict[str, Tuple[int, int, int]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def measure_imports(modules) -> Tuple[float, Dict[str, Tuple]]:
+    """
+    Imports modules in a fresh interpreter. Returns the time in seconds
+    spent on imports beyond interpreter startup, and the modules loaded.
+    """
+    startup = _importtime("pass")
+    loaded = _importtime(f"import {', '.join(modules)}")
+    for name in startup:
+        loaded.pop(name, None)
+    total_us = sum(
+        cumulative for _, cumulative, depth in loaded.values() if depth == 0
+    )
+    return total_us / 1e6, loaded
+
+
+def run(results: BenchmarkResults, quick: bool = False):
+    for target, modules in IMPORT_TARGETS.items():
+        times = [measure_imports(modules)[0] for _ in range(3 if quick else 7)]
+        results.add(f"import.{target}", times, modules=len(modules))
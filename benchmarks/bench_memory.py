@@ -0,0 +1,112 @@
+# file: benchmarks/bench_memory.py
+
+"""
+Peak memory of long linear chains of filters over large frames. Each
+configuration runs in a fresh interpreter, since the peak RSS of a process
+never goes down.
+
+    python -m benchmarks.bench_memory WIDTH HEIGHT LENGTH keep|release
+"""
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+from benchmarks.harness import BenchmarkResults
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (label, width, height, chain length)
+CHAINS = [("fhd", 1920, 1080, 8), ("8k", 7680, 4320, 8)]
+QUICK_CHAINS = ("fhd",)
+MODES = ("keep", "release")
+
+
+def peak_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in kilobytes on Linux and in bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def build_chain(width: int, height: int, length: int):
+    """Returns a graph of a frame source followed by `length` blurs."""
+    from app.core.graph import Graph
+    from benchmarks.bench_nodes import FrameSourceNode, make_image
+    from nodes.built_in.display.blur_node import BlurNode
+
+    graph = Graph()
+    previous = FrameSourceNode(make_image(width, height, 3))
+    graph.add_node(previous)
+    for _ in range(length):
+        node = BlurNode()
+        graph.add_node(node)
+        graph.add_edge(previous.id, "image", node.id, "image")
+        previous = node
+    return graph
+
+
+def run_chain(width: int, height: int, length: int, mode: str) -> dict:
+    """Runs a blur chain once and reports its time and peak memory."""
+    from app.core.engine import Engine
+
+    graph = build_chain(width, height, length)
+    engine = Engine(release_intermediates=mode == "release")
+
+    baseline = peak_rss_bytes()
+    start = time.perf_counter()
+    engine.process(graph)
+    return {
+        "seconds": time.perf_counter() - start,
+        "peak_rss_bytes": peak_rss_bytes() - baseline,
+    }
+
+
+def measure_chain(width: int, height: int, length: int, mode: str) -> dict:
+    """Runs a chain in a fresh interpreter."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.bench_memory",
+            str(width),
+            str(height),
+            str(length),
+            mode,
+        ],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def run(results: BenchmarkResults, quick: bool = False):
+    for label, width, height, length in CHAINS:
+        if quick and label not in QUICK_CHAINS:
+            continue
+        for mode in MODES:
+            runs = [
+                measure_chain(width, height, length, mode)
+                for _ in range(1 if quick else 3)
+            ]
+            results.add(
+                f"memory.chain{length}.{mode}.{label}",
+                [run["seconds"] for run in runs],
+                pixels=width * height,
+                peak_rss_bytes=max(run["peak_rss_bytes"] for run in runs),
+            )
+
+
+if __name__ == "__main__":
+    width, height, length = (int(arg) for arg in sys.argv[1:4])
+    with open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            result = run_chain(width, height, length, sys.argv[4])
+        finally:
+            sys.stdout = stdout
+    print(json.dumps(result))
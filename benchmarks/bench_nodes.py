@@ -0,0 +1,204 @@
+# file: benchmarks/bench_nodes.py
+
+import contextlib
+import itertools
+import os
+import tempfile
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from app.core.buffers import BufferPool
+from app.core.engine import Engine
+from app.core.graph import Graph
+from benchmarks.harness import BenchmarkResults, measure
+from nodes.base_node import BaseNode
+from nodes.built_in.display.blur_node import BlurNode
+from nodes.built_in.display.load_image import LoadImageNode
+from nodes.built_in.filters.canny_edge import CannyNode
+from nodes.built_in.io.load_image import LoadColorImageNode
+from nodes.image_cache import image_cache
+from plugins.custom_grayscale_node import GrayscaleNode
+
+# (label, width, height)
+IMAGE_SIZES = [
+    ("vga", 640, 480),
+    ("hd", 1280, 720),
+    ("fhd", 1920, 1080),
+    ("4k", 3840, 2160),
+    ("8k", 7680, 4320),
+]
+QUICK_SIZES = ("vga", "fhd")
+CHANNELS = (1, 3)
+
+
+def make_image(width: int, height: int, channels: int) -> np.ndarray:
+    """Returns a deterministic image with some structure for the filters."""
+    rng = np.random.default_rng(0)
+    shape = (height, width) if channels == 1 else (height, width, channels)
+    image = rng.integers(0, 32, shape, dtype=np.uint8)
+    # Add large shapes so Canny has real edges to follow
+    cv2.circle(image, (width // 2, height // 2), height // 3, (255,) * 3, -1)
+    cv2.rectangle(
+        image,
+        (width // 8, height // 8),
+        (width // 3, height // 3),
+        (160,) * 3,
+        -1,
+    )
+    return image
+
+
+class FrameSourceNode(BaseNode):
+    """Emits the same image as a new frame every time it runs."""
+
+    name = "Frame Source"
+    outputs = ["image"]
+    parameters = {"frame": 0}
+
+    def __init__(self, image=None):
+        super().__init__()
+        self.image = image
+
+    def execute(self, **kwargs):
+        return {"image": self.image}
+
+
+def build_pipeline(image: np.ndarray, buffer_pool=None):
+    """
+    Returns a function that pushes a new frame through blur -> canny and
+    grayscale, as a video or batch run would.
+    """
+    graph = Graph()
+    source = FrameSourceNode(image)
+    blur, canny, gray = BlurNode(), CannyNode(), GrayscaleNode()
+    for node in (source, blur, canny, gray):
+        graph.add_node(node)
+    graph.add_edge(source.id, "image", blur.id, "image")
+    graph.add_edge(blur.id, "image", canny.id, "image")
+    graph.add_edge(source.id, "image", gray.id, "image")
+    engine = Engine(buffer_pool=buffer_pool)
+
+    def next_frame():
+        source.set_param_value("frame", source.param_values["frame"] + 1)
+        engine.process(graph)
+
+    return next_frame
+
+
+def allocated_bytes_per_frame(next_frame, frames: int = 5) -> int:
+    """Returns the array memory newly allocated by each frame."""
+    with open(os.devnull, "w") as devnull:
+        with contextlib.redirect_stdout(devnull):
+            # Warm up: pooled buffers are recycled from the second frame on
+            next_frame()
+            next_frame()
+            tracemalloc.start()
+            try:
+                total = 0
+                for _ in range(frames):
+                    tracemalloc.reset_peak()
+                    before = tracemalloc.get_traced_memory()[0]
+                    next_frame()
+                    total += tracemalloc.get_traced_memory()[1] - before
+            finally:
+                tracemalloc.stop()
+    return total // frames
+
+
+def run(results: BenchmarkResults, quick: bool = False):
+    sizes = [s for s in IMAGE_SIZES if not quick or s[0] in QUICK_SIZES]
+    filters = {
+        "blur": BlurNode,
+        "canny": CannyNode,
+        "grayscale": GrayscaleNode,
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, width, height in sizes:
+            for channels in CHANNELS:
+                image = make_image(width, height, channels)
+                pixels = width * height
+                for filter_name, node_class in filters.items():
+                    # A new node for every call, so nothing is carried over
+                    # from the previous one
+                    results.add(
+                        f"node.{filter_name}.{label}.c{channels}",
+                        measure(lambda: node_class().execute(image=image)),
+                        pixels=pixels,
+                    )
+
+                # Threshold-only edits: the input stays the same, so the
+                # node keeps its gradients
+                node = CannyNode()
+                thresholds = itertools.cycle((50, 100))
+
+                def retune():
+                    node.set_param_value("threshold1", next(thresholds))
+                    node.execute(image=image)
+
+                results.add(
+                    f"node.canny_retune.{label}.c{channels}",
+                    measure(retune),
+                    pixels=pixels,
+                )
+
+                path = os.path.join(tmp, f"{label}_c{channels}.png")
+                cv2.imwrite(path, image)
+                for load_name, node_class in (
+                    ("load_gray", LoadImageNode),
+                    ("load_color", LoadColorImageNode),
+                ):
+                    node = node_class()
+                    node.set_param_value("path", path)
+                    # A decode each time, as before the shared image cache,
+                    # and then reads served by the cache
+                    results.add(
+                        f"node.{load_name}.{label}.c{channels}",
+                        measure(
+                            lambda: node.execute(),
+                            setup=image_cache.clear,
+                            repeat=3,
+                        ),
+                        pixels=pixels,
+                    )
+                    results.add(
+                        f"node.{load_name}.{label}.c{channels}.cached",
+                        measure(lambda: node.execute(), repeat=3),
+                        pixels=pixels,
+                    )
+
+            # Uncached JPEG decodes at full size and at the decode scales a
+            # preview would ask for
+            path = os.path.join(tmp, f"{label}.jpg")
+            cv2.imwrite(path, make_image(width, height, 3))
+            node = LoadColorImageNode()
+            node.set_param_value("path", path)
+            for decode_scale in (1.0, 0.5, 0.25, 0.125):
+                node.set_param_value("decode_scale", decode_scale)
+                results.add(
+                    f"node.load_jpeg.{label}.x{decode_scale:g}",
+                    measure(
+                        lambda: node.execute(),
+                        setup=image_cache.clear,
+                        repeat=3,
+                    ),
+                    pixels=pixels,
+                )
+
+            # Per-frame cost of a small pipeline with and without pooled
+            # output buffers
+            image = make_image(width, height, 3)
+            for mode, pooled in (("fresh", False), ("pooled", True)):
+                next_frame = build_pipeline(
+                    image, BufferPool() if pooled else None
+                )
+                results.add(
+                    f"pipeline.{mode}.{label}",
+                    measure(next_frame),
+                    pixels=width * height,
+                    allocated_bytes_per_frame=allocated_bytes_per_frame(
+                        next_frame
+                    ),
+                )
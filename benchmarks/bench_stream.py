@@ -0,0 +1,116 @@
+# file: benchmarks/bench_stream.py
+
+"""
+Frame rate of a video pipeline (decode -> blur -> canny, and grayscale),
+run frame by frame and through the streaming engine, and of replaying an
+image sequence with and without read-ahead decoding.
+"""
+
+import os
+import tempfile
+
+import cv2
+
+from app.core.graph import Graph
+from app.core.streaming import StreamingEngine
+from benchmarks.bench_nodes import make_image
+from benchmarks.harness import BenchmarkResults, measure
+from nodes.built_in.display.blur_node import BlurNode
+from nodes.built_in.filters.canny_edge import CannyNode
+from nodes.built_in.io.load_sequence import LoadImageSequenceNode
+from nodes.built_in.io.load_video import LoadVideoNode
+from plugins.custom_grayscale_node import GrayscaleNode
+
+# (label, width, height, frames)
+VIDEOS = [("vga", 640, 480, 60), ("fhd", 1920, 1080, 30)]
+QUICK_VIDEOS = ("vga",)
+
+
+def write_video(path: str, width: int, height: int, frames: int):
+    image = make_image(width, height, 3)
+    writer = cv2.VideoWriter(
+        path, cv2.VideoWriter_fourcc(*"MJPG"), 30, (width, height)
+    )
+    for index in range(frames):
+        writer.write(cv2.add(image, index))
+    writer.release()
+
+
+def build_pipeline(path: str):
+    graph = Graph()
+    video = LoadVideoNode()
+    video.set_param_value("path", path)
+    blur, canny, gray = BlurNode(), CannyNode(), GrayscaleNode()
+    for node in (video, blur, canny, gray):
+        graph.add_node(node)
+    graph.add_edge(video.id, "image", blur.id, "image")
+    graph.add_edge(blur.id, "image", canny.id, "image")
+    graph.add_edge(video.id, "image", gray.id, "image")
+    return graph, video, blur, canny, gray
+
+
+def replay_sequence(directory: str, frames: int, read_ahead: int):
+    """Steps through a sequence the way an editor replay does."""
+    sequence = LoadImageSequenceNode()
+    sequence.set_param_value("pattern", directory)
+    sequence.set_param_value("read_ahead", read_ahead)
+    blur, canny = BlurNode(), CannyNode()
+
+    def replay():
+        for index in range(frames):
+            sequence.set_param_value("frame", index)
+            image = sequence.execute()["image"]
+            canny.execute(image=blur.execute(image=image)["image"])
+
+    return replay
+
+
+def run(results: BenchmarkResults, quick: bool = False):
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, width, height, frames in VIDEOS:
+            if quick and label not in QUICK_VIDEOS:
+                continue
+            path = os.path.join(tmp, f"{label}.avi")
+            write_video(path, width, height, frames)
+            graph, video, blur, canny, gray = build_pipeline(path)
+
+            def sequential():
+                for outputs in video.frames():
+                    image = outputs["image"]
+                    canny.execute(image=blur.execute(image=image)["image"])
+                    gray.execute(image=image)
+
+            def streaming():
+                for _ in StreamingEngine().run(graph, [canny.id, gray.id]):
+                    pass
+
+            for mode, func in (
+                ("sequential", sequential),
+                ("streaming", streaming),
+            ):
+                times = measure(func, repeat=3)
+                results.add(
+                    f"stream.{mode}.{label}",
+                    times,
+                    frames=frames,
+                    fps=frames / min(times),
+                )
+
+            directory = os.path.join(tmp, f"{label}_sequence")
+            os.makedirs(directory)
+            image = make_image(width, height, 3)
+            for index in range(frames):
+                cv2.imwrite(
+                    os.path.join(directory, f"{index:05d}.png"),
+                    cv2.add(image, index),
+                )
+            for mode, read_ahead in (("sync", 0), ("read_ahead", 8)):
+                times = measure(
+                    replay_sequence(directory, frames, read_ahead), repeat=3
+                )
+                results.add(
+                    f"sequence.{mode}.{label}",
+                    times,
+                    frames=frames,
+                    fps=frames / min(times),
+                )
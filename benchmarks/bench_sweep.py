@@ -0,0 +1,79 @@
+# file: benchmarks/bench_sweep.py
+
+"""
+Cost of a parameter sweep over blur -> canny: a fresh run per combination,
+one engine stepping through the grid incrementally, and ParameterSweep.
+"""
+
+import itertools
+
+from app.core.engine import Engine
+from app.core.graph import Graph
+from app.core.sweep import ParameterSweep
+from benchmarks.bench_nodes import FrameSourceNode, make_image
+from benchmarks.harness import BenchmarkResults, measure
+from nodes.built_in.display.blur_node import BlurNode
+from nodes.built_in.filters.canny_edge import CannyNode
+
+# (label, width, height)
+SIZES = [("vga", 640, 480), ("fhd", 1920, 1080)]
+QUICK_SIZES = ("vga",)
+GRID = {
+    "kernel_size": [3, 5, 7, 9],
+    "threshold1": [50, 75, 100, 125, 150],
+    "threshold2": [150, 200, 250],
+}
+
+
+def build_graph(image):
+    graph = Graph()
+    source, blur, canny = FrameSourceNode(image), BlurNode(), CannyNode()
+    for node in (source, blur, canny):
+        graph.add_node(node)
+    graph.add_edge(source.id, "image", blur.id, "image")
+    graph.add_edge(blur.id, "image", canny.id, "image")
+    return graph, blur, canny
+
+
+def run(results: BenchmarkResults, quick: bool = False):
+    points = len(list(itertools.product(*GRID.values())))
+    for label, width, height in SIZES:
+        if quick and label not in QUICK_SIZES:
+            continue
+        graph, blur, canny = build_graph(make_image(width, height, 3))
+        targets = [(canny.id, "image")]
+
+        def step_through(engine_for_point):
+            for kernel_size, threshold1, threshold2 in itertools.product(
+                *GRID.values()
+            ):
+                blur.set_param_value("kernel_size", kernel_size)
+                canny.set_param_value("threshold1", threshold1)
+                canny.set_param_value("threshold2", threshold2)
+                engine_for_point().evaluate(graph, targets)
+
+        engine = Engine()
+        ranges = {
+            blur.id: {"kernel_size": GRID["kernel_size"]},
+            canny.id: {
+                "threshold1": GRID["threshold1"],
+                "threshold2": GRID["threshold2"],
+            },
+        }
+        for mode, func in (
+            ("fresh", lambda: step_through(Engine)),
+            ("incremental", lambda: step_through(lambda: engine)),
+            (
+                "sweep",
+                lambda: ParameterSweep().run(
+                    graph, ranges, targets, keep_results=False
+                ),
+            ),
+        ):
+            times = measure(func, repeat=3)
+            results.add(
+                f"sweep.{mode}.{label}",
+                times,
+                points=points,
+                points_per_s=points / min(times),
+            )
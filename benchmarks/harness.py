@@ -0,0 +1,120 @@
+# file: benchmarks/harness.py
+
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+# A regression is flagged when the median time grows by more than this
+DEFAULT_THRESHOLD = 0.15
+
+
+class BenchmarkResults:
+    """Collects timing results keyed by benchmark name."""
+
+    def __init__(self):
+        self.results: Dict[str, Dict] = {}
+
+    def add(self, name: str, times: List[float], **extra):
+        self.results[name] = {
+            "median_s": statistics.median(times),
+            "min_s": min(times),
+            "runs": len(times),
+            **extra,
+        }
+        print(
+            f"{name:<60} {self.results[name]['median_s'] * 1000:10.3f} ms"
+        )
+
+    def to_dict(self) -> Dict:
+        import cv2
+        import numpy as np
+
+        return {
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "numpy": np.__version__,
+                "opencv": cv2.__version__,
+                "cpu_count": os.cpu_count(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            },
+            "results": self.results,
+        }
+
+    def save(self, file_path: str):
+        with open(file_path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2, sort_keys=True)
+
+
+def measure(
+    func: Callable,
+    setup: Optional[Callable] = None,
+    repeat: int = 5,
+    min_time: float = 0.2,
+    max_runs: int = 1000,
+) -> List[float]:
+    """
+    Times func() at least `repeat` times and until `min_time` seconds have
+    passed. If given, setup() runs before every call and is not timed.
+    Output printed by func is discarded.
+    """
+    times = []
+    started = time.perf_counter()
+    with open(os.devnull, "w") as devnull:
+        while len(times) < max_runs and (
+            len(times) < repeat or time.perf_counter() - started < min_time
+        ):
+            if setup is not None:
+                setup()
+            with contextlib.redirect_stdout(devnull):
+                start = time.perf_counter()
+                func()
+                times.append(time.perf_counter() - start)
+    return times
+
+
+def load_results(file_path: str) -> Dict[str, Dict]:
+    with open(file_path) as f:
+        return json.load(f)["results"]
+
+
+def compare(
+    baseline: Dict[str, Dict],
+    current: Dict[str, Dict],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[Dict]:
+    """
+    Compares two result sets by median time. Returns one row per benchmark
+    present in both, with a `regression` flag when the current median is
+    more than `threshold` (a fraction) slower than the baseline.
+    """
+    rows = []
+    for name in sorted(set(baseline) & set(current)):
+        before = baseline[name]["median_s"]
+        after = current[name]["median_s"]
+        ratio = after / before if before > 0 else float("inf")
+        rows.append(
+            {
+                "name": name,
+                "baseline_s": before,
+                "current_s": after,
+                "ratio": ratio,
+                "regression": ratio > 1 + threshold,
+            }
+        )
+    return rows
+
+
+def print_comparison(rows: List[Dict], out=sys.stdout):
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['name']:<60} {row['baseline_s'] * 1000:10.3f} ms -> "
+            f"{row['current_s'] * 1000:10.3f} ms  x{row['ratio']:.2f} {flag}",
+            file=out,
+        )
@@ -1,40 +1,78 @@
 # file: nodes/base_node.py
 
-from abc import ABC, abstractmethod, ABCMeta
+from abc import ABC, abstractmethod
+import copy
 import uuid
-from typing import Any, Dict
-from PyQt6.QtCore import QObject
+from typing import Any, Dict, Iterator, Optional
 
 
-# --- Metaclass for combining QObject and ABC ---
-# This resolves the metaclass conflict between PyQt's QObject and Python's ABC
-class QObjectABCMeta(type(QObject), ABCMeta):
-    pass
-
-
-class BaseNode(QObject, ABC, metaclass=QObjectABCMeta):
+class BaseNode(ABC):
     """
     An abstract base class for all processing nodes in the graph.
-    Inherits from QObject to support signals and ABC for abstract methods.
+    Nodes that emit Qt signals derive from nodes.qt_node.QtBaseNode, so
+    headless use of the engine never imports PyQt.
     """
 
+    # Node metadata, declared on the class so that discovery and the node
+    # palette can read it without importing the module or instantiating
+    # the node. Keep these literal values: they are read from the source.
+    name: str = None
+    category: str = "Uncategorized"
+    description: str = ""
+    inputs: list[str] = []
+    outputs: list[str] = []
+    parameters: Dict[str, Any] = {}
+
+    # Whether the engine may reuse this node's outputs from its output
+    # cache. Nodes with side effects, such as displaying, must opt out.
+    cacheable = True
+    # Names of parameters measured in pixels (e.g. kernel sizes). The
+    # engine's preview mode scales them along with the images.
+    pixel_params: tuple = ()
+    # Whether the node is a source of frames (e.g. a video) that the
+    # streaming engine reads through frames()
+    streaming = False
+    # Whether a source node can decode straight at resolution_scale, so
+    # preview runs skip its full-resolution run and the image pyramid
+    reduced_decode = False
+
     def __init__(
         self,
-        name: str,
-        inputs: list[str],
-        outputs: list[str],
+        name: str = None,
+        inputs: list[str] = None,
+        outputs: list[str] = None,
         parameters: Dict[str, Any] = None,
     ):
         """
-        Initializes the node.
+        Initializes the node. Arguments that are left out default to the
+        class-level metadata.
         """
         super().__init__()
+        cls = type(self)
         self.id: str = str(uuid.uuid4())
-        self.name: str = name
-        self.inputs: list[str] = inputs
-        self.outputs: list[str] = outputs
+        self.name: str = name if name is not None else cls.name
+        self.inputs: list[str] = (
+            inputs if inputs is not None else list(cls.inputs)
+        )
+        self.outputs: list[str] = (
+            outputs if outputs is not None else list(cls.outputs)
+        )
 
-        self.param_values: Dict[str, Any] = parameters if parameters else {}
+        self.param_values: Dict[str, Any] = (
+            parameters if parameters else copy.deepcopy(cls.parameters)
+        )
+
+        # Set whenever the node's parameters or inputs change, so the
+        # engine knows its cached outputs are stale
+        self.dirty: bool = True
+
+        # Resolution of the images being processed relative to the source
+        # images; below 1.0 while the engine runs a preview
+        self.resolution_scale: float = 1.0
+
+        # The engine's app.core.buffers.BufferPool while the node executes,
+        # if the engine recycles output buffers
+        self.buffer_pool = None
 
     @abstractmethod
     def execute(self, **kwargs) -> dict:
@@ -44,10 +82,76 @@ class BaseNode(QObject, ABC, metaclass=QObjectABCMeta):
         """
         pass
 
+    def cache_token(self) -> Any:
+        """
+        Returns any extra state, besides param_values, that the node's
+        outputs depend on (e.g. a source file's modification time).
+        """
+        return None
+
+    def prefetch(self):
+        """
+        Starts loading any external data the node reads (e.g. a source
+        image) in the background, ahead of its first execution.
+        """
+
+    def close(self):
+        """
+        Releases anything the node holds open, such as decoder threads.
+        Called when the node leaves its graph; it reopens what it needs if
+        it is executed again.
+        """
+
+    def frames(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the node's outputs for each frame of its stream. Only called
+        on nodes with streaming set; execute() should still return a single
+        representative frame for the editor. By default the stream is just
+        that frame.
+        """
+        yield self.execute()
+
+    def tile_halo(self) -> Optional[int]:
+        """
+        Returns how many pixels of context around each output pixel the
+        node reads, or None if it needs the whole frame. Nodes with a halo
+        can be run on overlapping tiles by the engine's tiled mode.
+        """
+        return None
+
+    def get_param(self, param_name: str) -> Any:
+        """
+        Returns a parameter value. Pixel-sized parameters are scaled to the
+        resolution currently being processed.
+        """
+        value = self.param_values[param_name]
+        if param_name in self.pixel_params and self.resolution_scale != 1.0:
+            scaled = value * self.resolution_scale
+            value = max(1, round(scaled)) if isinstance(value, int) else scaled
+        return value
+
+    def output_buffer(self, shape, dtype) -> Any:
+        """
+        Returns an array to write an output into, e.g. as an OpenCV dst=
+        argument. It is recycled from an earlier run when the engine pools
+        buffers, and None otherwise, which lets OpenCV allocate as usual.
+        The contents are undefined, so the node must overwrite all of it.
+        """
+        if self.buffer_pool is None:
+            return None
+        return self.buffer_pool.acquire(shape, dtype)
+
+    def release_buffer(self, array: Any):
+        """Hands back a scratch array the node no longer needs."""
+        if self.buffer_pool is not None:
+            self.buffer_pool.release(array)
+
     def set_param_value(self, param_name: str, value: Any):
         """Updates the value of a parameter."""
         if param_name in self.param_values:
-            self.param_values[param_name] = value
+            if self.param_values[param_name] != value:
+                self.param_values[param_name] = value
+                self.dirty = True
         else:
             raise KeyError(
                 f"Node '{self.name}' has no "
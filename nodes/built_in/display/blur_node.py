@@ -9,16 +9,23 @@ ImageType = np.ndarray
 class BlurNode(BaseNode):
     """Blurs an image using a simple box filter."""
 
+    name = "Blur"
     category = "Filters"
     description = "Applies a blur to an image."
+    inputs = ["image"]
+    outputs = ["image"]
+    parameters = {"kernel_size": 5}
+    pixel_params = ("kernel_size",)
 
-    def __init__(self):
-        super().__init__(
-            name="Blur",
-            inputs=["image"],
-            outputs=["image"],
-            parameters={"kernel_size": 5},
-        )
+    def _kernel_size(self) -> int:
+        kernel_size = self.get_param("kernel_size")
+        # Kernel size must be an odd number
+        if kernel_size % 2 == 0:
+            kernel_size += 1
+        return kernel_size
+
+    def tile_halo(self) -> int:
+        return self._kernel_size() // 2
 
     def execute(self, **kwargs) -> Dict[str, ImageType]:
         image = kwargs.get("image")
@@ -26,14 +33,15 @@ class BlurNode(BaseNode):
             print("  > BlurNode: No input image.")
             return {"image": None}
 
-        kernel_size = self.param_values["kernel_size"]
-        # Kernel size must be an odd number
-        if kernel_size % 2 == 0:
-            kernel_size += 1
+        kernel_size = self._kernel_size()
 
         print(f"  > Applying blur with kernel size: {kernel_size}")
 
-        # Apply the blur using OpenCV
-        blurred_image = cv2.blur(image, (kernel_size, kernel_size))
+        # Apply the blur using OpenCV, into a recycled buffer if available
+        blurred_image = cv2.blur(
+            image,
+            (kernel_size, kernel_size),
+            dst=self.output_buffer(image.shape, image.dtype),
+        )
 
         return {"image": blurred_image}
@@ -1,26 +1,34 @@
-from nodes.base_node import BaseNode
+from nodes.qt_node import QtBaseNode
 from typing import Dict
 import numpy as np
 from PyQt6.QtCore import pyqtSignal
 
 
-class DisplayNode(BaseNode):
+class DisplayNode(QtBaseNode):
     """A node that displays an image in the UI."""
 
+    name = "Display Image"
     category = "Display"
     description = "Displays an image in the main UI."
+    inputs = ["image"]
+    outputs = []
+    # Emitting the image is a side effect, so never skip execution
+    cacheable = False
     # Define a signal that will carry the image data (as a numpy array)
     image_processed = pyqtSignal(np.ndarray)
-
-    def __init__(self):
-        super().__init__(name="Display Image", inputs=["image"], outputs=[])
+    # Emitted instead during preview runs, with the image's resolution
+    # relative to the full-size result
+    preview_processed = pyqtSignal(np.ndarray, float)
 
     def execute(self, **kwargs) -> Dict:
         image = kwargs.get("image")
         if image is not None:
             print(f"  > DisplayNode: Emitting image with shape: {image.shape}")
             # Emit the signal with the image data
-            self.image_processed.emit(image)
+            if self.resolution_scale != 1.0:
+                self.preview_processed.emit(image, self.resolution_scale)
+            else:
+                self.image_processed.emit(image)
         else:
             print("  > DisplayNode: No image to display.")
             # Emit a None value to clear the display
@@ -1,9 +1,10 @@
 # file: nodes/built_in/filters/canny_edge.py
 
+import weakref
 import cv2
 import numpy as np
 from nodes.base_node import BaseNode
-from typing import Dict
+from typing import Dict, Optional, Tuple
 
 ImageType = np.ndarray
 
@@ -11,18 +12,66 @@ ImageType = np.ndarray
 class CannyNode(BaseNode):
     """Applies the Canny edge detection algorithm to an image."""
 
+    name = "Canny Edge"
     category = "Filters"
     description = "Detects edges in an image using the Canny algorithm."
+    inputs = ["image"]
+    outputs = ["image"]
+    parameters = {"threshold1": 100, "threshold2": 200}
 
-    def __init__(self):
-        # Define parameters and their default values
-        params = {"threshold1": 100, "threshold2": 200}
-        super().__init__(
-            name="Canny Edge",
-            inputs=["image"],
-            outputs=["image"],
-            parameters=params,
+    # tile_halo() is left as None: hysteresis follows edges across the
+    # whole image, so tiles cannot reproduce the full-frame result
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # The last input image, held weakly, to spot runs in which only the
+        # thresholds changed. The engine passes the very same array when
+        # nothing upstream re-ran, and inputs are never modified in place.
+        self._last_input = None
+        # (input image, dx, dy) once an input came back: its gradients are
+        # reused until the input changes. Holding the input also keeps a
+        # buffer pool from recycling it.
+        self._gradients = None
+
+    def _to_gray(self, image: ImageType) -> ImageType:
+        """Returns a grayscale version of an image, in a scratch buffer."""
+        if len(image.shape) != 3:
+            return image
+        return cv2.cvtColor(
+            image,
+            cv2.COLOR_BGR2GRAY,
+            dst=self.output_buffer(image.shape[:2], image.dtype),
+        )
+
+    def _cached_gradients(
+        self, image: ImageType
+    ) -> Optional[Tuple[ImageType, ImageType]]:
+        """
+        Returns the Sobel gradients of the image if it was seen by the
+        previous run, or None for a new input, which is cheaper to pass to
+        Canny whole than to keep gradients for.
+        """
+        if self._gradients is not None and self._gradients[0] is image:
+            return self._gradients[1:]
+        self._gradients = None
+        seen = self._last_input() if self._last_input is not None else None
+        self._last_input = weakref.ref(image)
+        if seen is not image:
+            return None
+
+        # The same aperture and border cv2.Canny uses internally, so the
+        # edges are identical
+        gray = self._to_gray(image)
+        dx = cv2.Sobel(
+            gray, cv2.CV_16S, 1, 0, ksize=3, borderType=cv2.BORDER_REPLICATE
+        )
+        dy = cv2.Sobel(
+            gray, cv2.CV_16S, 0, 1, ksize=3, borderType=cv2.BORDER_REPLICATE
         )
+        if gray is not image:
+            self.release_buffer(gray)
+        self._gradients = (image, dx, dy)
+        return dx, dy
 
     def execute(self, **kwargs) -> Dict[str, ImageType]:
         input_image = kwargs.get("image")
@@ -37,11 +86,18 @@ class CannyNode(BaseNode):
         print(f"  > Applying Canny edge detection with thresholds: {t1}, {t2}")
 
         # --- Image Processing Logic ---
-        # Canny edge detection requires a single-channel (grayscale) image
-        if len(input_image.shape) == 3:
-            # Convert to grayscale if it's a color image
-            input_image = cv2.cvtColor(input_image, cv2.COLOR_BGR2GRAY)
+        edges = self.output_buffer(input_image.shape[:2], np.uint8)
+        gradients = self._cached_gradients(input_image)
+        if gradients is not None:
+            # Only the thresholds changed; skip the grayscale conversion
+            # and the gradients
+            dx, dy = gradients
+            return {"image": cv2.Canny(dx, dy, t1, t2, edges=edges)}
 
-        result_image = cv2.Canny(input_image, t1, t2)
+        # Canny edge detection requires a single-channel (grayscale) image
+        gray_image = self._to_gray(input_image)
+        result_image = cv2.Canny(gray_image, t1, t2, edges=edges)
+        if gray_image is not input_image:
+            self.release_buffer(gray_image)
 
         return {"image": result_image}
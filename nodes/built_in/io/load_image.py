@@ -1,7 +1,9 @@
+import os
 import numpy as np
 import cv2
 from typing import Dict
 from nodes.base_node import BaseNode
+from nodes.image_cache import prefetch_scaled, read_scaled
 
 ImageType = np.ndarray
 
@@ -9,27 +11,49 @@ ImageType = np.ndarray
 class LoadColorImageNode(BaseNode):
     """Loads a color image from a file path."""
 
+    name = "Load Color Image"
     category = "IO"
     description = "Loads a color image from a specified file path."
-
-    def __init__(self):
-        # Default path is now our sample image
-        super().__init__(
-            name="Load Color Image",
-            inputs=[],
-            outputs=["image"],
-            parameters={"path": "sample_data/checkerboard.png"},
+    inputs = []
+    outputs = ["image", "scale"]
+    # Default path is our sample image. decode_scale < 1 decodes a smaller
+    # image (rounded up to 1/2, 1/4, ...); "scale" outputs the actual one.
+    parameters = {"path": "sample_data/checkerboard.png", "decode_scale": 1.0}
+
+    # Preview runs decode straight at the preview resolution
+    reduced_decode = True
+
+    def cache_token(self):
+        # Reload whenever the file on disk changes
+        try:
+            stat = os.stat(self.param_values["path"])
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def prefetch(self):
+        prefetch_scaled(
+            self.param_values["path"],
+            cv2.IMREAD_COLOR,
+            self.param_values["decode_scale"],
         )
 
     def execute(self, **kwargs) -> Dict[str, ImageType]:
         path = self.param_values["path"]
         print(f"  > Loading image from: {path}")
 
-        # Use OpenCV to load the image
-        image = cv2.imread(path, cv2.IMREAD_COLOR)
+        # Decoded images are shared through the process-wide cache
+        image, scale = read_scaled(
+            path,
+            cv2.IMREAD_COLOR,
+            self.param_values["decode_scale"] * self.resolution_scale,
+        )
         if image is None:
             print(f"  > Error: Could not load image from {path}")
             # Return a black 10x10 image as a fallback
-            return {"image": np.zeros((10, 10, 3), dtype=np.uint8)}
+            return {
+                "image": np.zeros((10, 10, 3), dtype=np.uint8),
+                "scale": 1.0,
+            }
 
-        return {"image": image}
+        return {"image": image, "scale": scale}
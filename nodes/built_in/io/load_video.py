@@ -0,0 +1,64 @@
+import os
+import numpy as np
+import cv2
+from typing import Dict, Iterator
+from nodes.base_node import BaseNode
+
+ImageType = np.ndarray
+
+
+class LoadVideoNode(BaseNode):
+    """Reads the frames of a video file."""
+
+    name = "Load Video"
+    category = "IO"
+    description = "Reads frames from a video file."
+    inputs = []
+    outputs = ["image"]
+    parameters = {"path": "", "frame": 0}
+
+    # Streams every frame when the graph runs in the streaming engine; a
+    # regular run shows the frame selected by the "frame" parameter
+    streaming = True
+
+    def cache_token(self):
+        # Reload whenever the file on disk changes
+        try:
+            stat = os.stat(self.param_values["path"])
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _open(self) -> cv2.VideoCapture:
+        path = self.param_values["path"]
+        capture = cv2.VideoCapture(path)
+        if not capture.isOpened():
+            raise IOError(f"Could not open video {path}")
+        return capture
+
+    def execute(self, **kwargs) -> Dict[str, ImageType]:
+        path = self.param_values["path"]
+        index = self.param_values["frame"]
+        print(f"  > Reading frame {index} of: {path}")
+
+        capture = self._open()
+        try:
+            capture.set(cv2.CAP_PROP_POS_FRAMES, index)
+            ok, frame = capture.read()
+        finally:
+            capture.release()
+        if not ok:
+            print(f"  > Error: Could not read frame {index} of {path}")
+            return {"image": None}
+        return {"image": frame}
+
+    def frames(self) -> Iterator[Dict[str, ImageType]]:
+        capture = self._open()
+        try:
+            while True:
+                ok, frame = capture.read()
+                if not ok:
+                    return
+                yield {"image": frame}
+        finally:
+            capture.release()
@@ -0,0 +1,183 @@
+# file: nodes/image_cache.py
+
+import math
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Default memory budget for decoded source images (512 MiB)
+DEFAULT_IMAGE_CACHE_BYTES = 512 * 1024 * 1024
+
+# (absolute path, mtime_ns, size, imread flags)
+ImageKey = Tuple[str, int, int, int]
+
+# imread flags that decode at 1/2, 1/4 and 1/8 scale. JPEG is scaled while
+# decoding, which is several times faster than a full decode.
+REDUCED_FLAGS = {
+    cv2.IMREAD_GRAYSCALE: {
+        2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+        4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+        8: cv2.IMREAD_REDUCED_GRAYSCALE_8,
+    },
+    cv2.IMREAD_COLOR: {
+        2: cv2.IMREAD_REDUCED_COLOR_2,
+        4: cv2.IMREAD_REDUCED_COLOR_4,
+        8: cv2.IMREAD_REDUCED_COLOR_8,
+    },
+}
+
+
+def _halvings(scale: float) -> int:
+    """How many times to halve an image to reach a scale, rounded up."""
+    if not scale > 0:
+        raise ValueError(f"Decode scale must be positive, got {scale}")
+    return max(0, math.floor(math.log2(1 / scale) + 1e-9))
+
+
+def _reduced_flags(flags: int, halvings: int) -> int:
+    factor = 2 ** min(halvings, 3)
+    return REDUCED_FLAGS[flags][factor] if factor > 1 else flags
+
+
+def read_scaled(
+    path: str, flags: int, scale: float
+) -> Tuple[Optional[np.ndarray], float]:
+    """
+    Reads an image at a fraction of its size through the shared cache. The
+    scale is rounded up to a power of two; up to 1/8 it comes straight from
+    the decoder, beyond that the reduced image is halved further. Returns
+    the image and the scale it was actually read at. Raises ValueError if
+    the scale is not positive.
+    """
+    halvings = _halvings(scale)
+    image = image_cache.read(path, _reduced_flags(flags, halvings))
+    if image is not None:
+        for _ in range(halvings - 3):
+            image = cv2.pyrDown(image)
+    return image, 0.5**halvings
+
+
+def prefetch_scaled(path: str, flags: int, scale: float) -> Future:
+    """Decodes what read_scaled() will read on a background thread."""
+    return image_cache.prefetch(path, _reduced_flags(flags, _halvings(scale)))
+
+
+class ImageCache:
+    """
+    A process-wide, thread-safe LRU cache of decoded images shared by the
+    Load nodes.
+
+    Entries are keyed on the file's path, modification time and size and
+    the imread flags, so a file changed on disk is decoded again. Cached
+    arrays are read-only because every reader shares them.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_IMAGE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[ImageKey, np.ndarray]" = OrderedDict()
+        # Decodes in progress, so concurrent readers wait for one decode
+        self._loading: Dict[ImageKey, Future] = {}
+        self._lock = threading.Lock()
+        self._prefetcher: Optional[ThreadPoolExecutor] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def read(self, path: str, flags: int) -> Optional[np.ndarray]:
+        """
+        Returns the decoded image like cv2.imread(path, flags), or None if
+        it can't be read.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            # Nothing to key on; let imread report the failure
+            return cv2.imread(path, flags)
+        key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size, flags)
+
+        with self._lock:
+            image = self._entries.get(key)
+            if image is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return image
+            loading = self._loading.get(key)
+            if loading is None:
+                self.misses += 1
+                loading = self._loading[key] = Future()
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            return loading.result()
+
+        try:
+            image = cv2.imread(path, flags)
+            if image is not None:
+                image.setflags(write=False)
+                self._put(key, image)
+            loading.set_result(image)
+        except BaseException as e:
+            loading.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._loading[key]
+        return image
+
+    def _put(self, key: ImageKey, image: np.ndarray):
+        if image.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            # Older versions of the file can never be read again
+            for stale in [
+                k for k in self._entries if (k[0], k[3]) == (key[0], key[3])
+            ]:
+                self.current_bytes -= self._entries.pop(stale).nbytes
+            self._entries[key] = image
+            self.current_bytes += image.nbytes
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= evicted.nbytes
+                self.evictions += 1
+
+    def prefetch(self, path: str, flags: int) -> Future:
+        """Decodes an image into the cache on a background thread."""
+        with self._lock:
+            if self._prefetcher is None:
+                self._prefetcher = ThreadPoolExecutor(
+                    max_workers=min(4, os.cpu_count() or 1),
+                    thread_name_prefix="image-prefetch",
+                )
+        return self._prefetcher.submit(self.read, path, flags)
+
+    def clear(self):
+        """Removes all entries. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the cache counters and current memory usage."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+# Shared by every Load node in the process
+image_cache = ImageCache()
@@ -0,0 +1,18 @@
+# file: nodes/qt_node.py
+
+from abc import ABCMeta
+from PyQt6.QtCore import QObject
+from nodes.base_node import BaseNode
+
+
+# --- Metaclass for combining QObject and ABC ---
+# This resolves the metaclass conflict between PyQt's QObject and Python's ABC
+class QObjectABCMeta(type(QObject), ABCMeta):
+    pass
+
+
+class QtBaseNode(BaseNode, QObject, metaclass=QObjectABCMeta):
+    """
+    A node that is also a QObject, for nodes that communicate with the UI
+    through signals.
+    """
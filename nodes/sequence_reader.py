@@ -0,0 +1,114 @@
+# file: nodes/sequence_reader.py
+
+import glob
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import cv2
+import numpy as np
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+
+
+def list_sequence(pattern: str) -> List[str]:
+    """
+    Returns the files of an image sequence in name order. The pattern is
+    either a directory, for all the images in it, or a glob.
+    """
+    if os.path.isdir(pattern):
+        return sorted(
+            os.path.join(pattern, name)
+            for name in os.listdir(pattern)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+    return sorted(glob.glob(pattern))
+
+
+class SequenceReader:
+    """
+    Reads the frames of an image sequence, decoding the next `read_ahead`
+    frames on a pool of `workers` threads while the current one is in use.
+
+    Frames are returned in whatever order they are asked for; reading the
+    frame after the last one hits the read-ahead, while a seek elsewhere
+    drops the read-ahead that no longer applies. At most read_ahead + 1
+    decoded frames are held at a time. Once closed, frames are still read
+    but without read-ahead.
+    """
+
+    def __init__(
+        self,
+        paths: List[str],
+        flags: int = cv2.IMREAD_COLOR,
+        read_ahead: int = 8,
+        workers: int = 4,
+    ):
+        self.paths = paths
+        self.flags = flags
+        self.read_ahead = max(read_ahead, 0)
+        self.hits = 0
+        self.misses = 0
+        self._pending: Dict[int, Future] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(workers, 1), thread_name_prefix="sequence"
+        )
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def read(self, index: int) -> Optional[np.ndarray]:
+        """
+        Returns frame `index` like cv2.imread() would, or None if it can't
+        be read, and starts decoding the frames after it.
+        """
+        if not 0 <= index < len(self.paths):
+            return None
+        with self._lock:
+            future = self._pending.pop(index, None)
+            if future is not None and future.done():
+                self.hits += 1
+            else:
+                self.misses += 1
+            if self._closed:
+                future = None
+            elif future is None:
+                future = self._executor.submit(self._decode, index)
+            self._schedule(index + 1)
+        if future is None:
+            return self._decode(index)
+        return future.result()
+
+    def prefetch(self, index: int):
+        """Starts decoding frame `index` and the frames after it."""
+        with self._lock:
+            self._schedule(index)
+
+    def _schedule(self, start: int):
+        """Keeps exactly the read-ahead window from `start` in flight."""
+        if self._closed:
+            return
+        window = range(start, min(start + self.read_ahead, len(self.paths)))
+        for index in list(self._pending):
+            if index not in window:
+                self._pending.pop(index).cancel()
+        for index in window:
+            if index not in self._pending:
+                self._pending[index] = self._executor.submit(
+                    self._decode, index
+                )
+
+    def _decode(self, index: int) -> Optional[np.ndarray]:
+        return cv2.imread(self.paths[index], self.flags)
+
+    def close(self):
+        """Cancels the read-ahead and stops the decoder threads."""
+        with self._lock:
+            self._closed = True
+            for future in self._pending.values():
+                future.cancel()
+            self._pending.clear()
+        self._executor.shutdown(wait=False)
@@ -9,11 +9,14 @@ ImageType = np.ndarray
 class GrayscaleNode(BaseNode):
     """A custom node that converts a color image to grayscale."""
 
+    name = "Grayscale"
     category = "Plugins"
     description = "Converts a color image to grayscale."
+    inputs = ["image"]
+    outputs = ["image"]
 
-    def __init__(self):
-        super().__init__(name="Grayscale", inputs=["image"], outputs=["image"])
+    def tile_halo(self) -> int:
+        return 0  # Purely per-pixel
 
     def execute(self, **kwargs) -> Dict[str, ImageType]:
         input_image = kwargs.get("image")
@@ -22,7 +25,13 @@ class GrayscaleNode(BaseNode):
 
         if len(input_image.shape) == 3:
             # Convert to grayscale if it's a color image
-            result_image = cv2.cvtColor(input_image, cv2.COLOR_BGR2GRAY)
+            result_image = cv2.cvtColor(
+                input_image,
+                cv2.COLOR_BGR2GRAY,
+                dst=self.output_buffer(
+                    input_image.shape[:2], input_image.dtype
+                ),
+            )
         else:
             # If it's already grayscale, just pass it through
             result_image = input_image
@@ -0,0 +1,57 @@
+import os
+import unittest
+from benchmarks.bench_imports import (
+    FORBIDDEN_MODULES,
+    IMPORT_BUDGETS,
+    IMPORT_TARGETS,
+    measure_imports,
+    parse_importtime,
+)
+
+# Wall-clock budgets depend on the machine, so they are only checked on
+# request, e.g. on a known benchmark runner
+CHECK_BUDGETS = bool(os.environ.get("BENCH_IMPORT_BUDGETS"))
+
+
+class TestImportBudget(unittest.TestCase):
+    def check_target(self, target):
+        seconds, loaded = measure_imports(IMPORT_TARGETS[target])
+
+        heavy = [name for name in FORBIDDEN_MODULES[target] if name in loaded]
+        self.assertEqual(heavy, [], f"{target} import loads {heavy}")
+
+        if CHECK_BUDGETS:
+            slowest = sorted(loaded, key=lambda name: -loaded[name][0])[:5]
+            self.assertLessEqual(
+                seconds,
+                IMPORT_BUDGETS[target],
+                f"{target} imports took {seconds * 1000:.0f} ms; "
+                f"slowest modules: {slowest}",
+            )
+
+    def test_headless_imports(self):
+        self.check_target("headless")
+
+    def test_gui_cold_start_imports(self):
+        self.check_target("gui")
+
+    def test_parse_importtime(self):
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       100 |        100 |     json.decoder\n"
+            "import time:        50 |        150 |   json\n"
+            "import time:        20 |        170 | app.core.profiler\n"
+        )
+
+        self.assertEqual(
+            parse_importtime(stderr),
+            {
+                "json.decoder": (100, 100, 2),
+                "json": (50, 150, 1),
+                "app.core.profiler": (20, 170, 0),
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
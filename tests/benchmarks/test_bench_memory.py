@@ -0,0 +1,37 @@
+import unittest
+from app.core.engine import Engine
+from benchmarks.bench_memory import build_chain
+
+
+class TestChainMemory(unittest.TestCase):
+    def held_outputs(self, release):
+        """Runs a chain, returning how many outputs each node saw held."""
+        graph = build_chain(32, 24, 8)
+        engine = Engine(release_intermediates=release)
+        held = []
+        for node in graph.nodes.values():
+
+            def execute(execute=node.execute, **kwargs):
+                held.append(len(engine.node_outputs))
+                return execute(**kwargs)
+
+            node.execute = execute
+        engine.process(graph)
+        return held, engine
+
+    def test_releasing_intermediates_bounds_the_working_set(self):
+        held, engine = self.held_outputs(release=True)
+
+        # Each blur only finds its own input held
+        self.assertEqual(held, [0] + [1] * 8)
+        self.assertEqual(len(engine.node_outputs), 1)
+
+    def test_keeping_intermediates_holds_the_whole_chain(self):
+        held, engine = self.held_outputs(release=False)
+
+        self.assertEqual(held, list(range(9)))
+        self.assertEqual(len(engine.node_outputs), 9)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+from benchmarks.bench_graph import build_graph, make_edges
+from benchmarks.harness import compare, measure
+
+
+class TestHarness(unittest.TestCase):
+    def test_compare_flags_regressions_beyond_threshold(self):
+        baseline = {
+            "fast": {"median_s": 1.0},
+            "slow": {"median_s": 1.0},
+            "removed": {"median_s": 1.0},
+        }
+        current = {
+            "fast": {"median_s": 1.1},
+            "slow": {"median_s": 1.3},
+            "added": {"median_s": 1.0},
+        }
+
+        rows = {row["name"]: row for row in compare(baseline, current, 0.2)}
+
+        self.assertEqual(set(rows), {"fast", "slow"})
+        self.assertFalse(rows["fast"]["regression"])
+        self.assertTrue(rows["slow"]["regression"])
+        self.assertAlmostEqual(rows["slow"]["ratio"], 1.3)
+
+    def test_measure_runs_setup_before_each_call(self):
+        calls = []
+        times = measure(
+            lambda: calls.append("run"),
+            setup=lambda: calls.append("setup"),
+            repeat=3,
+            min_time=0,
+        )
+
+        self.assertEqual(len(times), 3)
+        self.assertEqual(calls, ["setup", "run"] * 3)
+
+    def test_synthetic_graph_is_acyclic_and_connected(self):
+        from app.core.engine import Engine
+
+        graph, nodes = build_graph(50)
+
+        self.assertEqual(len(graph.nodes), 50)
+        self.assertEqual(len(graph.edges), len(make_edges(50)))
+        self.assertEqual(len(Engine()._topological_sort(graph)), 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+import cv2
+import numpy as np
+from app.core.buffers import BufferPool
+from app.core.engine import Engine
+from app.core.graph import Graph
+from nodes.base_node import BaseNode
+from nodes.built_in.display.blur_node import BlurNode
+
+
+class SourceNode(BaseNode):
+    name = "Source"
+    outputs = ["image"]
+
+    def __init__(self, image):
+        super().__init__()
+        self.image = image
+
+    def execute(self, **kwargs):
+        return {"image": self.image}
+
+
+class TestBufferPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = BufferPool()
+
+    def test_released_buffers_are_reused_by_shape_and_dtype(self):
+        array = self.pool.acquire((4, 5), np.uint8)
+        array_id = id(array)
+        self.pool.release(array)
+        del array
+
+        self.assertEqual(self.pool.acquire((4, 5), np.float32).dtype, "f4")
+        self.assertEqual(id(self.pool.acquire((4, 5), np.uint8)), array_id)
+        self.assertEqual(self.pool.stats()["reuses"], 1)
+
+    def test_buffers_still_in_use_are_not_handed_out(self):
+        array = self.pool.acquire((4, 5), np.uint8)
+        self.pool.release(array)
+
+        self.assertIsNot(self.pool.acquire((4, 5), np.uint8), array)
+        self.assertEqual(self.pool.stats()["buffers"], 1)
+
+    def test_views_and_read_only_arrays_are_ignored(self):
+        base = np.zeros((4, 4), np.uint8)
+        read_only = np.zeros((4, 4), np.uint8)
+        read_only.flags.writeable = False
+
+        self.pool.release(base[1:])
+        self.pool.release(read_only)
+        self.pool.release(None)
+
+        self.assertEqual(self.pool.stats()["buffers"], 0)
+
+    def test_idle_buffers_are_bounded(self):
+        self.pool.max_bytes = 100
+        self.pool.release(np.zeros(60, np.uint8))
+        self.pool.release(np.zeros(60, np.uint8))
+
+        self.assertEqual(self.pool.stats()["bytes"], 60)
+
+
+class TestEngineBufferPooling(unittest.TestCase):
+    def test_repeated_runs_recycle_node_outputs(self):
+        image = np.random.default_rng(0).integers(0, 255, (32, 48), np.uint8)
+        graph = Graph()
+        source = SourceNode(image)
+        blur = BlurNode()
+        graph.add_node(source)
+        graph.add_node(blur)
+        graph.add_edge(source.id, "image", blur.id, "image")
+        pool = BufferPool()
+        engine = Engine(buffer_pool=pool)
+
+        for kernel_size in (3, 5, 7, 9):
+            blur.set_param_value("kernel_size", kernel_size)
+            engine.process(graph)
+            np.testing.assert_array_equal(
+                engine.node_outputs[blur.id]["image"],
+                cv2.blur(image, (kernel_size, kernel_size)),
+            )
+
+        # Double buffered: the output being replaced is reused next run
+        self.assertEqual(pool.stats()["allocations"], 2)
+        self.assertEqual(pool.stats()["reuses"], 2)
+        self.assertIsNone(blur.buffer_pool)
+
+    def test_nodes_allocate_as_usual_without_a_pool(self):
+        node = BlurNode()
+        self.assertIsNone(node.output_buffer((2, 2), np.uint8))
+
+
+if __name__ == "__main__":
+    unittest.main()
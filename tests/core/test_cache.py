@@ -0,0 +1,70 @@
+import unittest
+import numpy as np
+from app.core.cache import OutputCache, compute_node_key
+from nodes.base_node import BaseNode
+
+
+class MockNode(BaseNode):
+    category = "Test"
+
+    def __init__(self, parameters=None):
+        super().__init__(
+            name="Test Node", inputs=[], outputs=[], parameters=parameters
+        )
+
+    def execute(self, **kwargs):
+        return {}
+
+
+class OtherNode(MockNode):
+    pass
+
+
+class TestComputeNodeKey(unittest.TestCase):
+    def test_key_ignores_node_identity(self):
+        self.assertEqual(
+            compute_node_key(MockNode({"a": 1, "b": 2}), []),
+            compute_node_key(MockNode({"b": 2, "a": 1}), []),
+        )
+
+    def test_key_depends_on_params_class_and_inputs(self):
+        base = compute_node_key(MockNode({"a": 1}), [])
+        self.assertNotEqual(base, compute_node_key(MockNode({"a": 2}), []))
+        self.assertNotEqual(base, compute_node_key(OtherNode({"a": 1}), []))
+        self.assertNotEqual(
+            base,
+            compute_node_key(MockNode({"a": 1}), [("image", "k", "image")]),
+        )
+
+
+class TestOutputCache(unittest.TestCase):
+    def test_get_and_put(self):
+        cache = OutputCache()
+        self.assertIsNone(cache.get("key"))
+        cache.put("key", {"value": 1})
+        self.assertEqual(cache.get("key"), {"value": 1})
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+
+    def test_lru_eviction_by_bytes(self):
+        image = np.zeros((10, 10), dtype=np.uint8)  # 100 bytes
+        cache = OutputCache(max_bytes=250)
+        cache.put("a", {"image": image})
+        cache.put("b", {"image": image})
+        cache.get("a")  # "b" is now the least recently used
+        cache.put("c", {"image": image})
+
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(cache.current_bytes, 200)
+
+    def test_oversized_entry_is_not_stored(self):
+        cache = OutputCache(max_bytes=10)
+        cache.put("a", {"image": np.zeros(100, dtype=np.uint8)})
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
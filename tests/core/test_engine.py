@@ -1,6 +1,10 @@
+import threading
 import unittest
-from unittest.mock import MagicMock
-from app.core.engine import Engine
+from concurrent.futures import ALL_COMPLETED, wait as futures_wait
+from unittest.mock import MagicMock, patch
+import numpy as np
+from app.core.cache import OutputCache
+from app.core.engine import Engine, ExecutionCancelled
 from app.core.graph import Graph
 from nodes.base_node import BaseNode
 
@@ -74,6 +78,292 @@ class TestEngine(unittest.TestCase):
         # Verify that node3 received the correct inputs
         self.node3.execute.assert_called_once_with(input1=42, input2=84)
 
+    def _build_linear_graph(self):
+        self.graph.add_node(self.node1)
+        self.graph.add_node(self.node2)
+        self.graph.add_node(self.node3)
+        self.graph.add_edge("node1", "output", "node2", "input")
+        self.graph.add_edge("node2", "output", "node3", "input")
+
+    def test_process_skips_clean_nodes(self):
+        self._build_linear_graph()
+        self.engine.process(self.graph)
+        self.engine.process(self.graph)
+
+        self.node1.execute.assert_called_once()
+        self.node2.execute.assert_called_once()
+        self.node3.execute.assert_called_once()
+
+    def test_process_reruns_dirty_node_and_downstream(self):
+        self.node1.execute.return_value = {"output": 1}
+        self._build_linear_graph()
+        self.engine.process(self.graph)
+
+        self.node2.dirty = True
+        self.engine.process(self.graph)
+
+        self.assertEqual(self.node1.execute.call_count, 1)
+        self.assertEqual(self.node2.execute.call_count, 2)
+        self.assertEqual(self.node3.execute.call_count, 2)
+        # The upstream output from the first run is reused
+        self.node2.execute.assert_called_with(input=1)
+
+    def test_new_edge_marks_target_dirty(self):
+        self._build_linear_graph()
+        self.engine.process(self.graph)
+
+        self.graph.add_edge("node1", "output", "node3", "extra")
+        self.engine.process(self.graph)
+
+        self.assertEqual(self.node1.execute.call_count, 1)
+        self.assertEqual(self.node2.execute.call_count, 1)
+        self.assertEqual(self.node3.execute.call_count, 2)
+
+    def test_invalidate_forces_full_run(self):
+        self._build_linear_graph()
+        self.engine.process(self.graph)
+        self.engine.invalidate()
+        self.engine.process(self.graph)
+
+        self.assertEqual(self.node1.execute.call_count, 2)
+        self.assertEqual(self.node3.execute.call_count, 2)
+
+    def _build_releasing_chain(self, **engine_args):
+        self.engine = Engine(release_intermediates=True, **engine_args)
+        for index, node in enumerate((self.node1, self.node2, self.node3)):
+            node.outputs = ["output"]
+            node.execute.return_value = {"output": index}
+        self._build_linear_graph()
+
+    def test_release_intermediates_after_last_consumer(self):
+        self._build_releasing_chain()
+        self.engine.process(self.graph)
+
+        self.node3.execute.assert_called_once_with(input=1)
+        self.assertEqual(list(self.engine.node_outputs), ["node3"])
+
+        # Dropped outputs are recomputed when they are needed again
+        self.node3.dirty = True
+        self.engine.process(self.graph)
+        self.assertEqual(self.node1.execute.call_count, 2)
+        self.node3.execute.assert_called_with(input=1)
+
+    def test_release_intermediates_keeps_pinned_outputs(self):
+        self._build_releasing_chain(max_workers=2)
+        self.engine.pinned.add("node1")
+        self.node3.outputs = []  # A sink like a Display node
+
+        self.engine.process(self.graph)
+        self.engine.shutdown()
+
+        self.assertEqual(
+            sorted(self.engine.node_outputs), ["node1", "node2", "node3"]
+        )
+
+    def test_evaluate_runs_only_the_targets_upstream(self):
+        self.node1.execute.return_value = {"output": 1}
+        self.node2.execute.return_value = {"output": 2, "extra": 3}
+        self._build_linear_graph()
+        node4 = MockNode("node4", "Node 4")
+        self.graph.add_node(node4)
+        self.graph.add_edge("node1", "output", "node4", "input")
+
+        results = self.engine.evaluate(
+            self.graph, ["node2", ("node2", "extra")]
+        )
+
+        self.assertEqual(
+            results,
+            {"node2": {"output": 2, "extra": 3}, ("node2", "extra"): 3},
+        )
+        self.node2.execute.assert_called_once_with(input=1)
+        self.node3.execute.assert_not_called()
+        node4.execute.assert_not_called()
+
+    def test_evaluate_keeps_targets_when_releasing_intermediates(self):
+        self._build_releasing_chain(max_workers=2)
+
+        results = self.engine.evaluate(self.graph, ["node2", "node3"])
+        self.engine.shutdown()
+
+        self.assertEqual(
+            results, {"node2": {"output": 1}, "node3": {"output": 2}}
+        )
+        self.assertNotIn("node1", self.engine.node_outputs)
+
+    def test_evaluate_unknown_target(self):
+        with self.assertRaises(KeyError):
+            self.engine.evaluate(self.graph, ["missing"])
+
+    def test_cache_skips_previously_seen_parameters(self):
+        self.engine = Engine(cache=OutputCache())
+        self.node1.param_values = {"value": 1}
+        self.node1.execute.return_value = {"output": 1}
+        self._build_linear_graph()
+        self.engine.process(self.graph)
+
+        self.node1.set_param_value("value", 2)
+        self.engine.process(self.graph)
+        self.node1.set_param_value("value", 1)
+        self.engine.process(self.graph)
+
+        # Toggling back to the original value is served from the cache
+        self.assertEqual(self.node1.execute.call_count, 2)
+        self.assertEqual(self.node2.execute.call_count, 2)
+        self.assertEqual(self.engine.cache.hits, 3)
+
+    def test_parallel_matches_serial(self):
+        self.engine = Engine(max_workers=4)
+        self.node1.execute.return_value = {"output_data": 42}
+        self.node2.execute.return_value = {"output_data": 84}
+        self.graph.add_node(self.node1)
+        self.graph.add_node(self.node2)
+        self.graph.add_node(self.node3)
+        self.graph.add_edge("node1", "output_data", "node3", "input1")
+        self.graph.add_edge("node2", "output_data", "node3", "input2")
+
+        self.engine.process(self.graph)
+        self.engine.shutdown()
+
+        self.node3.execute.assert_called_once_with(input1=42, input2=84)
+        self.assertEqual(
+            self.engine.node_outputs["node2"], {"output_data": 84}
+        )
+
+    def test_parallel_runs_independent_branches_concurrently(self):
+        self.engine = Engine(max_workers=2)
+        # Both branches must be inside execute at the same time to pass
+        barrier = threading.Barrier(2, timeout=5)
+
+        def wait_for_other_branch(**kwargs):
+            barrier.wait()
+            return {}
+
+        self.node2.execute.side_effect = wait_for_other_branch
+        self.node3.execute.side_effect = wait_for_other_branch
+        self.graph.add_node(self.node1)
+        self.graph.add_node(self.node2)
+        self.graph.add_node(self.node3)
+        self.graph.add_edge("node1", "output", "node2", "input")
+        self.graph.add_edge("node1", "output", "node3", "input")
+
+        self.engine.process(self.graph)
+        self.engine.shutdown()
+
+        self.node2.execute.assert_called_once()
+        self.node3.execute.assert_called_once()
+
+    def test_parallel_propagates_errors(self):
+        self.engine = Engine(max_workers=2)
+        self.node2.execute.side_effect = RuntimeError("boom")
+        self._build_linear_graph()
+
+        with self.assertRaises(RuntimeError):
+            self.engine.process(self.graph)
+        self.engine.shutdown()
+
+        self.node3.execute.assert_not_called()
+        # The failed node is retried on the next run
+        self.assertTrue(self.node2.dirty)
+
+    def test_parallel_error_reruns_discarded_siblings(self):
+        self.engine = Engine(max_workers=2)
+        draining = threading.Event()
+
+        def wait(fs, return_when=ALL_COMPLETED):
+            if return_when == ALL_COMPLETED:
+                draining.set()  # The engine has seen the error
+            return futures_wait(fs, return_when=return_when)
+
+        # node2 only finishes once the engine is handling node3's error, so
+        # its result is thrown away with it
+        self.node2.execute.side_effect = lambda **kwargs: (
+            draining.wait(5) and {"output": 1}
+        )
+        self.node3.execute.side_effect = RuntimeError("boom")
+        self.graph.add_node(self.node1)
+        self.graph.add_node(self.node2)
+        self.graph.add_node(self.node3)
+        self.graph.add_edge("node1", "output", "node2", "input")
+        self.graph.add_edge("node1", "output", "node3", "input")
+
+        with patch("app.core.engine.wait", wait):
+            with self.assertRaises(RuntimeError):
+                self.engine.process(self.graph)
+        self.assertTrue(self.node2.dirty)
+
+        self.node2.execute.side_effect = None
+        self.node2.execute.return_value = {"output": 11}
+        self.node3.execute.side_effect = None
+        self.engine.process(self.graph)
+        self.engine.shutdown()
+
+        self.assertEqual(self.engine.node_outputs["node2"], {"output": 11})
+
+    def test_cancel_stops_between_nodes(self):
+        cancel_event = threading.Event()
+        self.node1.execute.side_effect = lambda **kwargs: (
+            cancel_event.set() or {}
+        )
+        self._build_linear_graph()
+
+        with self.assertRaises(ExecutionCancelled):
+            self.engine.process(self.graph, cancel_event=cancel_event)
+
+        self.node2.execute.assert_not_called()
+        self.assertTrue(self.node2.dirty)
+
+        # A later run picks up where the cancelled one stopped
+        self.engine.process(self.graph)
+        self.assertEqual(self.node1.execute.call_count, 1)
+        self.node3.execute.assert_called_once()
+
+    def test_preview_runs_on_downscaled_sources(self):
+        self.node1.execute.return_value = {
+            "output": np.zeros((64, 96), dtype=np.uint8)
+        }
+        seen_scales = []
+        self.node2.execute.side_effect = lambda **kwargs: (
+            seen_scales.append(self.node2.resolution_scale) or {}
+        )
+        self._build_linear_graph()
+
+        self.engine.process_preview(self.graph, 0.25)
+        self.engine.process_preview(self.graph, 0.25)
+
+        # The source ran once at full size; its consumers saw a quarter
+        self.node1.execute.assert_called_once()
+        preview_input = self.node2.execute.call_args.kwargs["input"]
+        self.assertEqual(preview_input.shape, (16, 24))
+        self.assertEqual(seen_scales, [0.25, 0.25])
+        self.assertEqual(self.node2.resolution_scale, 1.0)
+
+        # Previews do not count as real runs
+        self.assertTrue(self.node2.dirty)
+        self.assertNotIn("node2", self.engine.node_outputs)
+        self.engine.process(self.graph)
+        self.assertEqual(self.node1.execute.call_count, 1)
+        self.assertEqual(self.node2.execute.call_count, 3)
+
+    def test_preview_decodes_reduced_sources_at_preview_size(self):
+        seen_scales = []
+        self.node1.reduced_decode = True
+        self.node1.execute.side_effect = lambda **kwargs: (
+            seen_scales.append(self.node1.resolution_scale)
+            or {"output": np.zeros((16, 24), dtype=np.uint8)}
+        )
+        self._build_linear_graph()
+
+        self.engine.process_preview(self.graph, 0.25)
+
+        # The source decoded at preview size; no pyramid was needed
+        self.assertEqual(seen_scales, [0.25])
+        self.assertEqual(self.node1.resolution_scale, 1.0)
+        self.assertEqual(self.engine._pyramids, {})
+        preview_input = self.node2.execute.call_args.kwargs["input"]
+        self.assertEqual(preview_input.shape, (16, 24))
+        self.assertTrue(self.node1.dirty)
+
 
 if __name__ == "__main__":
     unittest.main()
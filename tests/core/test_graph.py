@@ -1,4 +1,5 @@
 import unittest
+from unittest.mock import MagicMock
 from app.core.graph import Graph
 from nodes.base_node import BaseNode
 
@@ -64,6 +65,22 @@ class TestGraph(unittest.TestCase):
         edge_id = "node1:output1->node2:input1"
         self.assertNotIn(edge_id, self.graph.edges)
 
+    def test_nodes_leaving_the_graph_are_closed(self):
+        node3 = MockNode("node3")
+        for node in (self.node1, self.node2, node3):
+            node.close = MagicMock()
+            self.graph.add_node(node)
+        replacement = MockNode("node2")
+
+        self.graph.remove_node("node1")
+        self.graph.replace_node(replacement)
+        self.node1.close.assert_called_once()
+        self.node2.close.assert_called_once()
+        node3.close.assert_not_called()
+
+        self.graph.clear()
+        node3.close.assert_called_once()
+
     def test_remove_edge(self):
         self.graph.add_node(self.node1)
         self.graph.add_node(self.node2)
@@ -72,6 +89,42 @@ class TestGraph(unittest.TestCase):
 
         self.graph.remove_edge(edge_id)
         self.assertNotIn(edge_id, self.graph.edges)
+        self.assertEqual(self.graph.get_outgoing_edges("node1"), [])
+        self.assertEqual(self.graph.get_incoming_edges("node2"), [])
+
+    def test_edge_indexes(self):
+        self.graph.add_node(self.node1)
+        self.graph.add_node(self.node2)
+        self.graph.add_edge("node1", "output1", "node2", "input1")
+
+        outgoing = self.graph.get_outgoing_edges("node1")
+        incoming = self.graph.get_incoming_edges("node2")
+        self.assertEqual(len(outgoing), 1)
+        self.assertIs(outgoing[0], incoming[0])
+        self.assertEqual(self.graph.get_incoming_edges("node1"), [])
+
+    def test_remove_node_updates_edge_indexes(self):
+        self.graph.add_node(self.node1)
+        self.graph.add_node(self.node2)
+        self.graph.add_edge("node1", "output1", "node2", "input1")
+
+        self.graph.remove_node("node2")
+
+        self.assertEqual(self.graph.get_outgoing_edges("node1"), [])
+        self.assertNotIn("node2", self.graph.incoming)
+
+    def test_deserialize_rebuilds_edge_indexes(self):
+        self.graph.add_node(self.node1)
+        self.graph.add_node(self.node2)
+        self.graph.add_edge("node1", "output1", "node2", "input1")
+        data = self.graph.serialize()
+
+        graph = Graph()
+        graph.deserialize(data, {"Test Node": lambda: MockNode("tmp")})
+
+        self.assertEqual(len(graph.edges), 1)
+        self.assertEqual(len(graph.get_incoming_edges("node2")), 1)
+        self.assertEqual(len(graph.get_outgoing_edges("node1")), 1)
 
 
 if __name__ == "__main__":
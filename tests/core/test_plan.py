@@ -0,0 +1,97 @@
+import unittest
+from unittest.mock import MagicMock
+from app.core.engine import Engine
+from app.core.graph import Graph
+from app.core.plan import ExecutionPlan
+from nodes.base_node import BaseNode
+
+
+class MockNode(BaseNode):
+    category = "Test"
+
+    def __init__(self, node_id):
+        super().__init__(
+            name=node_id,
+            inputs=["input"],
+            outputs=["output"],
+            parameters={"x": 0},
+        )
+        self.id = node_id
+        self.execute = MagicMock(return_value={"output": node_id})
+
+    def execute(self, **kwargs):
+        return self.execute(**kwargs)
+
+
+class TestExecutionPlan(unittest.TestCase):
+    def setUp(self):
+        self.graph = Graph()
+        for node_id in ("a", "b", "c"):
+            self.graph.add_node(MockNode(node_id))
+        self.graph.add_edge("a", "output", "b", "input")
+        self.graph.add_edge("b", "output", "c", "input")
+
+    def test_plan_contents(self):
+        plan = ExecutionPlan(self.graph)
+
+        self.assertEqual(plan.order, ["a", "b", "c"])
+        self.assertEqual([node.id for node in plan.nodes], plan.order)
+        self.assertEqual(plan.bindings["a"], [])
+        self.assertEqual(plan.bindings["b"], [("input", "a", "output")])
+        self.assertEqual([node.id for node in plan.consumers["a"]], ["b"])
+        self.assertEqual(plan.consumers["c"], [])
+
+    def test_upstream_closure(self):
+        self.graph.add_node(MockNode("d"))
+        self.graph.add_edge("a", "output", "d", "input")
+        plan = ExecutionPlan(self.graph)
+
+        self.assertEqual(
+            [node.id for node in plan.upstream(["b"])], ["a", "b"]
+        )
+        self.assertIs(plan.upstream({"b"}), plan.upstream(["b"]))
+        self.assertEqual(
+            [node.id for node in plan.upstream(["d", "c"])],
+            [node.id for node in plan.nodes],
+        )
+
+    def test_structural_edits_make_plan_stale(self):
+        plan = ExecutionPlan(self.graph)
+        self.assertTrue(plan.is_current(self.graph))
+
+        self.graph.nodes["a"].set_param_value("x", 1)
+        self.assertTrue(plan.is_current(self.graph))
+
+        self.graph.remove_edge("b:output->c:input")
+        self.assertFalse(plan.is_current(self.graph))
+        self.assertFalse(ExecutionPlan(self.graph).is_current(Graph()))
+
+    def test_engine_reuses_plan_until_topology_changes(self):
+        engine = Engine()
+        engine.process(self.graph)
+        plan = engine.compile(self.graph)
+
+        self.graph.nodes["a"].set_param_value("x", 1)
+        engine.process(self.graph)
+        self.assertIs(engine.compile(self.graph), plan)
+        self.graph.nodes["c"].execute.assert_called_with(input="b")
+
+        self.graph.add_node(MockNode("d"))
+        self.graph.add_edge("c", "output", "d", "input")
+        engine.process(self.graph)
+        self.assertIsNot(engine.compile(self.graph), plan)
+        self.graph.nodes["d"].execute.assert_called_once_with(input="c")
+
+    def test_removed_nodes_are_pruned_on_recompile(self):
+        engine = Engine()
+        engine.process(self.graph)
+        self.assertIn("c", engine.node_outputs)
+
+        self.graph.remove_node("c")
+        engine.process(self.graph)
+
+        self.assertNotIn("c", engine.node_outputs)
+
+
+if __name__ == "__main__":
+    unittest.main()
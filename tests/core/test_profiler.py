@@ -0,0 +1,93 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+import numpy as np
+from app.core.cache import OutputCache
+from app.core.engine import Engine
+from app.core.graph import Graph
+from app.core.profiler import CACHE_HIT, Profiler, describe_outputs
+from nodes.base_node import BaseNode
+
+
+class MockNode(BaseNode):
+    category = "Test"
+
+    def __init__(self, node_id, name="Test Node"):
+        super().__init__(name=name, inputs=[], outputs=[])
+        self.id = node_id
+        self.execute = MagicMock(return_value={})
+
+    def execute(self, **kwargs):
+        return self.execute(**kwargs)
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        self.profiler = Profiler()
+        self.graph = Graph()
+        self.node1 = MockNode("node1", "Source")
+        self.node1.execute.return_value = {
+            "image": np.zeros((4, 6, 3), dtype=np.uint8)
+        }
+        self.node2 = MockNode("node2", "Sink")
+        self.graph.add_node(self.node1)
+        self.graph.add_node(self.node2)
+        self.graph.add_edge("node1", "image", "node2", "image")
+
+    def test_describe_outputs(self):
+        description = describe_outputs(
+            {"image": np.zeros((2, 3), dtype=np.uint16), "label": "x"}
+        )
+        self.assertEqual(
+            description["image"],
+            {"shape": [2, 3], "dtype": "uint16", "nbytes": 12},
+        )
+        self.assertEqual(description["label"], {"type": "str"})
+
+    def test_engine_records_each_node(self):
+        Engine(profiler=self.profiler).process(self.graph)
+
+        records = self.profiler.last_run()
+        self.assertEqual([r.node_id for r in records], ["node1", "node2"])
+        self.assertEqual(records[0].output_bytes, 72)
+        self.assertGreaterEqual(records[0].wall_time, 0)
+        self.assertIn("node2", self.profiler.last_records)
+
+    def test_cache_status_is_recorded(self):
+        engine = Engine(cache=OutputCache(), profiler=self.profiler)
+        engine.process(self.graph)
+        engine.invalidate()
+        engine.process(self.graph)
+
+        self.assertEqual(self.profiler.last_run()[0].cache_status, CACHE_HIT)
+
+    def test_preview_is_recorded_as_a_run(self):
+        engine = Engine(profiler=self.profiler)
+        engine.process(self.graph)
+        engine.process_preview(self.graph, 0.5)
+
+        records = self.profiler.last_run()
+        self.assertEqual(len(self.profiler.runs), 2)
+        # The source was up to date; only the sink ran at preview size
+        self.assertEqual([r.node_id for r in records], ["node2"])
+
+    def test_export_chrome_trace(self):
+        Engine(profiler=self.profiler).process(self.graph)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trace.json")
+            self.profiler.export_chrome_trace(path)
+            with open(path) as f:
+                trace = json.load(f)
+
+        events = trace["traceEvents"]
+        self.assertEqual(len(events), 2)
+        self.assertEqual(events[0]["ph"], "X")
+        self.assertEqual(events[0]["name"], "Source")
+        self.assertEqual(events[0]["args"]["outputs"]["image"]["nbytes"], 72)
+
+
+if __name__ == "__main__":
+    unittest.main()
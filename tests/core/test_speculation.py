@@ -0,0 +1,96 @@
+import threading
+import unittest
+from app.core.cache import OutputCache
+from app.core.engine import Engine
+from app.core.graph import Graph
+from app.core.speculation import SpeculativeExecutor
+from tests.helpers import AddNode
+
+
+class SinkNode(AddNode):
+    name = "Sink"
+    outputs = []
+    cacheable = False
+
+    def execute(self, value=0, **kwargs):
+        self.calls.append(value)
+        return {}
+
+
+class TestSpeculativeExecutor(unittest.TestCase):
+    def setUp(self):
+        self.graph = Graph()
+        self.source = AddNode(inputs=[])
+        self.edited, self.after, self.sink = AddNode(), AddNode(), SinkNode()
+        nodes = (self.source, self.edited, self.after, self.sink)
+        for node in nodes:
+            self.graph.add_node(node)
+        for source, target in zip(nodes, nodes[1:]):
+            self.graph.add_edge(source.id, "value", target.id, "value")
+        self.source.set_param_value("amount", 100)
+        self.edited.set_param_value("amount", 5)
+
+        self.engine = Engine(cache=OutputCache())
+        self.engine.process(self.graph)
+        self.speculator = SpeculativeExecutor(self.engine)
+
+    def tearDown(self):
+        self.speculator.shutdown()
+
+    def speculate(self):
+        return self.speculator.speculate(self.graph, self.edited.id, "amount")
+
+    def edit(self, value):
+        self.edited.set_param_value("amount", value)
+        self.engine.process(self.graph)
+
+    def test_neighbouring_values_become_cache_hits(self):
+        self.speculate().result()
+
+        # Both cacheable nodes ran for 6, 4, 7 and 3; the sink never did
+        self.assertEqual(self.edited.calls, [5, 6, 4, 7, 3])
+        self.assertEqual(len(self.after.calls), 5)
+        self.assertEqual(self.sink.calls, [105])
+        self.assertEqual(self.speculator.computed, 8)
+
+        self.edit(6)
+
+        # The real run found both nodes in the cache
+        self.assertEqual(len(self.edited.calls), 5)
+        self.assertEqual(len(self.after.calls), 5)
+        self.assertEqual(self.sink.calls, [105, 106])
+        self.speculate().result()
+        self.assertEqual(self.speculator.predictions, 1)
+        self.assertEqual(self.speculator.hits, 1)
+
+    def test_unpredicted_edit_is_a_miss(self):
+        self.speculate().result()
+        self.edit(20)
+        self.speculate().result()
+
+        self.assertEqual(self.speculator.stats()["hit_rate"], 0.0)
+        self.assertEqual(self.speculator.predictions, 1)
+
+    def test_cancel_drops_the_speculation(self):
+        self.edited.gate = threading.Event()
+        future = self.speculate()
+        self.speculator.cancel()
+        self.edited.gate.set()
+        future.result()
+
+        self.assertEqual(self.speculator.computed, 0)
+        self.assertEqual(self.speculator.cancelled, 1)
+        self.assertEqual(len(self.after.calls), 1)
+
+    def test_only_integer_parameters(self):
+        self.edited.param_values["amount"] = 5.0
+
+        self.assertIsNone(self.speculate())
+
+    def test_engine_needs_a_cache(self):
+        with self.assertRaises(ValueError):
+            SpeculativeExecutor(Engine())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import threading
+import unittest
+from unittest.mock import MagicMock
+from app.core.engine import ExecutionCancelled
+from app.core.graph import Graph
+from app.core.streaming import StreamingEngine
+from nodes.base_node import BaseNode
+from tests.helpers import AddNode
+
+
+class CounterSource(BaseNode):
+    name = "Counter"
+    outputs = ["value"]
+    streaming = True
+
+    def __init__(self, count):
+        super().__init__()
+        self.count = count
+        self.produced = []
+        self.closed = False
+
+    def execute(self, **kwargs):
+        return {"value": 0}
+
+    def frames(self):
+        try:
+            for index in range(self.count):
+                self.produced.append(index)
+                yield {"value": index}
+        finally:
+            self.closed = True
+
+
+class ConstantNode(BaseNode):
+    name = "Constant"
+    outputs = ["value"]
+
+    def __init__(self, value):
+        super().__init__()
+        self.execute = MagicMock(return_value={"value": value})
+
+    def execute(self, **kwargs):
+        return self.execute(**kwargs)
+
+
+class TestStreamingEngine(unittest.TestCase):
+    def setUp(self):
+        self.graph = Graph()
+        self.source = CounterSource(5)
+        self.constant = ConstantNode(100)
+        self.add = AddNode(inputs=["value", "other"])
+        for node in (self.source, self.constant, self.add):
+            self.graph.add_node(node)
+        self.graph.add_edge(self.source.id, "value", self.add.id, "value")
+        self.graph.add_edge(self.constant.id, "value", self.add.id, "other")
+
+    def test_streams_every_frame_in_order(self):
+        engine = StreamingEngine(queue_size=2)
+        frames = list(engine.run(self.graph, [(self.add.id, "value")]))
+
+        self.assertEqual(
+            frames,
+            [(i, {(self.add.id, "value"): 100 + i}) for i in range(5)],
+        )
+        # Nodes that don't depend on the stream run once
+        self.constant.execute.assert_called_once()
+        self.assertTrue(self.source.closed)
+        self.assertEqual(
+            [stats.frames for stats in engine.stats], [5, 5]
+        )
+        self.assertIn("Add", engine.report())
+
+    def test_stages_overlap(self):
+        source_ahead = threading.Event()
+        original = self.source.frames
+
+        def frames():
+            for index, outputs in enumerate(original()):
+                if index == 1:
+                    source_ahead.set()
+                yield outputs
+
+        def add(value=0, other=0):
+            # Only finishes if the next frame is read while this one runs
+            if value == 0:
+                self.assertTrue(source_ahead.wait(timeout=5))
+            return {"value": value + other}
+
+        self.source.frames = frames
+        self.add.execute = add
+        frames_out = list(StreamingEngine().run(self.graph, [self.add.id]))
+
+        self.assertEqual(len(frames_out), 5)
+
+    def test_backpressure_bounds_read_ahead(self):
+        self.source.count = 100
+        engine = StreamingEngine(queue_size=2)
+        stream = engine.run(self.graph, [self.add.id])
+        next(stream)
+        # Let the pipeline fill up behind the consumer
+        threading.Event().wait(0.2)
+        stream.close()
+
+        # Two queues of two frames, one frame per stage and the consumer's
+        self.assertLess(len(self.source.produced), 10)
+        self.assertTrue(self.source.closed)
+
+    def test_drop_frames_keeps_the_source_running(self):
+        self.source.count = 50
+        engine = StreamingEngine(queue_size=1, drop_frames=True)
+        source_done = threading.Event()
+        original = self.source.frames
+
+        def frames():
+            yield from original()
+            source_done.set()
+
+        def add(value=0, other=0):
+            # A slow stage: the source finishes while the first frame runs
+            source_done.wait(timeout=5)
+            return {"value": value + other}
+
+        self.source.frames = frames
+        self.add.execute = add
+        indexes = [index for index, _ in engine.run(self.graph, [self.add.id])]
+
+        self.assertEqual(indexes[0], 0)
+        self.assertLess(len(indexes), 50)
+        self.assertEqual(engine.stats[0].dropped, 50 - len(indexes))
+
+    def test_stage_errors_are_raised(self):
+        self.add.execute = MagicMock(side_effect=RuntimeError("boom"))
+
+        with self.assertRaises(RuntimeError):
+            list(StreamingEngine().run(self.graph, [self.add.id]))
+
+    def test_cancel(self):
+        cancel_event = threading.Event()
+        cancel_event.set()
+
+        with self.assertRaises(ExecutionCancelled):
+            list(
+                StreamingEngine().run(
+                    self.graph, [self.add.id], cancel_event=cancel_event
+                )
+            )
+
+    def test_targets_without_stream_are_rejected(self):
+        with self.assertRaises(ValueError):
+            StreamingEngine().run(self.graph, [self.constant.id])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,188 @@
+import itertools
+import unittest
+from unittest.mock import patch
+import cv2
+import numpy as np
+from app.core.engine import Engine
+from app.core.graph import Graph
+from app.core.sweep import ParameterSweep
+from nodes.base_node import BaseNode
+from nodes.built_in.display.blur_node import BlurNode
+from nodes.built_in.filters.canny_edge import CannyNode
+from tests.helpers import AddNode
+
+
+class ImageNode(BaseNode):
+    name = "Image"
+    outputs = ["image"]
+
+    def execute(self, **kwargs):
+        image = np.zeros((40, 60), dtype=np.uint8)
+        image[10:30, 20:40] = 255
+        return {"image": image}
+
+
+class TestParameterSweep(unittest.TestCase):
+    def setUp(self):
+        self.graph = Graph()
+
+    def _chain(self, count):
+        nodes = [AddNode(inputs=[])] + [AddNode() for _ in range(count - 1)]
+        for node in nodes:
+            self.graph.add_node(node)
+        for source, target in zip(nodes, nodes[1:]):
+            self.graph.add_edge(source.id, "value", target.id, "value")
+        return nodes
+
+    def test_shared_prefixes_run_once(self):
+        source, a, b, c = self._chain(4)
+        source.set_param_value("amount", 1000)
+
+        points = ParameterSweep(max_workers=1).run(
+            self.graph,
+            {b.id: {"amount": [1, 2, 3, 4]}, a.id: {"amount": [10, 20, 30]}},
+            [(c.id, "value")],
+        )
+
+        self.assertEqual(len(points), 12)
+        # Upstream parameters vary slowest
+        self.assertEqual(
+            [point.params[(a.id, "amount")] for point in points[:5]],
+            [10, 10, 10, 10, 20],
+        )
+        for index, point in enumerate(points):
+            self.assertEqual(point.index, index)
+            self.assertEqual(
+                point.results[(c.id, "value")],
+                1000
+                + point.params[(a.id, "amount")]
+                + point.params[(b.id, "amount")],
+            )
+        self.assertEqual(len(source.calls), 1)
+        self.assertEqual(a.calls, [10, 20, 30])
+        self.assertEqual(len(b.calls), 12)
+        self.assertEqual(len(c.calls), 12)
+
+    def test_independent_branches_are_not_rerun(self):
+        source = AddNode(inputs=[])
+        left, right = AddNode(), AddNode()
+        join = AddNode(inputs=["value", "other"])
+        for node in (source, left, right, join):
+            self.graph.add_node(node)
+        self.graph.add_edge(source.id, "value", left.id, "value")
+        self.graph.add_edge(source.id, "value", right.id, "value")
+        self.graph.add_edge(left.id, "value", join.id, "value")
+        self.graph.add_edge(right.id, "value", join.id, "other")
+
+        points = ParameterSweep(max_workers=1).run(
+            self.graph,
+            {
+                left.id: {"amount": [1, 2]},
+                right.id: {"amount": [10, 20, 30]},
+                join.id: {"amount": [100, 200]},
+            },
+            [join.id],
+        )
+
+        self.assertEqual(len(points), 12)
+        self.assertEqual(len(left.calls), 2)
+        self.assertEqual(len(right.calls), 3)
+        self.assertEqual(len(join.calls), 12)
+
+    def test_parallel_leaves_match_serial(self):
+        source, a, b = self._chain(3)
+        ranges = {a.id: {"amount": [1, 2]}, b.id: {"amount": range(8)}}
+        targets = [(b.id, "value")]
+
+        serial = ParameterSweep(max_workers=1).run(self.graph, ranges, targets)
+        parallel = ParameterSweep(max_workers=4).run(
+            self.graph, ranges, targets
+        )
+
+        self.assertEqual(
+            [point.results for point in parallel],
+            [point.results for point in serial],
+        )
+
+    def test_leaf_state_carries_between_points(self):
+        source, blur, canny = ImageNode(), BlurNode(), CannyNode()
+        for node in (source, blur, canny):
+            self.graph.add_node(node)
+        self.graph.add_edge(source.id, "image", blur.id, "image")
+        self.graph.add_edge(blur.id, "image", canny.id, "image")
+        grid = {"kernel_size": [3, 5], "threshold1": [50, 75, 100, 125]}
+        targets = [(canny.id, "image")]
+
+        def count_gradients(run):
+            with patch("cv2.Sobel", wraps=cv2.Sobel) as sobel:
+                run()
+            return sobel.call_count
+
+        def step_through():
+            engine = Engine()
+            for kernel_size, threshold1 in itertools.product(*grid.values()):
+                blur.set_param_value("kernel_size", kernel_size)
+                canny.set_param_value("threshold1", threshold1)
+                engine.evaluate(self.graph, targets)
+
+        def sweep(workers):
+            ParameterSweep(max_workers=workers).run(
+                self.graph,
+                {
+                    blur.id: {"kernel_size": grid["kernel_size"]},
+                    canny.id: {"threshold1": grid["threshold1"]},
+                },
+                targets,
+            )
+
+        # Canny computes the gradients no more often than it would for an
+        # engine stepping through the grid
+        incremental = count_gradients(step_through)
+        self.assertGreater(incremental, 0)
+        self.assertEqual(count_gradients(lambda: sweep(1)), incremental)
+        # A worker's chunk of a group computes them at most once more
+        self.assertLessEqual(
+            count_gradients(lambda: sweep(2)), 2 * incremental
+        )
+
+    def test_metrics_without_results(self):
+        source, a = self._chain(2)
+
+        points = ParameterSweep().run(
+            self.graph,
+            {a.id: {"amount": [1, 2, 3]}},
+            [(a.id, "value")],
+            metrics={"double": lambda p: 2 * p.results[(a.id, "value")]},
+            keep_results=False,
+        )
+
+        self.assertEqual(
+            [point.metrics for point in points],
+            [{"double": 2}, {"double": 4}, {"double": 6}],
+        )
+        self.assertTrue(all(point.results is None for point in points))
+
+    def test_parameters_are_restored(self):
+        source, a = self._chain(2)
+        a.set_param_value("amount", 7)
+
+        ParameterSweep().run(
+            self.graph, {a.id: {"amount": [1, 2]}}, [(a.id, "value")]
+        )
+
+        self.assertEqual(a.param_values["amount"], 7)
+
+    def test_invalid_ranges(self):
+        source, a = self._chain(2)
+        sweep = ParameterSweep()
+
+        with self.assertRaises(KeyError):
+            sweep.run(self.graph, {"missing": {"amount": [1]}}, [a.id])
+        with self.assertRaises(KeyError):
+            sweep.run(self.graph, {a.id: {"missing": [1]}}, [a.id])
+        with self.assertRaises(ValueError):
+            sweep.run(self.graph, {a.id: {"amount": []}}, [a.id])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+import numpy as np
+from app.core.engine import Engine
+from app.core.graph import Graph
+from app.core.profiler import CACHE_DISABLED, Profiler
+from app.core.tiling import expand_rect, iter_tiles
+from nodes.base_node import BaseNode
+from nodes.built_in.display.blur_node import BlurNode
+from nodes.built_in.filters.canny_edge import CannyNode
+from plugins.custom_grayscale_node import GrayscaleNode
+
+
+class SourceNode(BaseNode):
+    category = "Test"
+
+    def __init__(self, image):
+        super().__init__(name="Source", inputs=[], outputs=["image"])
+        self.image = image
+
+    def execute(self, **kwargs):
+        return {"image": self.image}
+
+
+class TestTilingHelpers(unittest.TestCase):
+    def test_expand_rect_clips_to_frame(self):
+        self.assertEqual(
+            expand_rect((0, 10, 5, 15), 3, 12, 16), (0, 12, 2, 16)
+        )
+
+    def test_iter_tiles_covers_frame(self):
+        tiles = iter_tiles(10, 7, 4)
+        self.assertEqual(len(tiles), 6)
+        self.assertEqual(sum((b - t) * (r - l) for t, b, l, r in tiles), 70)
+
+
+class TestTiledExecution(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.image = rng.integers(0, 255, (97, 131, 3), dtype=np.uint8)
+
+    def build_graph(self):
+        graph = Graph()
+        source = SourceNode(self.image)
+        blur1, blur2 = BlurNode(), BlurNode()
+        blur1.set_param_value("kernel_size", 7)
+        blur2.set_param_value("kernel_size", 3)
+        gray, canny, side = GrayscaleNode(), CannyNode(), BlurNode()
+        for node in (source, blur1, blur2, gray, canny, side):
+            graph.add_node(node)
+        graph.add_edge(source.id, "image", blur1.id, "image")
+        graph.add_edge(blur1.id, "image", blur2.id, "image")
+        graph.add_edge(blur2.id, "image", gray.id, "image")
+        graph.add_edge(gray.id, "image", canny.id, "image")
+        # A tileable node downstream of a full-frame one
+        graph.add_edge(canny.id, "image", side.id, "image")
+        return graph, [blur2, gray, canny, side]
+
+    def run_graph(self, engine):
+        graph, nodes = self.build_graph()
+        engine.process(graph)
+        engine.shutdown()
+        return [engine.node_outputs[node.id]["image"] for node in nodes[1:]]
+
+    def test_tiled_matches_full_frame(self):
+        expected = self.run_graph(Engine())
+        for tile_size, workers in ((16, 1), (40, 4), (500, 1)):
+            with self.subTest(tile_size=tile_size, workers=workers):
+                actual = self.run_graph(
+                    Engine(tile_size=tile_size, max_workers=workers)
+                )
+                for want, got in zip(expected, actual):
+                    np.testing.assert_array_equal(want, got)
+
+    def test_intermediates_are_not_materialised(self):
+        engine = Engine(tile_size=32)
+        graph, nodes = self.build_graph()
+        engine.process(graph)
+
+        blur1_id = graph.get_incoming_edges(nodes[0].id)[0].source_node_id
+        self.assertNotIn(blur1_id, engine.node_outputs)
+
+    def test_tiles_are_profiled(self):
+        profiler = Profiler()
+        engine = Engine(tile_size=64, profiler=profiler)
+        graph, nodes = self.build_graph()
+        engine.process(graph)
+
+        records = profiler.last_run()
+        self.assertEqual(
+            {record.node_id for record in records}, set(graph.nodes)
+        )
+        # One record for each of the 2 x 3 tiles of a tiled node
+        blur2_records = [r for r in records if r.node_id == nodes[0].id]
+        self.assertEqual(len(blur2_records), 6)
+        self.assertEqual(blur2_records[0].cache_status, CACHE_DISABLED)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,28 @@
+"""Node classes shared by several test modules."""
+
+from nodes.base_node import BaseNode
+
+
+class AddNode(BaseNode):
+    """
+    Adds its amount parameter to its input, and to an "other" input when it
+    is given one, and records each call.
+    """
+
+    name = "Add"
+    inputs = ["value"]
+    outputs = ["value"]
+    parameters = {"amount": 0}
+
+    def __init__(self, inputs=None):
+        super().__init__(inputs=inputs)
+        # Shared with the copies that sweeps and speculation run
+        self.calls = []
+        # When set, execute() waits for it first
+        self.gate = None
+
+    def execute(self, value=0, other=0, **kwargs):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.calls.append(self.param_values["amount"])
+        return {"value": value + other + self.param_values["amount"]}
@@ -0,0 +1,105 @@
+import time
+import unittest
+import numpy as np
+from PyQt6.QtCore import QCoreApplication
+from PyQt6.QtGui import QImage
+from app.node_editor.frame_converter import FrameConverter
+
+
+def image_to_array(image: QImage) -> np.ndarray:
+    """Reads a converted QImage back as (height, width, bytes) pixels."""
+    depth = image.depth() // 8
+    data = np.frombuffer(
+        image.constBits().asstring(image.sizeInBytes()), dtype=np.uint8
+    )
+    rows = data.reshape(image.height(), image.bytesPerLine())
+    return rows[:, : image.width() * depth].reshape(
+        image.height(), image.width(), depth
+    )
+
+
+class TestFrameConverter(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def setUp(self):
+        self.converter = FrameConverter()
+
+    def tearDown(self):
+        self.converter.shutdown()
+
+    def test_converts_non_contiguous_color_slice(self):
+        base = np.arange(10 * 12 * 3, dtype=np.uint8).reshape(10, 12, 3)
+        sliced = base[1:8:2, 3:10]  # Strided rows, odd width
+
+        frame = self.converter.convert(sliced)
+
+        self.assertEqual(frame.image.format(), QImage.Format.Format_BGR888)
+        self.assertEqual(frame.image.bytesPerLine() % 4, 0)
+        np.testing.assert_array_equal(image_to_array(frame.image), sliced)
+
+    def test_converts_dtypes_and_channels(self):
+        gray = np.array([[0.0, 0.5], [1.0, 0.25]], dtype=np.float32)
+        frame = self.converter.convert(gray)
+        np.testing.assert_array_equal(
+            image_to_array(frame.image)[:, :, 0], [[0, 127], [255, 63]]
+        )
+
+        mask = np.array([[True, False]])
+        frame = self.converter.convert(mask[:, :, np.newaxis])
+        np.testing.assert_array_equal(
+            image_to_array(frame.image)[:, :, 0], [[255, 0]]
+        )
+
+        bgra = np.array([[[1, 2, 3, 4]]], dtype=np.uint8)
+        frame = self.converter.convert(bgra)
+        self.assertEqual(frame.image.format(), QImage.Format.Format_RGBA8888)
+        np.testing.assert_array_equal(
+            image_to_array(frame.image), [[[3, 2, 1, 4]]]
+        )
+
+    def test_empty_image_clears_and_bad_shape_is_rejected(self):
+        self.assertIsNone(self.converter.convert(np.array([])).image)
+        self.assertIsNone(self.converter.convert(np.zeros((4, 4, 2))))
+
+    def test_buffers_are_reused_for_the_same_shape(self):
+        image = np.zeros((4, 6), dtype=np.uint8)
+        first = self.converter.convert(image)
+        buffer = first.buffer
+        self.converter.release(first)
+        second = self.converter.convert(image)
+
+        self.assertIs(second.buffer, buffer)
+        self.assertEqual(self.converter.pool_stats()["allocated"], 1)
+
+        self.converter.release(second)
+        self.converter.convert(np.zeros((5, 6), dtype=np.uint8))
+        self.assertEqual(
+            self.converter.pool_stats(), {"allocated": 1, "free": 0}
+        )
+
+    def test_submit_delivers_latest_frame(self):
+        frames = []
+        self.converter.frame_ready.connect(frames.append)
+
+        for value in range(5):
+            self.converter.submit(np.full((8, 8), value, dtype=np.uint8))
+
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            self.app.processEvents()
+            if frames:
+                shown = frames[-1]
+                self.converter.frame_displayed()
+                if image_to_array(shown.image)[0, 0, 0] == 4:
+                    break
+            time.sleep(0.005)
+
+        self.assertEqual(image_to_array(frames[-1].image)[0, 0, 0], 4)
+        # Frames submitted while one was being converted were dropped
+        self.assertLessEqual(len(frames), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,8 @@
 import unittest
+from unittest.mock import patch
+import cv2
 import numpy as np
+from app.core.buffers import BufferPool
 from nodes.built_in.filters.canny_edge import CannyNode
 
 
@@ -18,6 +21,50 @@ class TestCannyEdgeFilter(unittest.TestCase):
         # Check if there are any white pixels (edges) detected
         self.assertGreater(np.sum(output_image), 0)
 
+    def test_pooled_buffers_match_fresh_output(self):
+        node = CannyNode()
+        input_image = np.zeros((40, 60, 3), dtype=np.uint8)
+        input_image[10:30, 20:40] = (0, 128, 255)
+        expected = node.execute(image=input_image)["image"]
+
+        node.buffer_pool = BufferPool()
+        result = node.execute(image=input_image)["image"]
+
+        np.testing.assert_array_equal(result, expected)
+        # The grayscale scratch image went back to the pool
+        self.assertEqual(node.buffer_pool.stats()["buffers"], 1)
+
+    def test_threshold_changes_reuse_gradients(self):
+        node = CannyNode()
+        rng = np.random.default_rng(0)
+        input_image = rng.integers(0, 255, (60, 80, 3), dtype=np.uint8)
+        gray = cv2.cvtColor(input_image, cv2.COLOR_BGR2GRAY)
+
+        with patch("cv2.Sobel", wraps=cv2.Sobel) as sobel:
+            for t1, t2 in ((100, 200), (50, 150), (20, 250), (80, 90)):
+                node.set_param_value("threshold1", t1)
+                node.set_param_value("threshold2", t2)
+                result = node.execute(image=input_image)["image"]
+                np.testing.assert_array_equal(
+                    result, cv2.Canny(gray, t1, t2)
+                )
+
+        # Computed once, when the input came back for the second run
+        self.assertEqual(sobel.call_count, 2)
+
+    def test_new_input_drops_gradients(self):
+        node = CannyNode()
+        first = np.zeros((40, 40), dtype=np.uint8)
+        first[:, 20:] = 255
+        node.execute(image=first)
+        node.execute(image=first)
+        second = first.T.copy()
+
+        result = node.execute(image=second)["image"]
+
+        np.testing.assert_array_equal(result, cv2.Canny(second, 100, 200))
+        self.assertIsNone(node._gradients)
+
     def test_no_input_image(self):
         node = CannyNode()
         result = node.execute(image=None)
@@ -1,7 +1,12 @@
+import json
+import os
+import tempfile
 import unittest
 from unittest.mock import patch
 import numpy as np
 import cv2
+from app.core.graph import Graph
+from app.core.pipeline_io import load_pipeline_file
 from nodes.built_in.io.load_image import LoadColorImageNode
 
 
@@ -41,6 +46,51 @@ class TestLoadColorImage(unittest.TestCase):
         self.assertEqual(output_image.shape, (10, 10, 3))
         self.assertTrue(np.all(output_image == 0))
 
+    def test_decode_scale_reads_a_reduced_image(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "image.jpg")
+            cv2.imwrite(path, np.zeros((80, 120, 3), dtype=np.uint8))
+            node = LoadColorImageNode()
+            node.set_param_value("path", path)
+            node.set_param_value("decode_scale", 0.25)
+
+            result = node.execute()
+
+        self.assertEqual(result["image"].shape, (20, 30, 3))
+        self.assertEqual(result["scale"], 0.25)
+
+    def test_pipeline_saved_before_decode_scale_loads(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "image.png")
+            cv2.imwrite(path, np.zeros((8, 12, 3), dtype=np.uint8))
+            pipeline = os.path.join(tmp, "pipeline.json")
+            with open(pipeline, "w") as f:
+                json.dump(
+                    {
+                        "nodes": [
+                            {
+                                "id": "load",
+                                "name": LoadColorImageNode.name,
+                                "parameters": {"path": path},
+                            }
+                        ],
+                        "edges": [],
+                    },
+                    f,
+                )
+            graph = Graph()
+            graph.deserialize(
+                load_pipeline_file(pipeline),
+                {LoadColorImageNode.name: LoadColorImageNode},
+            )
+            node = graph.nodes["load"]
+
+            node.prefetch()
+            result = node.execute()
+
+        self.assertEqual(node.param_values["decode_scale"], 1.0)
+        self.assertEqual(result["image"].shape, (8, 12, 3))
+
 
 if __name__ == "__main__":
     unittest.main()
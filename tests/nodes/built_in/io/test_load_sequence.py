@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+import cv2
+import numpy as np
+from app.core.graph import Graph
+from app.core.streaming import StreamingEngine
+from nodes.built_in.io.load_sequence import LoadImageSequenceNode
+
+
+class TestLoadImageSequence(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        for index in range(5):
+            cv2.imwrite(
+                os.path.join(self.tmp.name, f"{index:04d}.png"),
+                np.full((6, 9, 3), index * 10, np.uint8),
+            )
+        self.node = LoadImageSequenceNode()
+        self.node.set_param_value("pattern", self.tmp.name)
+
+    def tearDown(self):
+        self.node.close()
+        self.tmp.cleanup()
+
+    def test_execute_reads_the_selected_frame(self):
+        self.node.set_param_value("frame", 2)
+        image = self.node.execute()["image"]
+
+        self.assertEqual(image.shape, (6, 9, 3))
+        self.assertEqual(image[0, 0, 0], 20)
+
+    def test_grayscale_mode(self):
+        self.node.set_param_value("mode", "grayscale")
+        self.assertEqual(self.node.execute()["image"].shape, (6, 9))
+
+    def test_frame_out_of_range(self):
+        self.node.set_param_value("frame", 5)
+        self.assertIsNone(self.node.execute()["image"])
+        self.assertIsNone(self.node.cache_token())
+
+    def test_cache_token_follows_the_frame(self):
+        first = self.node.cache_token()
+        self.node.set_param_value("frame", 1)
+        self.assertNotEqual(self.node.cache_token(), first)
+        # Only a stat; no decoder threads are started for it
+        self.assertIsNone(self.node._reader)
+
+    def test_leaving_the_graph_closes_the_reader(self):
+        graph = Graph()
+        graph.add_node(self.node)
+        self.node.execute()
+        reader = self.node._reader
+
+        graph.remove_node(self.node.id)
+
+        self.assertIsNone(self.node._reader)
+        self.assertTrue(reader._executor._shutdown)
+        # A run already holding the node can still use it
+        self.assertEqual(self.node.execute()["image"][0, 0, 0], 0)
+
+    def test_streams_from_the_selected_frame(self):
+        self.node.set_param_value("frame", 1)
+        graph = Graph()
+        graph.add_node(self.node)
+
+        frames = list(
+            StreamingEngine().run(graph, [(self.node.id, "image")])
+        )
+
+        values = [outputs[(self.node.id, "image")] for _, outputs in frames]
+        self.assertEqual(
+            [value[0, 0, 0] for value in values], [10, 20, 30, 40]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
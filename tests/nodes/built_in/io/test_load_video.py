@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+import cv2
+import numpy as np
+from app.core.graph import Graph
+from app.core.streaming import StreamingEngine
+from nodes.built_in.display.blur_node import BlurNode
+from nodes.built_in.io.load_video import LoadVideoNode
+
+
+def write_video(path, count, size=(64, 48)):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30, size)
+    for index in range(count):
+        writer.write(np.full((size[1], size[0], 3), index * 20, np.uint8))
+    writer.release()
+
+
+class TestLoadVideo(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "clip.avi")
+        write_video(self.path, 6)
+        self.node = LoadVideoNode()
+        self.node.set_param_value("path", self.path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_execute_reads_the_selected_frame(self):
+        self.node.set_param_value("frame", 3)
+        image = self.node.execute()["image"]
+
+        self.assertEqual(image.shape, (48, 64, 3))
+        self.assertAlmostEqual(float(image.mean()), 60, delta=5)
+
+    def test_frames_yields_every_frame(self):
+        frames = [outputs["image"] for outputs in self.node.frames()]
+
+        self.assertEqual(len(frames), 6)
+        self.assertAlmostEqual(float(frames[-1].mean()), 100, delta=5)
+
+    def test_missing_file(self):
+        self.node.set_param_value("path", "missing.avi")
+        with self.assertRaises(IOError):
+            self.node.execute()
+
+    def test_streaming_pipeline(self):
+        graph = Graph()
+        blur = BlurNode()
+        graph.add_node(self.node)
+        graph.add_node(blur)
+        graph.add_edge(self.node.id, "image", blur.id, "image")
+
+        frames = list(StreamingEngine().run(graph, [(blur.id, "image")]))
+
+        self.assertEqual([index for index, _ in frames], list(range(6)))
+        self.assertEqual(frames[0][1][(blur.id, "image")].shape, (48, 64, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -30,6 +30,25 @@ class TestBaseNode(unittest.TestCase):
         node.set_param_value("p1", 25)
         self.assertEqual(node.param_values["p1"], 25)
 
+    def test_set_param_value_marks_node_dirty(self):
+        node = ConcreteNode("Test", [], [], {"p1": 10})
+        node.dirty = False
+        node.set_param_value("p1", 10)
+        self.assertFalse(node.dirty)
+        node.set_param_value("p1", 11)
+        self.assertTrue(node.dirty)
+
+    def test_default_stream_is_a_single_frame(self):
+        node = ConcreteNode("Test", [], ["result"])
+        self.assertEqual(list(node.frames()), [{"result": 42}])
+
+    def test_get_param_scales_pixel_params(self):
+        node = ConcreteNode("Test", [], [], {"size": 9, "threshold": 100})
+        node.pixel_params = ("size",)
+        node.resolution_scale = 0.25
+        self.assertEqual(node.get_param("size"), 2)
+        self.assertEqual(node.get_param("threshold"), 100)
+
     def test_set_nonexistent_param_raises_keyerror(self):
         node = ConcreteNode("Test", [], [], {"p1": 10})
         with self.assertRaises(KeyError):
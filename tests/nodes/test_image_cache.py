@@ -0,0 +1,142 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+import cv2
+import numpy as np
+from nodes.image_cache import ImageCache, prefetch_scaled, read_scaled
+
+
+class TestImageCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "image.png")
+        cv2.imwrite(self.path, np.full((20, 30), 7, dtype=np.uint8))
+        self.cache = ImageCache()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_repeated_reads_decode_once(self):
+        with patch("cv2.imread", wraps=cv2.imread) as imread:
+            first = self.cache.read(self.path, cv2.IMREAD_GRAYSCALE)
+            second = self.cache.read(self.path, cv2.IMREAD_GRAYSCALE)
+
+        imread.assert_called_once()
+        self.assertIs(first, second)
+        self.assertFalse(first.flags.writeable)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    def test_flags_are_part_of_the_key(self):
+        gray = self.cache.read(self.path, cv2.IMREAD_GRAYSCALE)
+        color = self.cache.read(self.path, cv2.IMREAD_COLOR)
+
+        self.assertEqual(gray.shape, (20, 30))
+        self.assertEqual(color.shape, (20, 30, 3))
+        self.assertEqual(len(self.cache), 2)
+
+    def test_changed_file_is_decoded_again(self):
+        self.cache.read(self.path, cv2.IMREAD_GRAYSCALE)
+        cv2.imwrite(self.path, np.full((40, 30), 9, dtype=np.uint8))
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        image = self.cache.read(self.path, cv2.IMREAD_GRAYSCALE)
+
+        self.assertEqual(image.shape, (40, 30))
+        # The stale version was dropped rather than left to age out
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache.current_bytes, image.nbytes)
+
+    def test_byte_cap_evicts_least_recently_used(self):
+        self.cache.max_bytes = 20 * 30 * 3 + 10
+        other = os.path.join(self.tmp.name, "other.png")
+        cv2.imwrite(other, np.zeros((20, 30), dtype=np.uint8))
+
+        self.cache.read(self.path, cv2.IMREAD_COLOR)
+        self.cache.read(other, cv2.IMREAD_COLOR)
+
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache.evictions, 1)
+        self.assertLessEqual(self.cache.current_bytes, self.cache.max_bytes)
+
+    def test_missing_file_bypasses_cache(self):
+        self.assertIsNone(self.cache.read("missing.png", cv2.IMREAD_COLOR))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_concurrent_reads_share_one_decode(self):
+        started = threading.Event()
+        release = threading.Event()
+        real_imread = cv2.imread
+
+        def slow_imread(*args):
+            started.set()
+            release.wait(5)
+            return real_imread(*args)
+
+        with patch("cv2.imread", side_effect=slow_imread) as imread:
+            future = self.cache.prefetch(self.path, cv2.IMREAD_GRAYSCALE)
+            started.wait(5)
+            results = []
+            reader = threading.Thread(
+                target=lambda: results.append(
+                    self.cache.read(self.path, cv2.IMREAD_GRAYSCALE)
+                )
+            )
+            reader.start()
+            release.set()
+            reader.join(5)
+            prefetched = future.result(5)
+
+        imread.assert_called_once()
+        self.assertIs(results[0], prefetched)
+
+
+class TestReadScaled(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "image.jpg")
+        cv2.imwrite(self.path, np.full((128, 192, 3), 90, dtype=np.uint8))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_scale_rounds_up_to_a_power_of_two(self):
+        image, scale = read_scaled(self.path, cv2.IMREAD_COLOR, 0.3)
+
+        self.assertEqual(scale, 0.5)
+        self.assertEqual(image.shape, (64, 96, 3))
+
+    def test_decoder_reduces_up_to_an_eighth(self):
+        with patch("cv2.imread", wraps=cv2.imread) as imread:
+            image, scale = read_scaled(self.path, cv2.IMREAD_GRAYSCALE, 0.125)
+
+        imread.assert_called_once_with(
+            os.path.abspath(self.path), cv2.IMREAD_REDUCED_GRAYSCALE_8
+        )
+        self.assertEqual(scale, 0.125)
+        self.assertEqual(image.shape, (16, 24))
+
+    def test_smaller_scales_halve_the_reduced_image(self):
+        image, scale = read_scaled(self.path, cv2.IMREAD_COLOR, 1 / 32)
+
+        self.assertEqual(scale, 1 / 32)
+        self.assertEqual(image.shape, (4, 6, 3))
+
+    def test_full_scale_reads_the_whole_image(self):
+        image, scale = read_scaled(self.path, cv2.IMREAD_COLOR, 1.0)
+
+        self.assertEqual(scale, 1.0)
+        self.assertEqual(image.shape, (128, 192, 3))
+
+    def test_non_positive_scale_is_an_error(self):
+        for scale in (0.0, -0.5):
+            with self.assertRaises(ValueError):
+                read_scaled(self.path, cv2.IMREAD_COLOR, scale)
+            with self.assertRaises(ValueError):
+                prefetch_scaled(self.path, cv2.IMREAD_COLOR, scale)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import threading
+import unittest
+import cv2
+import numpy as np
+from nodes.sequence_reader import SequenceReader, list_sequence
+
+
+class TestSequenceReader(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.paths = []
+        for index in range(6):
+            path = os.path.join(self.tmp.name, f"frame_{index:03d}.png")
+            cv2.imwrite(path, np.full((8, 8), index * 10, np.uint8))
+            self.paths.append(path)
+        with open(os.path.join(self.tmp.name, "notes.txt"), "w") as f:
+            f.write("not an image")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_list_sequence(self):
+        self.assertEqual(list_sequence(self.tmp.name), self.paths)
+        self.assertEqual(
+            list_sequence(os.path.join(self.tmp.name, "frame_00[12].png")),
+            self.paths[1:3],
+        )
+
+    def test_reads_in_order_with_read_ahead(self):
+        reader = SequenceReader(
+            self.paths, cv2.IMREAD_GRAYSCALE, read_ahead=2, workers=2
+        )
+        try:
+            self.assertEqual(reader.read(0)[0, 0], 0)
+            self.assertEqual(sorted(reader._pending), [1, 2])
+            for future in list(reader._pending.values()):
+                future.result()
+
+            self.assertEqual(reader.read(1)[0, 0], 10)
+            self.assertEqual(reader.hits, 1)
+            self.assertEqual(sorted(reader._pending), [2, 3])
+        finally:
+            reader.close()
+
+    def test_seek_drops_stale_read_ahead(self):
+        reader = SequenceReader(self.paths, read_ahead=2, workers=1)
+        try:
+            reader.read(0)
+            self.assertEqual(reader.read(4).shape, (8, 8, 3))
+            self.assertEqual(sorted(reader._pending), [5])
+            self.assertIsNone(reader.read(6))
+        finally:
+            reader.close()
+
+    def test_decodes_run_on_worker_threads(self):
+        reader = SequenceReader(self.paths, read_ahead=3, workers=3)
+        threads = set()
+        decode = reader._decode
+
+        def record(index):
+            threads.add(threading.current_thread().name)
+            return decode(index)
+
+        reader._decode = record
+        try:
+            reader.read(0)
+        finally:
+            reader.close()
+        self.assertTrue(all(name.startswith("sequence") for name in threads))
+
+    def test_reads_without_read_ahead_once_closed(self):
+        reader = SequenceReader(self.paths, read_ahead=2, workers=1)
+        reader.read(0)
+        reader.close()
+
+        self.assertEqual(reader.read(1)[0, 0, 0], 10)
+        self.assertEqual(reader._pending, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
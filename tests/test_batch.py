@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+import cv2
+import numpy as np
+from app.batch import find_sink_targets, run_batch
+from app.core.graph import Graph
+from app.core.pipeline_io import save_pipeline_file
+from nodes.built_in.display.blur_node import BlurNode
+from nodes.built_in.display.display_image import DisplayNode
+from nodes.built_in.display.load_image import LoadImageNode
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.input_dir = os.path.join(self.tmp.name, "in")
+        self.output_dir = os.path.join(self.tmp.name, "out")
+        os.makedirs(self.input_dir)
+
+        rng = np.random.default_rng(0)
+        self.images = {}
+        for name in ("a.png", "b.png"):
+            image = rng.integers(0, 255, (40, 60), dtype=np.uint8)
+            cv2.imwrite(os.path.join(self.input_dir, name), image)
+            self.images[name] = image
+
+        graph = Graph()
+        load, blur, display = LoadImageNode(), BlurNode(), DisplayNode()
+        for node in (load, blur, display):
+            graph.add_node(node)
+        graph.add_edge(load.id, "image", blur.id, "image")
+        graph.add_edge(blur.id, "image", display.id, "image")
+        self.graph, self.blur = graph, blur
+        self.pipeline = os.path.join(self.tmp.name, "pipeline.yaml")
+        save_pipeline_file(self.pipeline, graph.serialize())
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_run_batch_writes_sink_images(self):
+        failures = run_batch(
+            self.pipeline, self.input_dir, self.output_dir, workers=2
+        )
+
+        self.assertEqual(failures, 0)
+        for name, image in self.images.items():
+            output = cv2.imread(
+                os.path.join(self.output_dir, name), cv2.IMREAD_GRAYSCALE
+            )
+            self.assertIsNotNone(output)
+            np.testing.assert_array_equal(output, cv2.blur(image, (5, 5)))
+
+    def test_sinks_without_outputs_target_their_inputs(self):
+        self.assertEqual(
+            find_sink_targets(self.graph), [(self.blur.id, "image")]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
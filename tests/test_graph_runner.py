@@ -0,0 +1,131 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+from PyQt6.QtCore import QCoreApplication
+from app.core.cache import OutputCache
+from app.core.engine import Engine
+from app.core.graph import Graph
+from app.core.speculation import SpeculativeExecutor
+from app.graph_runner import GraphRunner
+from nodes.base_node import BaseNode
+
+
+class MockNode(BaseNode):
+    category = "Test"
+
+    def __init__(self, node_id):
+        super().__init__(name="Test Node", inputs=[], outputs=[])
+        self.id = node_id
+        self.execute = MagicMock(return_value={})
+
+    def execute(self, **kwargs):
+        return self.execute(**kwargs)
+
+
+class TestGraphRunner(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def setUp(self):
+        self.graph = Graph()
+        self.node1 = MockNode("node1")
+        self.node2 = MockNode("node2")
+        self.graph.add_node(self.node1)
+        self.graph.add_node(self.node2)
+        self.graph.add_edge("node1", "output", "node2", "input")
+        self.runner = GraphRunner(Engine(), self.graph, debounce_ms=10)
+        self.results = []
+        self.runner.run_finished.connect(self.results.append)
+
+    def tearDown(self):
+        self.runner.shutdown()
+
+    def wait_for(self, condition, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.005)
+        self.assertTrue(condition())
+
+    def test_burst_of_requests_runs_once(self):
+        for _ in range(10):
+            self.runner.request_run()
+
+        self.wait_for(lambda: self.results == [True])
+        self.node1.execute.assert_called_once()
+        self.node2.execute.assert_called_once()
+
+    def test_request_during_run_cancels_and_reruns(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_execute(**kwargs):
+            started.set()
+            release.wait(5)
+            return {}
+
+        self.node1.execute.side_effect = slow_execute
+        self.runner.request_run()
+        self.wait_for(started.is_set)
+
+        # Superseding request while node1 is still executing
+        self.node1.dirty = True
+        self.runner.request_run()
+        release.set()
+
+        self.wait_for(lambda: len(self.results) == 2)
+        self.assertEqual(self.results, [False, True])
+        # The cancelled run never reached node2; the new run did, once
+        self.node2.execute.assert_called_once()
+
+    def test_callbacks_wait_for_the_run_in_progress(self):
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow_execute(**kwargs):
+            started.set()
+            release.wait(5)
+            return {}
+
+        self.node1.execute.side_effect = slow_execute
+        self.runner.request_run()
+        self.wait_for(started.is_set)
+
+        self.runner.call_between_runs(lambda: calls.append(self.results[:]))
+        self.assertEqual(calls, [])
+        release.set()
+
+        # Called once the run was over, before it was reported
+        self.wait_for(lambda: self.results == [True])
+        self.assertEqual(calls, [[]])
+        self.runner.call_between_runs(lambda: calls.append("idle"))
+        self.assertEqual(calls, [[], "idle"])
+
+    def test_idle_runner_speculates_around_the_last_edit(self):
+        engine = Engine(cache=OutputCache())
+        speculator = SpeculativeExecutor(engine)
+        runner = GraphRunner(
+            engine,
+            self.graph,
+            debounce_ms=10,
+            refine_delay_ms=20,
+            speculator=speculator,
+        )
+        self.addCleanup(runner.shutdown)
+        results = []
+        runner.run_finished.connect(results.append)
+        self.node1.param_values["size"] = 3
+
+        runner.request_preview(edited=("node1", "size"))
+
+        # The preview, then the refining run, then speculation on 4, 2, 5
+        # and 1 for node1 and node2
+        self.wait_for(lambda: results == [True, True])
+        self.wait_for(lambda: speculator.computed == 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
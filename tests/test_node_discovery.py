@@ -1,9 +1,18 @@
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 from nodes.base_node import BaseNode
-from app.node_discovery import get_node_classes
+from app import node_discovery
+from app.node_discovery import (
+    NodeSpec,
+    get_node_classes,
+    load_nodes_from_module,
+    parse_node_module,
+)
 
 import sys
 import os
+import tempfile
+import textwrap
+import types
 import unittest
 
 sys.path.insert(
@@ -12,115 +21,136 @@ sys.path.insert(
 
 
 # --- Mock Node Classes ---
-class MockBlurNode(BaseNode):
-    category = "Filters"
-
-    def __init__(self):
-        super().__init__(name="Blur", inputs=["image"], outputs=["image"])
-
-    def execute(self, **kwargs):
-        return {}
-
-
-class MockCannyNode(BaseNode):
+class MockLegacyNode(BaseNode):
     category = "Filters"
 
     def __init__(self):
-        super().__init__(
-            name="Canny Edge", inputs=["image"], outputs=["image"]
-        )
+        super().__init__(name="Legacy", inputs=["image"], outputs=["image"])
 
     def execute(self, **kwargs):
         return {}
 
 
-class MockDisplayNode(BaseNode):
-    category = "Display"
-
-    def __init__(self):
-        super().__init__(name="Display Image", inputs=["image"], outputs=[])
-
-    def execute(self, **kwargs):
-        return {}
-
-
-class MockLoadImageNode(BaseNode):
-    category = "IO"
-
-    def __init__(self):
-        super().__init__(name="Load Image", inputs=[], outputs=["image"])
-
-    def execute(self, **kwargs):
-        return {}
+class TestNodeDiscovery(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.manifest_path = os.path.join(self.tmp.name, "manifest.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_module(self, source):
+        path = os.path.join(self.tmp.name, "module.py")
+        with open(path, "w") as f:
+            f.write(textwrap.dedent(source))
+        return path
+
+    def test_get_node_classes_discovery(self):
+        with patch("importlib.import_module") as mock_import:
+            node_classes = get_node_classes(self.manifest_path)
+
+        # The palette is built from the source alone
+        mock_import.assert_not_called()
+        self.assertEqual(len(node_classes), 8)
+        self.assertIn("Blur", node_classes)
+        self.assertIn("Canny Edge", node_classes)
+        self.assertIn("Display Image", node_classes)
+        self.assertIn("Load Image", node_classes)
+        self.assertIn("Load Color Image", node_classes)
+        self.assertIn("Load Video", node_classes)
+        self.assertIn("Load Image Sequence", node_classes)
+        self.assertIn("Grayscale", node_classes)
 
+        blur = node_classes["Blur"]
+        self.assertIsInstance(blur, NodeSpec)
+        self.assertEqual(blur.category, "Filters")
+        self.assertEqual(blur.parameters, {"kernel_size": 5})
 
-class MockLoadColorImageNode(BaseNode):
-    category = "IO"
+    def test_node_spec_imports_on_first_use(self):
+        spec = get_node_classes(self.manifest_path)["Canny Edge"]
+        self.assertFalse(spec.is_loaded)
 
-    def __init__(self):
-        super().__init__(name="Load Color Image", inputs=[], outputs=["image"])
+        node = spec()
 
-    def execute(self, **kwargs):
-        return {}
+        self.assertTrue(spec.is_loaded)
+        self.assertEqual(type(node).__name__, "CannyNode")
+        self.assertEqual(node.name, "Canny Edge")
+        self.assertEqual(
+            node.param_values, {"threshold1": 100, "threshold2": 200}
+        )
 
+    def test_manifest_skips_parsing_unchanged_modules(self):
+        get_node_classes(self.manifest_path)
+        self.assertTrue(os.path.exists(self.manifest_path))
+
+        with patch.object(
+            node_discovery, "parse_node_module"
+        ) as mock_parse, patch.object(
+            node_discovery, "save_manifest"
+        ) as mock_save:
+            node_classes = get_node_classes(self.manifest_path)
+
+        mock_parse.assert_not_called()
+        mock_save.assert_not_called()
+        self.assertEqual(node_classes["Grayscale"].category, "Plugins")
+
+    def test_parse_node_module_reads_class_metadata(self):
+        path = self.write_module(
+            """
+            from nodes.base_node import BaseNode
+
+            class Helper:
+                pass
+
+            class InvertNode(BaseNode):
+                name = "Invert"
+                category = "Filters"
+                inputs = ["image"]
+                outputs = ["image"]
+                parameters = {"strength": 1.0}
+
+                def execute(self, **kwargs):
+                    return {}
+            """
+        )
 
-class MockGrayscaleNode(BaseNode):
-    category = "Plugins"
+        self.assertEqual(
+            parse_node_module(path),
+            [
+                (
+                    "InvertNode",
+                    {
+                        "name": "Invert",
+                        "category": "Filters",
+                        "inputs": ["image"],
+                        "outputs": ["image"],
+                        "parameters": {"strength": 1.0},
+                    },
+                )
+            ],
+        )
 
-    def __init__(self):
-        super().__init__(name="Grayscale", inputs=["image"], outputs=["image"])
+    def test_modules_without_class_metadata_are_imported(self):
+        path = self.write_module(
+            """
+            from nodes.base_node import BaseNode
 
-    def execute(self, **kwargs):
-        return {}
+            class OldNode(BaseNode):
+                def __init__(self):
+                    super().__init__(name="Old", inputs=[], outputs=[])
 
+                def execute(self, **kwargs):
+                    return {}
+            """
+        )
+        self.assertIsNone(parse_node_module(path))
 
-class TestNodeDiscovery(unittest.TestCase):
+        module = types.SimpleNamespace(MockLegacyNode=MockLegacyNode)
+        node_classes = {}
+        with patch("importlib.import_module", return_value=module):
+            load_nodes_from_module("plugins.legacy", node_classes)
 
-    @patch("os.listdir")
-    @patch("os.path.isdir")
-    @patch("importlib.import_module")
-    def test_get_node_classes_discovery(
-        self, mock_import, mock_isdir, mock_listdir
-    ):
-        # Simulate the directory structure and files
-        mock_listdir.side_effect = [
-            ["built_in", "plugins"],  # Top level
-            ["display", "filters", "io"],  # Inside nodes
-            ["display_image.py", "load_image.py"],  # Inside display
-            ["canny_edge.py", "blur_node.py"],  # Inside filters
-            ["load_image.py"],  # Inside io
-            ["custom_grayscale_node.py"],  # Inside plugins
-        ]
-        mock_isdir.return_value = True
-
-        def import_side_effect(module_name):
-            mock_mod = MagicMock()
-            if "blur_node" in module_name:
-                mock_mod.BlurNode = MockBlurNode
-            elif "canny_edge" in module_name:
-                mock_mod.CannyNode = MockCannyNode
-            elif "display_image" in module_name:
-                mock_mod.DisplayNode = MockDisplayNode
-            elif "nodes.built_in.display.load_image" in module_name:
-                mock_mod.LoadImageNode = MockLoadImageNode
-            elif "nodes.built_in.io.load_image" in module_name:
-                mock_mod.LoadColorImageNode = MockLoadColorImageNode
-            elif "custom_grayscale_node" in module_name:
-                mock_mod.GrayscaleNode = MockGrayscaleNode
-            return mock_mod
-
-        mock_import.side_effect = import_side_effect
-
-        node_classes = get_node_classes()
-
-        # --- Assertions ---
-        self.assertEqual(len(node_classes), 6)
-        self.assertIn("Blur", node_classes)
-        self.assertIn("Canny Edge", node_classes)
-        self.assertIn("Display Image", node_classes)
-        self.assertIn("Load Image", node_classes)
-        self.assertIn("Load Color Image", node_classes)
-        self.assertIn("Grayscale", node_classes)
+        self.assertEqual(node_classes, {"Legacy": MockLegacyNode})
 
 
 if __name__ == "__main__":
@@ -0,0 +1,151 @@
+import os
+import sys
+import tempfile
+import textwrap
+import unittest
+from unittest.mock import MagicMock
+from app.core.cache import OutputCache
+from app.core.engine import Engine
+from app.core.graph import Graph
+from app.node_discovery import get_node_classes
+from app.plugin_watcher import PluginWatcher
+from nodes.base_node import BaseNode
+
+PLUGIN_SOURCE = """
+from nodes.base_node import BaseNode
+
+
+class ScaleNode(BaseNode):
+    name = "Scale"
+    category = "Plugins"
+    inputs = ["value"]
+    outputs = ["value"]
+    parameters = {{"factor": 2}}
+
+    def execute(self, **kwargs):
+        return {{"value": kwargs["value"] * self.param_values["factor"]
+                 + {offset}}}
+"""
+
+
+class SourceNode(BaseNode):
+    name = "Source"
+    outputs = ["value"]
+
+    def __init__(self):
+        super().__init__()
+        self.execute = MagicMock(return_value={"value": 10})
+
+    def execute(self, **kwargs):
+        return self.execute(**kwargs)
+
+
+class TestPluginWatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.module_name = f"hot_plugin_{id(self)}"
+        self.path = os.path.join(self.tmp.name, f"{self.module_name}.py")
+        sys.path.insert(0, self.tmp.name)
+        self.write_plugin(offset=0)
+
+        self.node_classes = {}
+        self.graph = Graph()
+        self.engine = Engine(cache=OutputCache())
+        self.watcher = PluginWatcher(
+            self.node_classes,
+            self.graph,
+            self.engine,
+            find_modules=lambda: [(self.module_name, self.path)],
+        )
+        self.watcher._signatures = {}
+        self.watcher.poll()
+
+    def tearDown(self):
+        sys.path.remove(self.tmp.name)
+        sys.modules.pop(self.module_name, None)
+        self.tmp.cleanup()
+
+    def write_plugin(self, offset):
+        with open(self.path, "w") as f:
+            f.write(textwrap.dedent(PLUGIN_SOURCE.format(offset=offset)))
+        # Make sure the change is visible even on coarse mtime clocks
+        stat = os.stat(self.path)
+        mtime_ns = stat.st_mtime_ns + offset * 10**9
+        os.utime(self.path, ns=(mtime_ns, mtime_ns))
+
+    def build_graph(self):
+        source = SourceNode()
+        scale = self.node_classes["Scale"]()
+        scale.set_param_value("factor", 3)
+        self.graph.add_node(source)
+        self.graph.add_node(scale)
+        self.graph.add_edge(source.id, "value", scale.id, "value")
+        return source, scale
+
+    def test_unchanged_modules_are_not_reloaded(self):
+        self.assertIn("Scale", self.node_classes)
+        self.assertEqual(self.watcher.poll(), [])
+
+    def test_reload_rebinds_instances_and_keeps_upstream_results(self):
+        source, scale = self.build_graph()
+        self.engine.process(self.graph)
+        self.assertEqual(self.engine.node_outputs[scale.id], {"value": 30})
+
+        rebound = []
+        self.watcher.nodes_rebound.connect(rebound.extend)
+        self.write_plugin(offset=1)
+        self.assertEqual(self.watcher.poll(), [self.module_name])
+
+        new_scale = self.graph.nodes[scale.id]
+        self.assertIsNot(type(new_scale), type(scale))
+        self.assertEqual(new_scale.param_values, {"factor": 3})
+        self.assertEqual(rebound, [(scale, new_scale)])
+        self.assertEqual(len(self.graph.get_incoming_edges(scale.id)), 1)
+
+        self.engine.process(self.graph)
+
+        # Only the reloaded node ran again, with its new code
+        source.execute.assert_called_once()
+        self.assertEqual(self.engine.node_outputs[scale.id], {"value": 31})
+
+    def test_rebinding_waits_for_the_runner(self):
+        source, scale = self.build_graph()
+        self.watcher.runner = MagicMock()
+        self.write_plugin(offset=1)
+
+        self.watcher.poll()
+
+        # The graph is only changed between runs
+        self.assertIs(self.graph.nodes[scale.id], scale)
+        (rebind,), _ = self.watcher.runner.call_between_runs.call_args
+        rebind()
+        self.assertIsNot(self.graph.nodes[scale.id], scale)
+
+    def test_lazy_registry_entries_pick_up_new_source(self):
+        self.write_plugin(offset=2)
+        self.watcher.poll()
+
+        node = self.node_classes["Scale"]()
+        self.assertEqual(node.execute(value=1), {"value": 4})
+
+    def test_broken_module_keeps_old_class(self):
+        source, scale = self.build_graph()
+        with open(self.path, "w") as f:
+            f.write("this is not python")
+        os.utime(self.path, ns=(1, 1))
+
+        self.watcher.poll()
+
+        self.assertIs(self.graph.nodes[scale.id], scale)
+        self.assertIn("Scale", self.node_classes)
+
+    def test_registry_from_discovery_is_supported(self):
+        node_classes = get_node_classes(manifest_path=None)
+        watcher = PluginWatcher(node_classes, Graph(), Engine())
+
+        self.assertEqual(watcher.poll(), [])
+        self.assertIn("Grayscale", node_classes)
+
+
+if __name__ == "__main__":
+    unittest.main()
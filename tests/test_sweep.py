@@ -0,0 +1,89 @@
+import csv
+import os
+import tempfile
+import unittest
+import cv2
+import numpy as np
+from app.core.graph import Graph
+from app.core.pipeline_io import save_pipeline_file
+from app.sweep import parse_values, run_sweep
+from nodes.built_in.display.blur_node import BlurNode
+from nodes.built_in.display.display_image import DisplayNode
+from nodes.built_in.display.load_image import LoadImageNode
+from nodes.built_in.filters.canny_edge import CannyNode
+
+
+class TestSweep(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        image_path = os.path.join(self.tmp.name, "image.png")
+        image = np.zeros((40, 60), dtype=np.uint8)
+        image[10:30, 20:40] = 255
+        cv2.imwrite(image_path, image)
+
+        graph = Graph()
+        load, blur = LoadImageNode(), BlurNode()
+        canny, display = CannyNode(), DisplayNode()
+        load.set_param_value("path", image_path)
+        for node in (load, blur, canny, display):
+            graph.add_node(node)
+        graph.add_edge(load.id, "image", blur.id, "image")
+        graph.add_edge(blur.id, "image", canny.id, "image")
+        graph.add_edge(canny.id, "image", display.id, "image")
+        self.pipeline = os.path.join(self.tmp.name, "pipeline.yaml")
+        save_pipeline_file(self.pipeline, graph.serialize())
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_parse_values(self):
+        self.assertEqual(parse_values("3:9:2", 5), [3, 5, 7, 9])
+        self.assertEqual(parse_values("0.5:1.5:0.5", 1.0), [0.5, 1.0, 1.5])
+        self.assertEqual(parse_values("10, 20", 0), [10, 20])
+        self.assertEqual(parse_values("a,b", ""), ["a", "b"])
+        self.assertEqual(
+            parse_values("False, true,0,1", True), [False, True, False, True]
+        )
+        with self.assertRaises(ValueError):
+            parse_values("yes", False)
+
+    def test_run_sweep_writes_table_and_images(self):
+        csv_path = os.path.join(self.tmp.name, "sweep.csv")
+        output_dir = os.path.join(self.tmp.name, "out")
+
+        rows = run_sweep(
+            self.pipeline,
+            ["Blur.kernel_size=1,5", "Canny Edge.threshold1=50:150:50"],
+            ["nonzero"],
+            csv_path=csv_path,
+            output_dir=output_dir,
+            workers=2,
+        )
+
+        self.assertEqual(len(rows), 6)
+        with open(csv_path, newline="") as f:
+            table = list(csv.DictReader(f))
+        self.assertEqual(
+            list(table[0]),
+            [
+                "index",
+                "Blur.kernel_size",
+                "Canny Edge.threshold1",
+                "nonzero",
+                "outputs",
+            ],
+        )
+        self.assertEqual(
+            [row["Canny Edge.threshold1"] for row in table[:3]],
+            ["50", "100", "150"],
+        )
+        self.assertGreater(float(table[0]["nonzero"]), 0)
+        self.assertEqual(len(os.listdir(output_dir)), 6)
+
+    def test_unknown_node_is_an_error(self):
+        with self.assertRaises(ValueError):
+            run_sweep(self.pipeline, ["Nope.kernel_size=1,3"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()